@@ -0,0 +1,323 @@
+"""
+HABICON - Layout Archive
+Compact, versioned binary format for saving layouts, from a single design
+to archives of millions. A file is a header, then every layout's fixed-width
+module records (type ID, x, y, rotation) back to back, then an index with
+one fixed-width entry per layout (first module record, shape, mission,
+crew, module count). The header points at the index.
+
+ArchiveReader memory-maps an archive and hands out NumPy views straight
+onto the mapped index and records, so opening and scanning a
+multi-gigabyte file never walks it layout by layout in Python or builds
+per-module objects. Version 1 files, with a small header in front of each
+layout and no index, are still read. JSON export/import sits alongside for
+interchange with other tools.
+"""
+
+import json
+import mmap
+import struct
+import numpy as np
+import habicon_catalog as catalog
+import habicon_engine as engine
+import habicon_requirements as requirements
+
+MAGIC = b'HABL'
+VERSION = 2
+JSON_VERSION = 1
+
+FILE_HEADER = struct.Struct('<4sHHQQ')   # magic, version, module record size, layout count, index offset
+FILE_HEADER_V1 = struct.Struct('<4sHHQ')   # without the index offset
+LAYOUT_HEADER = struct.Struct('<BBHI')   # shape ID, mission ID (0 = free design), crew, module count
+MODULE_RECORD = struct.Struct('<HffH')   # module type ID, x, y, rotation (degrees)
+INDEX_ENTRY = struct.Struct('<QBBHI')    # first module record, then as LAYOUT_HEADER
+
+# The same records, as NumPy sees them in the mapped file
+INDEX_DTYPE = np.dtype([('first', '<u8'), ('shape', '<u1'), ('mission', '<u1'), ('crew', '<u2'),
+                        ('count', '<u4')])
+MODULE_DTYPE = np.dtype([('type', '<u2'), ('x', '<f4'), ('y', '<f4'), ('rotation', '<u2')])
+
+JSON_FORMAT = 'habicon-layouts'
+
+MISSION_IDS = np.array([0] + sorted(catalog.MISSIONS_BY_ID))
+
+
+def check_ids(shapes=(), missions=(), types=()):
+    # Raise ValueError for IDs a corrupt or newer file may hold
+    shapes, missions, types = np.asarray(shapes), np.asarray(missions), np.asarray(types)
+    if shapes.size and shapes.max() >= len(catalog.HABITAT_SHAPES):
+        raise ValueError(f"unknown habitat shape ID {shapes.max()}")
+    if missions.size and not np.isin(missions, MISSION_IDS).all():
+        raise ValueError(f"unknown mission ID {missions[~np.isin(missions, MISSION_IDS)][0]}")
+    if types.size and types.max() >= len(catalog.MODULE_CATALOG):
+        raise ValueError(f"unknown module type ID {types.max()}")
+
+
+def encode_records(layout):
+    # Modules outside the catalog have no type ID and aren't stored
+    records = []
+    for m in layout.get('modules', []):
+        mid = catalog.module_id(m['type'])
+        if mid is not None:
+            records.append(MODULE_RECORD.pack(mid, m['x'], m['y'], int(m.get('rotation', 0)) % 360))
+    mission = layout.get('mission') or {}
+    header = (catalog.shape_id(engine.layout_shape(layout)), mission.get('id', 0), engine.layout_crew(layout))
+    return header, records
+
+
+def encode_layout(layout):
+    # One layout on its own: its header, then its module records
+    (shape, mission, crew), records = encode_records(layout)
+    return LAYOUT_HEADER.pack(shape, mission, crew, len(records)) + b''.join(records)
+
+
+def decode_bytes(blob):
+    # Inverse of encode_layout
+    if len(blob) < LAYOUT_HEADER.size:
+        raise ValueError("truncated layout record")
+    shape, mission, crew, count = LAYOUT_HEADER.unpack_from(blob)
+    if len(blob) != LAYOUT_HEADER.size + count * MODULE_RECORD.size:
+        raise ValueError("truncated layout record")
+    return decode_layout(shape, mission, crew, MODULE_RECORD.iter_unpack(blob[LAYOUT_HEADER.size:]))
+
+
+def decode_layout(shape, mission, crew, records):
+    # Build a plain layout record, as the designer and engine use
+    records = list(records)
+    check_ids([shape], [mission], [mid for mid, _, _, _ in records])
+    modules = []
+    for mid, x, y, rotation in records:
+        entry = catalog.MODULE_CATALOG[mid]
+        modules.append({'type': entry['name'], 'icon': entry['icon'],
+                        'x': round(float(x)), 'y': round(float(y)), 'rotation': int(rotation)})
+    return {
+        'modules': modules,
+        'shape': catalog.HABITAT_SHAPES[shape],
+        'mission': catalog.mission_by_id(mission),
+        'crew': int(crew)
+    }
+
+
+class ArchiveWriter:
+    # Streams module records to disk and keeps the index, written on close
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.index = bytearray()
+        self.count = 0
+        self.records = 0
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, MODULE_RECORD.size, 0, 0))
+
+    def append(self, layout):
+        (shape, mission, crew), records = encode_records(layout)
+        self.file.write(b''.join(records))
+        self.index += INDEX_ENTRY.pack(self.records, shape, mission, crew, len(records))
+        self.records += len(records)
+        self.count += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        offset = self.file.tell()
+        self.file.write(self.index)
+        self.file.seek(0)
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, MODULE_RECORD.size, self.count, offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_archive(path, layouts):
+    with ArchiveWriter(path) as writer:
+        for layout in layouts:
+            writer.append(layout)
+    return writer.count
+
+
+class ArchiveReader:
+    # Corrupt or truncated files raise ValueError, on open for the header
+    # and index, on access for module records
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open(path)
+        except ValueError:
+            self.close()
+            raise
+
+    def _open(self, path):
+        if len(self.map) < FILE_HEADER_V1.size or self.map[:4] != MAGIC:
+            raise ValueError(f"{path} is not a HABICON layout archive")
+        _, version, record_size = struct.unpack_from('<4sHH', self.map)
+        if not 1 <= version <= VERSION or record_size != MODULE_RECORD.size:
+            raise ValueError(f"{path} uses unsupported layout format version {version}")
+
+        if version == 1:
+            self.count = FILE_HEADER_V1.unpack_from(self.map)[3]
+            self.index, self.start, self.contiguous = self._index_v1(path), 0, False
+        else:
+            if len(self.map) < FILE_HEADER.size:
+                raise ValueError(f"{path} is truncated")
+            self.count, offset = FILE_HEADER.unpack_from(self.map)[3:]
+            if offset < FILE_HEADER.size or offset + self.count * INDEX_DTYPE.itemsize != len(self.map):
+                raise ValueError(f"{path} is truncated or corrupt")
+            self.index = np.frombuffer(self.map, INDEX_DTYPE, self.count, offset)
+            self.start, self.contiguous = FILE_HEADER.size, True
+
+            # Layouts' records must tile the record area exactly
+            counts = self.index['count'].astype(np.uint64)
+            ends = np.cumsum(counts)
+            records = (offset - FILE_HEADER.size) // MODULE_RECORD.size
+            if ((offset - FILE_HEADER.size) % MODULE_RECORD.size or (ends[-1] if self.count else 0) != records
+                    or (self.index['first'] != ends - counts).any()):
+                raise ValueError(f"{path} is truncated or corrupt")
+        check_ids(self.index['shape'], self.index['mission'])
+
+    def _index_v1(self, path):
+        # Version 1 has no index: one pass over the layout headers, which
+        # are skipped to the first record so it reads like version 2
+        index = np.empty(self.count, dtype=INDEX_DTYPE)
+        offset = FILE_HEADER_V1.size
+        for i in range(self.count):
+            if offset + LAYOUT_HEADER.size > len(self.map):
+                raise ValueError(f"{path} is truncated")
+            shape, mission, crew, count = LAYOUT_HEADER.unpack_from(self.map, offset)
+            offset += LAYOUT_HEADER.size
+            index[i] = offset, shape, mission, crew, count
+            offset += MODULE_RECORD.size * count
+        if offset > len(self.map):
+            raise ValueError(f"{path} is truncated")
+        return index
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, entry):
+        # Byte offset of a layout's first module record
+        if self.contiguous:
+            return self.start + int(entry['first']) * MODULE_RECORD.size
+        return int(entry['first'])
+
+    def header(self, index):
+        entry = self.index[index]
+        return int(entry['shape']), int(entry['mission']), int(entry['crew']), int(entry['count'])
+
+    def records(self, index):
+        # Zero-copy structured view of one layout's modules
+        entry = self.index[index]
+        records = np.frombuffer(self.map, MODULE_DTYPE, int(entry['count']), self._offset(entry))
+        check_ids(types=records['type'])
+        return records
+
+    def headers(self, start=0, stop=None):
+        # Structured view of the index entries in [start, stop): shape,
+        # mission, crew and count per layout
+        return self.index[start:stop]
+
+    def module_records(self, start=0, stop=None):
+        # Records of every module in layouts [start, stop), in order; a view
+        # of the mapped file when they are stored contiguously
+        entries = self.index[start:stop]
+        if not len(entries):
+            return np.zeros(0, dtype=MODULE_DTYPE)
+        if self.contiguous:
+            total = int(entries['count'].sum(dtype=np.uint64))
+            records = np.frombuffer(self.map, MODULE_DTYPE, total, self._offset(entries[0]))
+        else:
+            records = np.concatenate([self.records(i) for i in range(*slice(start, stop).indices(self.count))])
+        check_ids(types=records['type'])
+        return records
+
+    def module_types(self, start=0, stop=None):
+        # Type IDs of every module in layouts [start, stop), in order
+        return self.module_records(start, stop)['type']
+
+    def __iter__(self):
+        # (shape ID, mission ID, crew, module records view) per layout
+        for i in range(self.count):
+            shape, mission, crew, _ = self.header(i)
+            yield shape, mission, crew, self.records(i)
+
+    def layout(self, index):
+        return decode_layout(*self.header(index)[:3], self.records(index).tolist())
+
+    def layouts(self):
+        for i in range(self.count):
+            yield self.layout(i)
+
+    def close(self):
+        # Views handed out keep the mapping alive until they are dropped
+        self.index = None
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_archive(path):
+    with ArchiveReader(path) as reader:
+        return list(reader.layouts())
+
+
+def layout_to_json(layout):
+    mission = layout.get('mission') or {}
+    return {
+        'shape': engine.layout_shape(layout),
+        'mission': mission.get('id', 0),
+        'crew': engine.layout_crew(layout),
+        'modules': [{'type': m['type'], 'x': m['x'], 'y': m['y'], 'rotation': m.get('rotation', 0)}
+                    for m in layout.get('modules', [])]
+    }
+
+
+def layout_from_json(data):
+    modules = []
+    for m in data.get('modules', []):
+        entry = catalog.module_spec(m['type']) or {}
+        modules.append({'type': m['type'], 'icon': entry.get('icon', ''),
+                        'x': m['x'], 'y': m['y'], 'rotation': m.get('rotation', 0)})
+    mission = catalog.mission_by_id(data.get('mission', 0))
+    return {
+        'modules': modules,
+        'shape': data.get('shape') or engine.DEFAULT_SHAPE,
+        'mission': mission,
+        'crew': data.get('crew') or requirements.mission_crew(mission)
+    }
+
+
+def export_json(path, layouts):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'format': JSON_FORMAT, 'version': JSON_VERSION,
+                   'layouts': [layout_to_json(layout) for layout in layouts]}, f, indent=1)
+
+
+def import_json(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format') != JSON_FORMAT:
+        raise ValueError(f"{path} is not a HABICON layout export")
+    return [layout_from_json(layout) for layout in data.get('layouts', [])]
+
+
+def save_layouts(path, layouts):
+    # Format follows the extension: .json for interchange, binary otherwise
+    if path.lower().endswith('.json'):
+        export_json(path, layouts)
+    else:
+        write_archive(path, layouts)
+
+
+def load_layouts(path):
+    if path.lower().endswith('.json'):
+        return import_json(path)
+    return read_archive(path)
@@ -0,0 +1,336 @@
+"""
+HABICON - Batch Layout Evaluation
+Scores many layouts at once with NumPy. Layouts are encoded as a
+(layouts × palette module types) count matrix, and metrics, requirement
+checks and validity scores are computed as array operations that match
+habicon_engine layout by layout. Volume, mass and power use one
+per-module table per hull shape from habicon_physics. Archives are encoded
+straight from their memory-mapped module records.
+
+The connectivity checks need module positions, so the batch also carries
+one row per module. Docked pairs are found by hashing every module into
+grid cells as wide as a docking reach and testing each cell against its
+neighbours, and components come from label propagation over those pairs:
+linear in the module count, with no per-layout Python loop.
+"""
+
+import math
+import numpy as np
+import habicon_catalog as catalog
+import habicon_connectivity as connectivity
+import habicon_engine as engine
+import habicon_physics as physics
+import habicon_requirements as requirements
+
+MODULE_COUNT = len(catalog.MODULE_CATALOG)
+MODULE_CAPS = np.array(catalog.MODULE_CAPS, dtype=np.int64)
+
+CHECK_NAMES = [label for label, _ in engine.REQUIREMENT_CHECKS] + [
+    f"Minimum {engine.MIN_MODULES} Modules",
+    f"Maximum {engine.MAX_MODULES} Modules"
+] + engine.CONNECTIVITY_CHECKS
+CHECK_CAPS = np.array([cap for _, cap in engine.REQUIREMENT_CHECKS], dtype=np.int64)
+CRITICAL_CAPS = np.array([cap for cap, _ in engine.CRITICAL_MODULES], dtype=np.int64)
+CRITICAL_POINTS = np.array([points for _, points in engine.CRITICAL_MODULES])
+
+# Node ports are the end ports plus two side ports; other modules use the first two
+PORT_OFFSETS = np.array(connectivity.NODE_PORTS)
+NODE_TYPES = (MODULE_CAPS & catalog.CAP_NODE) != 0
+REACH = connectivity.MODULE_WIDTH + connectivity.DOCK_RADIUS
+# (column, row) steps to the cells checked against each cell, each pair once
+CELL_STEPS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def _physics_tables():
+    # (shapes × modules × [volume, mass, power]) and (shapes × [closure
+    # volume, closure mass]), indexed by catalog shape ID
+    tables, closures = [], []
+    for shape in catalog.HABITAT_SHAPES:
+        tables.append([(v, s + o, p) for v, s, o, p, _ in physics.module_table(shape)])
+        hull = physics.hull_properties(shape)
+        closures.append((hull['closure_volume'], hull['closure_mass']))
+    return np.array(tables), np.array(closures)
+
+
+MODULE_TABLES, CLOSURES = _physics_tables()
+
+
+def _bit_columns(bits):
+    return np.array([bool(bits >> mid & 1) for mid in range(MODULE_COUNT)])
+
+
+def _mission_row(mission):
+    required, req_count = catalog.mission_bits(mission)
+    return _bit_columns(required), 30 // req_count if req_count else 0
+
+
+def encode_layouts(layouts):
+    n = len(layouts)
+    rows, cols = [], []
+    node, x, y, rotation = [], [], [], []
+    total = np.zeros(n, dtype=np.int64)
+    shape_index = np.zeros(n, dtype=np.int64)
+    crew = np.full(n, engine.DEFAULT_CREW, dtype=np.int64)
+    min_volume = np.zeros(n)
+    min_power = np.zeros(n)
+    mission_index = np.zeros(n, dtype=np.int64)
+    mission_required, mission_points, mission_keys = [], [], {}
+
+    for i, layout in enumerate(layouts):
+        modules = layout.get('modules', [])
+        total[i] = len(modules)
+        for m in modules:
+            col = catalog.module_id(m['type'])
+            if col is not None:
+                rows.append(i)
+                cols.append(col)
+            node.append(col is not None and NODE_TYPES[col])
+            x.append(m['x'])
+            y.append(m['y'])
+            rotation.append(m.get('rotation', 0))
+        shape_index[i] = catalog.shape_id(engine.layout_shape(layout))
+        targets = engine.layout_targets(layout)
+        crew[i] = targets['crew']
+        min_volume[i] = targets['min_volume']
+        min_power[i] = targets['min_power']
+
+        # Missions are few, so layouts share one requirement row per mission
+        key = catalog.mission_bits(layout.get('mission'))
+        if key not in mission_keys:
+            mission_keys[key] = len(mission_required)
+            required, points = _mission_row(layout.get('mission'))
+            mission_required.append(required)
+            mission_points.append(points)
+        mission_index[i] = mission_keys[key]
+
+    k = MODULE_COUNT
+    flat = np.asarray(rows, dtype=np.int64) * k + np.asarray(cols, dtype=np.int64)
+    counts = np.bincount(flat, minlength=n * k).reshape(n, k)
+
+    # Modules outside the palette only count toward module totals
+    return {
+        'counts': counts,
+        'total': total,
+        'shape_index': shape_index,
+        'crew': crew,
+        'min_volume': min_volume,
+        'min_power': min_power,
+        'mission_index': mission_index,
+        'mission_required': np.array(mission_required, dtype=bool).reshape(-1, k),
+        'mission_points': np.array(mission_points, dtype=np.int64),
+        'module_node': np.array(node, dtype=bool),
+        'module_x': np.array(x, dtype=float),
+        'module_y': np.array(y, dtype=float),
+        'module_rotation': np.array(rotation, dtype=float)
+    }
+
+
+def encode_archive(reader, start=0, stop=None):
+    # Same batch as encode_layouts, built from an ArchiveReader's mapped
+    # index and records without creating layout or module dicts
+    stop = len(reader) if stop is None else min(stop, len(reader))
+    headers = reader.headers(start, stop)
+    n = len(headers)
+    k = MODULE_COUNT
+
+    total = headers['count'].astype(np.int64)
+    records = reader.module_records(start, stop)
+    types = records['type'].astype(np.int64)
+    flat = np.repeat(np.arange(n, dtype=np.int64) * k, total) + types
+    counts = np.bincount(flat, minlength=n * k).reshape(n, k)
+
+    # Mission and crew are one- and two-byte IDs: tables, not sorts, for
+    # the missions, and one sort of a combined key for the pairs
+    seen = np.bincount(headers['mission'], minlength=256)
+    mission_ids = np.flatnonzero(seen)
+    lookup = np.zeros(len(seen), dtype=np.int64)
+    lookup[mission_ids] = np.arange(len(mission_ids))
+    mission_index = lookup[headers['mission']]
+    missions = [catalog.mission_by_id(int(mid)) for mid in mission_ids]
+    rows = [_mission_row(mission) for mission in missions]
+
+    # Requirement targets once per distinct (mission, crew) pair
+    pairs, pair_index = np.unique(mission_index << 16 | headers['crew'], return_inverse=True)
+    targets = [requirements.for_mission(missions[int(pair) >> 16], int(pair) & 0xFFFF) for pair in pairs]
+    targets = np.array([(t['crew'], t['min_volume'], t['min_power']) for t in targets]).reshape(-1, 3)
+    targets = targets[pair_index.ravel()]
+
+    return {
+        'counts': counts,
+        'total': total,
+        'shape_index': headers['shape'].astype(np.int64),
+        'crew': targets[:, 0].astype(np.int64),
+        'min_volume': targets[:, 1],
+        'min_power': targets[:, 2],
+        'mission_index': mission_index,
+        'mission_required': np.array([row[0] for row in rows], dtype=bool).reshape(-1, k),
+        'mission_points': np.array([row[1] for row in rows], dtype=np.int64),
+        'module_node': NODE_TYPES[types],
+        'module_x': records['x'].astype(float),
+        'module_y': records['y'].astype(float),
+        'module_rotation': records['rotation'].astype(float)
+    }
+
+
+def _ports(x, y, rotation):
+    # (4 × modules) port positions, side ports included for every module.
+    # Each distinct rotation is turned into a cosine and sine the way
+    # habicon_connectivity.ports does it, so positions match to the bit.
+    angles, inverse = np.unique(rotation, return_inverse=True)
+    turns = np.array([(1.0, 0.0) if not a % 360 else (math.cos(math.radians(a)), math.sin(math.radians(a)))
+                      for a in angles.tolist()]).reshape(-1, 2)[inverse.ravel()]
+    c, s = turns[:, 0], turns[:, 1]
+    dx, dy = PORT_OFFSETS[:, :1], PORT_OFFSETS[:, 1:]
+    return x + dx * c - dy * s, y + dx * s + dy * c
+
+
+def _adjacent_ranks(values):
+    # Renumbers sorted values from 1, keeping values one apart one apart
+    # and everything else at least two apart, so grid neighbours survive
+    # while the range stays within twice the number of distinct values
+    distinct, inverse = np.unique(values, return_inverse=True)
+    steps = np.where(np.diff(distinct) == 1, 1, 2)
+    return np.cumsum(np.concatenate(([1], steps)))[inverse.ravel()]
+
+
+def _near_pairs(owner, x, y):
+    # (i, j) index pairs of modules in the same layout whose centres lie
+    # within REACH: every pair the ConnectivityGraph would test
+    cx = _adjacent_ranks(np.floor(x / REACH).astype(np.int64))
+    row = _adjacent_ranks(owner * (int(cx.max()) + 2) + cx)     # (layout, column)
+    cy = _adjacent_ranks(np.floor(y / REACH).astype(np.int64))
+    side = int(cy.max()) + 2
+    cell = row * side + cy
+    order = np.argsort(cell)
+    ordered = cell[order]
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    cells = ordered[starts]
+    sizes = np.diff(np.append(starts, len(ordered)))
+
+    found_i, found_j = [], []
+    for dx, dy in CELL_STEPS:
+        if not dx and not dy:
+            a = b = np.flatnonzero(sizes > 1)
+        else:
+            target = cells + dx * side + dy
+            at = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+            a = np.flatnonzero(cells[at] == target)
+            b = at[a]
+        # Every module of cell a against every module of cell b
+        span = sizes[a] * sizes[b]
+        pair = np.repeat(np.arange(len(a)), span)
+        step = np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+        i = starts[a][pair] + step // sizes[b][pair]
+        j = starts[b][pair] + step % sizes[b][pair]
+        if not dx and not dy:
+            keep = i < j
+            i, j = i[keep], j[keep]
+        found_i.append(order[i])
+        found_j.append(order[j])
+    i, j = np.concatenate(found_i), np.concatenate(found_j)
+    near = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 <= REACH * REACH
+    return i[near], j[near]
+
+
+def connectivity_checks(batch):
+    # (connected, no isolated modules) per layout, as habicon_engine finds
+    # them on each layout's ConnectivityGraph
+    total = batch['total']
+    n, count = len(total), int(total.sum())
+    if not count:
+        return np.ones(n, dtype=bool), np.ones(n, dtype=bool)
+    owner = np.repeat(np.arange(n), total)
+    x, y = batch['module_x'], batch['module_y']
+    i, j = _near_pairs(owner, x, y)
+
+    node = batch['module_node']
+    px, py = _ports(x, y, batch['module_rotation'])
+    r2 = connectivity.DOCK_RADIUS * connectivity.DOCK_RADIUS
+    pxi, pyi, pxj, pyj = px[:, i], py[:, i], px[:, j], py[:, j]
+    docked = np.zeros(len(i), dtype=bool)
+    for a in range(len(PORT_OFFSETS)):
+        for b in range(len(PORT_OFFSETS)):
+            close = (pxi[a] - pxj[b]) ** 2 + (pyi[a] - pyj[b]) ** 2 <= r2
+            # Side ports only on Nodes
+            if a > 1:
+                close &= node[i]
+            if b > 1:
+                close &= node[j]
+            docked |= close
+    i, j = i[docked], j[docked]
+
+    # Each module ends up labelled with the lowest index in its component
+    label = np.arange(count)
+    while True:
+        low = np.minimum(label[i], label[j])
+        new = label.copy()
+        np.minimum.at(new, i, low)
+        np.minimum.at(new, j, low)
+        new = new[new]
+        if np.array_equal(new, label):
+            break
+        label = new
+    components = np.bincount(owner[label == np.arange(count)], minlength=n)
+
+    linked = np.zeros(count, dtype=bool)
+    linked[i] = linked[j] = True
+    isolated = np.bincount(owner[~linked], minlength=n)
+    return components <= 1, (isolated == 0) | (total == 1)
+
+
+def evaluate_batch(batch):
+    counts = batch['counts']
+    total = batch['total']
+    shape_index = batch['shape_index']
+    present = counts > 0
+
+    # Per-module figures for each layout's hull, plus its closures unless
+    # the layout is empty
+    physical = np.einsum('ij,ijk->ik', counts, MODULE_TABLES[shape_index])
+    physical[:, :2] += CLOSURES[shape_index] * counts.any(axis=1)[:, None]
+    volume, mass, power = physical[:, 0], physical[:, 1], physical[:, 2]
+    min_volume = batch['min_volume']
+    min_power = batch['min_power']
+
+    caps = np.bitwise_or.reduce(np.where(present, MODULE_CAPS, 0), axis=1)
+
+    checks = np.empty((len(total), len(CHECK_NAMES)), dtype=bool)
+    checks[:, :len(CHECK_CAPS)] = (caps[:, None] & CHECK_CAPS) != 0
+    checks[:, -4] = total >= engine.MIN_MODULES
+    checks[:, -3] = total <= engine.MAX_MODULES
+    checks[:, -2], checks[:, -1] = connectivity_checks(batch)
+
+    score = ((caps[:, None] & CRITICAL_CAPS) != 0) @ CRITICAL_POINTS
+
+    # Mission-specific requirements (30 points)
+    mission_index = batch['mission_index']
+    satisfied = (present & batch['mission_required'][mission_index]).sum(axis=1)
+    score += satisfied * batch['mission_points'][mission_index]
+
+    # Module count (10 points)
+    score += np.where((total >= engine.MIN_MODULES) & (total <= engine.MAX_MODULES), 10,
+                      np.where(total > engine.MAX_MODULES, 5, 0))
+
+    return {
+        'module_count': total,
+        'volume': volume,
+        'power': power,
+        'mass': mass,
+        'min_volume': min_volume,
+        'min_power': min_power,
+        'volume_ok': volume >= min_volume,
+        'power_ok': power >= min_power,
+        'mass_ok': mass <= engine.MASS_LIMIT,
+        'capabilities': caps,
+        'checks': checks,
+        'validity': np.minimum(100, score)
+    }
+
+
+def evaluate_layouts(layouts):
+    return evaluate_batch(encode_layouts(layouts))
+
+
+def rank_layouts(results):
+    # Best validity first, lighter habitats break ties
+    return np.lexsort((results['mass'], -results['validity']))
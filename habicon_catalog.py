@@ -0,0 +1,187 @@
+"""
+HABICON - Module Catalog
+Every palette module gets a stable integer ID and a capability bitmask.
+Layouts and missions are reduced to bitsets once, so requirement checks
+are single AND/compare operations instead of module name scans.
+"""
+
+from functools import lru_cache
+
+# Capability flags
+CAP_NODE = 1 << 0
+CAP_CREW = 1 << 1
+CAP_FOOD = 1 << 2
+CAP_HYGIENE = 1 << 3
+CAP_MEDICAL = 1 << 4
+CAP_MAINTENANCE = 1 << 5
+CAP_EXERCISE = 1 << 6
+CAP_PLANTS = 1 << 7
+CAP_LOGISTICS = 1 << 8
+CAP_POWER = 1 << 9
+CAP_THERMAL = 1 << 10
+CAP_ECLSS = 1 << 11
+CAP_AIRLOCK = 1 << 12
+CAP_LAB = 1 << 13
+CAP_COMMS = 1 << 14
+CAP_DOCKING = 1 << 15
+
+# NASA Standard Habitat Modules, in palette order. IDs are stored in saved
+# layouts, so append new modules at the end and never renumber.
+MODULE_CATALOG = [
+    {'id': 0, 'icon': "🏠", 'name': "Node (Unity)", 'caps': CAP_NODE},
+    {'id': 1, 'icon': "🛏️", 'name': "Crew Quarters (COLPA)", 'caps': CAP_CREW},
+    {'id': 2, 'icon': "🍴", 'name': "Galley (Food System)", 'caps': CAP_FOOD},
+    {'id': 3, 'icon': "🚿", 'name': "Waste & Hygiene (WHC)", 'caps': CAP_HYGIENE},
+    {'id': 4, 'icon': "🩺", 'name': "Medical (Health Care)", 'caps': CAP_MEDICAL},
+    {'id': 5, 'icon': "🔧", 'name': "Maintenance (IVA Tools)", 'caps': CAP_MAINTENANCE},
+    {'id': 6, 'icon': "💪", 'name': "Exercise (COLPA)", 'caps': CAP_EXERCISE},
+    {'id': 7, 'icon': "🌱", 'name': "Plant Production (VEG)", 'caps': CAP_PLANTS},
+    {'id': 8, 'icon': "📦", 'name': "Logistics (Cargo)", 'caps': CAP_LOGISTICS},
+    {'id': 9, 'icon': "⚡", 'name': "Power & Thermal (ECLSS)", 'caps': CAP_POWER | CAP_THERMAL},
+    {'id': 10, 'icon': "🌬️", 'name': "Life Support (ECLSS)", 'caps': CAP_ECLSS},
+    {'id': 11, 'icon': "🚀", 'name': "Airlock (Quest/EVA)", 'caps': CAP_AIRLOCK},
+    {'id': 12, 'icon': "🔬", 'name': "Laboratory (Destiny)", 'caps': CAP_LAB},
+    {'id': 13, 'icon': "📡", 'name': "Communications (Cupola)", 'caps': CAP_COMMS},
+    {'id': 14, 'icon': "🛰️", 'name': "Docking Port (PMA)", 'caps': CAP_DOCKING}
+]
+
+# Physical, life support and power specs, per module:
+#   length: m of hull the module occupies   mass: kg of outfitting (the
+#   shell around it comes from the hull, see habicon_physics)
+#   power: kW generated       load: kW drawn        thermal: kW heat rejected
+#   o2: kg O₂ made per day    co2: kg CO₂ removed   water: L recovered per day
+#   food: kg grown per day    stores: crew-days of consumables carried
+#   mtbf: mean days between failures (0 = passive, never fails)
+SPEC_DEFAULTS = {'length': 3.0, 'mass': 1000.0, 'power': 0.0, 'load': 0.0, 'thermal': 0.0,
+                 'o2': 0.0, 'co2': 0.0, 'water': 0.0, 'food': 0.0, 'stores': 0, 'mtbf': 0}
+MODULE_SPECS = {
+    "Node (Unity)": {'length': 4.5, 'mass': 1800.0, 'load': 0.3},
+    "Crew Quarters (COLPA)": {'length': 3.0, 'mass': 900.0, 'load': 0.8},
+    "Galley (Food System)": {'length': 3.0, 'mass': 1200.0, 'load': 1.5, 'stores': 120},
+    "Waste & Hygiene (WHC)": {'length': 2.5, 'mass': 1000.0, 'load': 1.0, 'water': 4.0, 'mtbf': 500},
+    "Medical (Health Care)": {'length': 3.0, 'mass': 1100.0, 'load': 0.8},
+    "Maintenance (IVA Tools)": {'length': 3.0, 'mass': 1300.0, 'load': 0.6},
+    "Exercise (COLPA)": {'length': 3.5, 'mass': 1400.0, 'load': 0.7},
+    "Plant Production (VEG)": {'length': 4.0, 'mass': 1500.0, 'load': 2.0, 'o2': 2.0, 'co2': 2.5,
+                               'water': 10.0, 'food': 14.0, 'mtbf': 400},
+    "Logistics (Cargo)": {'length': 5.0, 'mass': 2500.0, 'load': 0.2, 'stores': 360},
+    "Power & Thermal (ECLSS)": {'length': 3.0, 'mass': 2800.0, 'power': 12.0, 'load': 0.5,
+                                'thermal': 12.0, 'mtbf': 700},
+    "Life Support (ECLSS)": {'length': 4.0, 'mass': 2600.0, 'load': 3.0, 'o2': 9.0, 'co2': 10.0,
+                             'water': 30.0, 'mtbf': 450},
+    "Airlock (Quest/EVA)": {'length': 4.0, 'mass': 2000.0, 'load': 0.6},
+    "Laboratory (Destiny)": {'length': 6.0, 'mass': 2400.0, 'load': 2.5},
+    "Communications (Cupola)": {'length': 1.5, 'mass': 900.0, 'load': 0.8},
+    "Docking Port (PMA)": {'length': 2.0, 'mass': 1100.0, 'load': 0.1, 'stores': 60}
+}
+for entry in MODULE_CATALOG:
+    entry.update(SPEC_DEFAULTS, **MODULE_SPECS[entry['name']])
+
+# Habitat shapes and NASA missions; list positions and mission IDs are also
+# stored in saved layouts. provisions is days of consumables per crew member
+# launched with the mission (habicon_sim's BASE_RESERVE_DAYS if absent); the
+# long missions carry more, and grow their food in Plant Production.
+HABITAT_SHAPES = ["Cylinder", "Torus", "Dome", "Spherical", "Modular"]
+
+NASA_MISSIONS = [
+    {
+        'id': 1, 'name': 'ISS Training Module', 'level': 1, 'difficulty': 'Beginner',
+        'description': 'Design a basic ISS-style module for crew training',
+        'location': 'Low Earth Orbit', 'duration': '30 days', 'crew': 3,
+        'requirements': ['Node (Unity)', 'Crew Quarters (COLPA)', 'Power & Thermal (ECLSS)']
+    },
+    {
+        'id': 2, 'name': 'Lunar Gateway Station', 'level': 2, 'difficulty': 'Intermediate',
+        'description': 'Create a lunar orbit station for Moon missions',
+        'location': 'Lunar Orbit', 'duration': '6 months', 'crew': 4,
+        'requirements': ['Node (Unity)', 'Crew Quarters (COLPA)', 'Life Support (ECLSS)', 'Docking Port (PMA)']
+    },
+    {
+        'id': 3, 'name': 'Mars Transit Habitat', 'level': 3, 'difficulty': 'Advanced',
+        'description': 'Design a long-duration habitat for Mars journey',
+        'location': 'Deep Space', 'duration': '9 months', 'crew': 6,
+        'requirements': ['Node (Unity)', 'Crew Quarters (COLPA)', 'Life Support (ECLSS)', 'Medical (Health Care)', 'Exercise (COLPA)']
+    },
+    {
+        'id': 4, 'name': 'Mars Surface Base', 'level': 4, 'difficulty': 'Expert',
+        'description': 'Build a permanent Mars surface habitat',
+        'location': 'Mars Surface', 'duration': '2 years', 'crew': 8, 'provisions': 90,
+        'requirements': ['Node (Unity)', 'Crew Quarters (COLPA)', 'Life Support (ECLSS)', 'Plant Production (VEG)', 'Airlock (Quest/EVA)']
+    },
+    {
+        'id': 5, 'name': 'Europa Research Station', 'level': 5, 'difficulty': 'Master',
+        'description': 'Design a research station for Jupiter\'s moon Europa',
+        'location': 'Europa Orbit', 'duration': '3 years', 'crew': 10, 'provisions': 120,
+        'requirements': ['Node (Unity)', 'Laboratory (Destiny)', 'Life Support (ECLSS)', 'Communications (Cupola)', 'Medical (Health Care)']
+    },
+    {
+        'id': 6, 'name': 'Deep Space Colony', 'level': 6, 'difficulty': 'Legendary',
+        'description': 'Create a self-sustaining deep space colony',
+        'location': 'Asteroid Belt', 'duration': '5 years', 'crew': 15, 'provisions': 180,
+        'requirements': ['All NASA modules required']
+    }
+]
+MISSIONS_BY_ID = {m['id']: m for m in NASA_MISSIONS}
+
+MODULE_PALETTE = [(m['icon'], m['name']) for m in MODULE_CATALOG]
+MODULE_IDS = {m['name']: m['id'] for m in MODULE_CATALOG}
+MODULE_CAPS = [m['caps'] for m in MODULE_CATALOG]
+ALL_MODULES = (1 << len(MODULE_CATALOG)) - 1
+
+
+def module_id(name):
+    return MODULE_IDS.get(name)
+
+
+def module_spec(name):
+    mid = MODULE_IDS.get(name)
+    return None if mid is None else MODULE_CATALOG[mid]
+
+
+def shape_id(shape):
+    return HABITAT_SHAPES.index(shape) if shape in HABITAT_SHAPES else 0
+
+
+def mission_by_id(mid):
+    # A copy, so callers can tag it (unlocked, completed) freely
+    mission = MISSIONS_BY_ID.get(mid)
+    return dict(mission) if mission else {}
+
+
+def module_bit(name):
+    mid = MODULE_IDS.get(name)
+    return 0 if mid is None else 1 << mid
+
+
+def capabilities(presence):
+    caps = 0
+    while presence:
+        low = presence & -presence
+        caps |= MODULE_CAPS[low.bit_length() - 1]
+        presence ^= low
+    return caps
+
+
+def encode_types(types):
+    # (presence bitset over module IDs, capability bitset)
+    presence = caps = 0
+    for name in types:
+        mid = MODULE_IDS.get(name)
+        if mid is not None:
+            presence |= 1 << mid
+            caps |= MODULE_CAPS[mid]
+    return presence, caps
+
+
+@lru_cache(maxsize=None)
+def _requirement_bits(requirements):
+    required = 0
+    for req in requirements:
+        required |= module_bit(req)
+    return required, len(requirements)
+
+
+def mission_bits(mission):
+    # (required module bitset, number of listed requirements); requirements
+    # that name no catalog module, like the generic one, can't be satisfied
+    return _requirement_bits(tuple((mission or {}).get('requirements', [])))
@@ -0,0 +1,211 @@
+"""
+HABICON - Command Line Scoring
+Headless batch validation and scoring of saved layouts, for CI and bulk
+runs. Never imports PyQt5.
+
+    python launch_habicon.py score --input layouts/ --jobs 16 --format jsonl
+
+Each layout gets the designer's requirement checks, NASA compliance,
+validity score and the Monte Carlo simulation scores; one CSV or JSONL
+row per layout is streamed to stdout in input order. Archives are split
+into ranges that worker processes read straight from the mapped file.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import habicon_archive
+import habicon_batch
+import habicon_engine as engine
+import habicon_sim
+
+LAYOUT_EXTENSIONS = ('.habl', '.json')
+CHUNK_LAYOUTS = 256
+
+FIELDS = [
+    'file', 'index', 'mission', 'shape', 'crew', 'module_count',
+    'volume', 'power', 'mass', 'volume_ok', 'power_ok', 'mass_ok',
+    'failed_checks', 'validity', 'min_validity', 'passed',
+    'overall', 'lifesupport', 'power_score', 'comfort', 'safety', 'survival'
+]
+
+
+def find_layout_files(inputs):
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.lower().endswith(LAYOUT_EXTENSIONS))
+        else:
+            paths.append(path)
+    return paths
+
+
+def make_tasks(paths):
+    # (path, first layout, last layout); archives split into ranges, JSON
+    # exports are small and go whole
+    for path in paths:
+        if path.lower().endswith('.json'):
+            yield path, 0, None
+            continue
+        with habicon_archive.ArchiveReader(path) as reader:
+            count = len(reader)
+        for start in range(0, count, CHUNK_LAYOUTS):
+            yield path, start, min(count, start + CHUNK_LAYOUTS)
+
+
+def score_task(task, trials, seed):
+    path, start, stop = task
+    if path.lower().endswith('.json'):
+        layouts = habicon_archive.import_json(path)
+        results = habicon_batch.evaluate_layouts(layouts)
+        return score_rows(path, 0, lambda i: layouts[i], results, trials, seed)
+
+    with habicon_archive.ArchiveReader(path) as reader:
+        results = habicon_batch.evaluate_batch(habicon_batch.encode_archive(reader, start, stop))
+        return score_rows(path, start, reader.layout, results, trials, seed)
+
+
+def score_rows(path, start, get_layout, results, trials, seed):
+    rows = []
+    for i in range(len(results['validity'])):
+        layout = get_layout(start + i)
+        mission = layout.get('mission') or {}
+        validity = int(results['validity'][i])
+        min_validity = engine.min_validity_score(mission)
+        checks = list(zip(habicon_batch.CHECK_NAMES, results['checks'][i]))
+        failed = [name for name, ok in checks if not ok]
+
+        row = {
+            'file': path,
+            'index': start + i,
+            'mission': mission.get('name', 'Free Design'),
+            'shape': engine.layout_shape(layout),
+            'crew': engine.layout_crew(layout),
+            'module_count': int(results['module_count'][i]),
+            'volume': round(float(results['volume'][i]), 1),
+            'power': round(float(results['power'][i]), 1),
+            'mass': round(float(results['mass'][i])),
+            'volume_ok': bool(results['volume_ok'][i]),
+            'power_ok': bool(results['power_ok'][i]),
+            'mass_ok': bool(results['mass_ok'][i]),
+            'failed_checks': failed,
+            'validity': validity,
+            'min_validity': min_validity,
+            'passed': engine.layout_passed(validity, mission, checks)
+        }
+        if trials:
+            summary = habicon_sim.simulate(layout, seed=seed, trials=trials)
+            scores = summary['scores']
+            row.update({
+                'overall': scores['overall'],
+                'lifesupport': scores['lifesupport'],
+                'power_score': scores['power'],
+                'comfort': scores['comfort'],
+                'safety': scores['safety'],
+                'survival': round(summary['survival'], 4)
+            })
+        rows.append(row)
+    return rows
+
+
+def score_all(tasks, trials, seed, jobs):
+    # Yields row lists in task order, keeping at most a few tasks per
+    # worker in flight so huge archives stream in bounded memory
+    if jobs == 1:
+        for task in tasks:
+            yield score_task(task, trials, seed)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = []
+        for task in tasks:
+            pending.append(executor.submit(score_task, task, trials, seed))
+            if len(pending) >= jobs * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+class CsvOutput:
+    def __init__(self, stream, fields):
+        self.writer = csv.DictWriter(stream, fields, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(dict(row, failed_checks=';'.join(row['failed_checks'])))
+
+
+class JsonlOutput:
+    def __init__(self, stream, fields):
+        self.stream = stream
+
+    def write(self, row):
+        self.stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+OUTPUTS = {'csv': CsvOutput, 'jsonl': JsonlOutput}
+
+
+def score_command(args):
+    paths = find_layout_files(args.input)
+    if not paths:
+        print("No layout files found", file=sys.stderr)
+        return 2
+
+    fields = FIELDS if args.trials else FIELDS[:FIELDS.index('overall')]
+    output = OUTPUTS[args.format](sys.stdout, fields)
+    jobs = args.jobs or os.cpu_count() or 1
+    scored = failed = 0
+
+    try:
+        for rows in score_all(make_tasks(paths), args.trials, args.seed, jobs):
+            for row in rows:
+                output.write(row)
+                scored += 1
+                failed += not row['passed']
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # Output piped into head and friends; stop quietly
+        sys.stdout = open(os.devnull, 'w')
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"habicon score: {e}", file=sys.stderr)
+        return 2
+
+    print(f"Scored {scored} layouts from {len(paths)} files, {failed} below the validity threshold or not connected",
+          file=sys.stderr)
+    return 1 if args.strict and failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='launch_habicon.py', description="HABICON headless tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help="validate and score saved layouts")
+    score.add_argument('--input', '-i', nargs='+', required=True,
+                       help="layout files (.habl, .json) or directories to scan")
+    score.add_argument('--jobs', '-j', type=int, default=0, help="worker processes (default: all cores)")
+    score.add_argument('--format', '-f', choices=sorted(OUTPUTS), default='csv')
+    score.add_argument('--trials', type=int, default=habicon_sim.DEFAULT_TRIALS,
+                       help="Monte Carlo trials per layout; 0 skips the simulation")
+    score.add_argument('--seed', type=int, default=None,
+                       help="fixed simulation seed (default: derived from each layout)")
+    score.add_argument('--strict', action='store_true',
+                       help="exit with status 1 if any layout is below its validity threshold or not connected")
+    score.set_defaults(handler=score_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
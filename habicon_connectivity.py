@@ -0,0 +1,239 @@
+"""
+HABICON - Module Connectivity
+Which placed modules are actually joined into one pressurized habitat.
+Every module has docking ports: one at each end, plus one on each side for
+Nodes, which is what lets a station branch. Two modules are docked when a
+port of one lies within DOCK_RADIUS of a port of the other.
+
+Connected components are kept in a union-find as modules are added, moved
+and removed. Docking is a union. Removing a module can only split its own
+component, so the searches run outward from its former neighbours in lock
+step, and a search that runs dry before meeting the others has found a
+detached piece, which is relabelled on its own. "All modules connected"
+and "isolated modules" are then O(1) questions after each edit.
+"""
+
+import math
+from collections import deque
+import habicon_catalog as catalog
+from habicon_spatial import SpatialGrid, MODULE_WIDTH, MODULE_HEIGHT
+
+DOCK_RADIUS = 30        # px between two ports that still dock
+
+# Port offsets from the module centre, before rotation
+END_PORTS = ((-MODULE_WIDTH / 2, 0), (MODULE_WIDTH / 2, 0))
+NODE_PORTS = END_PORTS + ((0, -MODULE_HEIGHT / 2), (0, MODULE_HEIGHT / 2))
+
+
+def port_offsets(module_type):
+    spec = catalog.module_spec(module_type) or {}
+    return NODE_PORTS if spec.get('caps', 0) & catalog.CAP_NODE else END_PORTS
+
+
+def ports(module_type, x, y, rotation=0):
+    offsets = port_offsets(module_type)
+    if not rotation % 360:
+        return tuple((x + dx, y + dy) for dx, dy in offsets)
+    a = math.radians(rotation)
+    c, s = math.cos(a), math.sin(a)
+    return tuple((x + dx * c - dy * s, y + dx * s + dy * c) for dx, dy in offsets)
+
+
+def docked(ports_a, ports_b, radius=DOCK_RADIUS):
+    r2 = radius * radius
+    for ax, ay in ports_a:
+        for bx, by in ports_b:
+            if (ax - bx) ** 2 + (ay - by) ** 2 <= r2:
+                return True
+    return False
+
+
+class ConnectivityGraph:
+    def __init__(self, radius=DOCK_RADIUS):
+        self.radius = radius
+        # Farthest apart two docked module centres can be
+        self.reach = MODULE_WIDTH + radius
+        self.clear()
+
+    def clear(self):
+        self.grid = SpatialGrid()
+        self.ports = {}         # key -> port positions
+        self.links = {}         # key -> set of docked keys
+        self.isolated = set()   # keys with no links
+        self.element = {}       # key -> union-find element
+        self.parent = []        # element -> parent element
+        self.size = []          # root element -> modules in the component
+        self.count = 0          # components
+
+    def __len__(self):
+        return len(self.links)
+
+    def __contains__(self, key):
+        return key in self.links
+
+    # Union-find. Elements are never deleted: a removed module's element may
+    # still be on other modules' paths, and only the root's size counts.
+
+    def _new_element(self, size):
+        self.parent.append(len(self.parent))
+        self.size.append(size)
+        return len(self.parent) - 1
+
+    def _find(self, e):
+        parent = self.parent
+        while parent[e] != e:
+            parent[e] = parent[parent[e]]
+            e = parent[e]
+        return e
+
+    def _union(self, a, b):
+        ra, rb = self._find(self.element[a]), self._find(self.element[b])
+        if ra == rb:
+            return
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        self.count -= 1
+
+    def _compact(self):
+        # Rebuild once dead elements outnumber live modules
+        old = {key: self._find(e) for key, e in self.element.items()}
+        roots = {}
+        self.parent, self.size, self.element = [], [], {}
+        for key, e in old.items():
+            root = roots.get(e)
+            if root is None:
+                root = roots[e] = self._new_element(0)
+            self.element[key] = root
+            self.size[root] += 1
+
+    # Edits
+
+    def add_module(self, key, module_type, x, y, rotation=0):
+        if key in self.links:
+            self.remove_module(key)
+        own = ports(module_type, x, y, rotation)
+        self.grid.insert(key, x, y)
+        self.ports[key] = own
+        self.links[key] = set()
+        self.element[key] = self._new_element(1)
+        self.count += 1
+        for other in self.grid.query_radius(x, y, self.reach):
+            if other != key and docked(own, self.ports[other], self.radius):
+                self._link(key, other)
+                self._union(key, other)
+        if not self.links[key]:
+            self.isolated.add(key)
+
+    def remove_module(self, key):
+        neighbours = self.links.pop(key)
+        for other in neighbours:
+            self._unlink(other, key)
+        self.isolated.discard(key)
+        del self.ports[key]
+        self.grid.remove(key)
+
+        root = self._find(self.element.pop(key))
+        self.size[root] -= 1
+        if not neighbours:
+            self.count -= 1
+        elif len(neighbours) > 1:
+            self._split(root, list(neighbours))
+        if len(self.parent) > 4 * len(self.links) + 64:
+            self._compact()
+
+    def move_module(self, key, module_type, x, y, rotation=0):
+        self.remove_module(key)
+        self.add_module(key, module_type, x, y, rotation)
+
+    def _link(self, a, b):
+        self.links[a].add(b)
+        self.links[b].add(a)
+        self.isolated.discard(b)
+
+    def _unlink(self, a, b):
+        self.links[a].discard(b)
+        if not self.links[a]:
+            self.isolated.add(a)
+
+    def _split(self, root, starts):
+        # One search per former neighbour, expanded a node at a time in
+        # turn; searches that meet merge. Work is bounded by the smaller
+        # sides, not the whole component.
+        owner = {key: i for i, key in enumerate(starts)}
+        merged = list(range(len(starts)))
+        searches = {i: (deque([key]), [key]) for i, key in enumerate(starts)}
+
+        def top(i):
+            while merged[i] != i:
+                merged[i] = merged[merged[i]]
+                i = merged[i]
+            return i
+
+        while len(searches) > 1:
+            for i in list(searches):
+                if i not in searches or len(searches) == 1:
+                    continue
+                frontier, members = searches[i]
+                if not frontier:
+                    # Ran dry alone: a piece of its own now
+                    del searches[i]
+                    piece = self._new_element(len(members))
+                    for key in members:
+                        self.element[key] = piece
+                    self.size[root] -= len(members)
+                    self.count += 1
+                    continue
+                for other in self.links[frontier.popleft()]:
+                    j = owner.get(other)
+                    if j is None:
+                        owner[other] = i
+                        frontier.append(other)
+                        members.append(other)
+                        continue
+                    j = top(j)
+                    if j != i:
+                        # Keep the larger search, fold the other into it
+                        big, small = (i, j) if len(members) >= len(searches[j][1]) else (j, i)
+                        merged[small] = big
+                        searches[big][0].extend(searches[small][0])
+                        searches[big][1].extend(searches[small][1])
+                        del searches[small]
+                        i = big
+                        frontier, members = searches[i]
+
+    # Queries
+
+    def connected(self, a, b):
+        return self._find(self.element[a]) == self._find(self.element[b])
+
+    def component(self, key):
+        # Component label; stable only until the next edit
+        return self._find(self.element[key])
+
+    def component_size(self, key):
+        return self.size[self._find(self.element[key])]
+
+    def component_count(self):
+        return self.count
+
+    def is_connected(self):
+        return self.count <= 1
+
+    def neighbours(self, key):
+        return self.links[key]
+
+    def components(self):
+        # Sets of keys, largest first
+        groups = {}
+        for key, e in self.element.items():
+            groups.setdefault(self._find(e), set()).add(key)
+        return sorted(groups.values(), key=len, reverse=True)
+
+
+def graph_for(layout, radius=DOCK_RADIUS):
+    graph = ConnectivityGraph(radius)
+    for key, m in enumerate(layout.get('modules', [])):
+        graph.add_module(key, m['type'], m['x'], m['y'], m.get('rotation', 0))
+    return graph
@@ -0,0 +1,274 @@
+"""
+HABICON - Habitat Scoring Engine
+Metrics, NASA requirement checks and validity scoring for habitat layouts.
+No GUI imports, so layouts can be scored headless or in worker processes.
+Volume, mass and power come from the physical model in habicon_physics;
+the targets they are checked against come from the mission's crew and
+duration, via habicon_requirements.
+
+A layout record is a plain dict:
+    {'modules': [{'type': ..., 'icon': ..., 'x': ..., 'y': ...}, ...],
+     'shape': 'Cylinder', 'mission': {...}, 'crew': 4}
+The designer's habitat_data dict is already a valid layout record.
+"""
+
+import habicon_catalog as catalog
+import habicon_physics as physics
+import habicon_requirements as requirements
+from habicon_connectivity import graph_for
+
+DEFAULT_SHAPE = "Cylinder"
+DEFAULT_CREW = requirements.DEFAULT_CREW
+
+# NASA standards
+MASS_LIMIT = 50000          # kg
+MIN_MODULES = 4
+MAX_MODULES = 15
+
+# NASA ISS-based requirements shown live in the designer
+DESIGNER_REQUIRED = ["Node (Unity)", "Crew Quarters (COLPA)", "Waste & Hygiene (WHC)", "Power & Thermal (ECLSS)"]
+
+# Critical NASA requirements: (label, capability)
+REQUIREMENT_CHECKS = [
+    ("Structural Node (Unity)", catalog.CAP_NODE),
+    ("Life Support (ECLSS)", catalog.CAP_ECLSS),
+    ("Crew Quarters (COLPA)", catalog.CAP_CREW),
+    ("Waste & Hygiene (WHC)", catalog.CAP_HYGIENE),
+    ("Power System", catalog.CAP_POWER),
+    ("Airlock (EVA)", catalog.CAP_AIRLOCK),
+    ("Medical Bay", catalog.CAP_MEDICAL),
+    ("Food System", catalog.CAP_FOOD),
+]
+
+# Checked on the docking graph of habicon_connectivity, after the above
+CONNECTIVITY_CHECKS = ["All Modules Pressurized & Connected", "No Isolated Modules"]
+
+# Critical modules (60 points total)
+CRITICAL_MODULES = [
+    (catalog.CAP_NODE, 15),
+    (catalog.CAP_ECLSS, 15),
+    (catalog.CAP_CREW, 10),
+    (catalog.CAP_HYGIENE, 10),
+    (catalog.CAP_POWER, 10)
+]
+
+
+def module_types(layout):
+    return [m['type'] for m in layout.get('modules', [])]
+
+
+def layout_bits(layout):
+    # (presence bitset, capability bitset) for the placed modules
+    return catalog.encode_types(module_types(layout))
+
+
+def layout_shape(layout):
+    return layout.get('shape') or DEFAULT_SHAPE
+
+
+def layout_crew(layout):
+    # An explicit crew size, else the mission's
+    return layout.get('crew') or requirements.mission_crew(layout.get('mission'))
+
+
+def layout_targets(layout):
+    return requirements.for_mission(layout.get('mission'), layout.get('crew'))
+
+
+def metrics_for(module_count, shape, targets, totals):
+    # totals: volume / mass / power / hull length from habicon_physics
+    return {
+        'crew': targets['crew'],
+        'days': targets['days'],
+        'module_count': module_count,
+        'shape': shape,
+        'volume': totals['volume'],
+        'power': totals['power'],
+        'mass': totals['mass'],
+        'structure': totals['structure'],
+        'length': totals['length'],
+        'water': targets['water'],
+        'oxygen': targets['oxygen'],
+        'food': targets['food']
+    }
+
+
+def compute_metrics(layout):
+    shape = layout_shape(layout)
+    return metrics_for(len(layout.get('modules', [])), shape, layout_targets(layout),
+                       physics.layout_totals(module_types(layout), shape))
+
+
+def designer_checks_bits(presence):
+    return [(req, bool(presence & catalog.module_bit(req))) for req in DESIGNER_REQUIRED]
+
+
+def designer_checks(layout):
+    presence, _ = layout_bits(layout)
+    return designer_checks_bits(presence)
+
+
+def requirements_check_bits(caps, module_count):
+    checks = [(label, bool(caps & cap)) for label, cap in REQUIREMENT_CHECKS]
+    checks.append((f"Minimum {MIN_MODULES} Modules", module_count >= MIN_MODULES))
+    checks.append((f"Maximum {MAX_MODULES} Modules", module_count <= MAX_MODULES))
+    return checks
+
+
+def connectivity_checks(graph):
+    # From a ConnectivityGraph kept up to date by the designer, or built for
+    # a layout; both questions are O(1) on the graph
+    single = len(graph) == 1
+    return list(zip(CONNECTIVITY_CHECKS, (graph.is_connected(), not graph.isolated or single)))
+
+
+def requirements_check(layout, graph=None):
+    _, caps = layout_bits(layout)
+    checks = requirements_check_bits(caps, len(layout.get('modules', [])))
+    return checks + connectivity_checks(graph_for(layout) if graph is None else graph)
+
+
+def compliance_status(layout):
+    return compliance_for(compute_metrics(layout), layout_targets(layout))
+
+
+def compliance_for(metrics, targets):
+    min_volume = targets['min_volume']
+    min_power = targets['min_power']
+
+    status = dict(metrics)
+    status.update({
+        'min_volume': min_volume,
+        'min_power': min_power,
+        'mass_limit': MASS_LIMIT,
+        'volume_ok': metrics['volume'] >= min_volume,
+        'power_ok': metrics['power'] >= min_power,
+        'mass_ok': metrics['mass'] <= MASS_LIMIT
+    })
+    return status
+
+
+def validity_score_bits(presence, caps, module_count, mission):
+    score = 0
+    for cap, points in CRITICAL_MODULES:
+        if caps & cap:
+            score += points
+
+    # Mission-specific requirements (30 points, distributed evenly)
+    required, req_count = catalog.mission_bits(mission)
+    if req_count:
+        score += (presence & required).bit_count() * (30 // req_count)
+
+    # Module count (10 points)
+    if MIN_MODULES <= module_count <= MAX_MODULES:
+        score += 10
+    elif module_count > MAX_MODULES:
+        score += 5
+
+    return min(100, score)
+
+
+def validity_score(layout):
+    presence, caps = layout_bits(layout)
+    return validity_score_bits(presence, caps, len(layout.get('modules', [])), layout.get('mission'))
+
+
+def min_validity_score(mission):
+    mission = mission or {}
+    return 70 if mission.get('difficulty') in ['Expert', 'Master', 'Legendary'] else 60
+
+
+def layout_passed(validity, mission, checks):
+    # Valid enough for the mission and docked into one pressurized habitat;
+    # checks as from requirements_check, connectivity included
+    named = dict(checks)
+    return validity >= min_validity_score(mission) and all(named[name] for name in CONNECTIVITY_CHECKS)
+
+
+def simulation_scores(layout, seed=None, trials=None):
+    # Seeded Monte Carlo mission simulation (habicon_sim builds on this module)
+    import habicon_sim
+    return habicon_sim.simulate(layout, seed=seed, trials=trials)['scores']
+
+
+def evaluate_layout(layout, seed=None, trials=None):
+    mission = layout.get('mission') or {}
+    validity = validity_score(layout)
+    checks = requirements_check(layout)
+    return {
+        'metrics': compute_metrics(layout),
+        'checks': checks,
+        'compliance': compliance_status(layout),
+        'validity': validity,
+        'passed': layout_passed(validity, mission, checks),
+        'scores': simulation_scores(layout, seed, trials)
+    }
+
+
+class MetricsAccumulator:
+    # Running totals and requirement counters for a layout being edited.
+    # add/remove/set_shape are O(1); snapshots never rescan the modules.
+
+    def __init__(self, shape=DEFAULT_SHAPE, mission=None, crew=None):
+        self.shape = shape
+        self.mission = mission or {}
+        self.targets = requirements.for_mission(self.mission, crew)
+        self.crew = self.targets['crew']
+        self.clear()
+
+    def clear(self):
+        self.module_count = 0
+        self.type_counts = [0] * len(catalog.MODULE_CATALOG)
+        self.cap_counts = {}
+        self.presence = 0
+        self.caps = 0
+
+    def add(self, module_type):
+        self.module_count += 1
+        mid = catalog.module_id(module_type)
+        if mid is None:
+            return
+        self.type_counts[mid] += 1
+        if self.type_counts[mid] == 1:
+            self.presence |= 1 << mid
+            self._count_caps(catalog.MODULE_CAPS[mid], 1)
+
+    def remove(self, module_type):
+        self.module_count -= 1
+        mid = catalog.module_id(module_type)
+        if mid is None:
+            return
+        self.type_counts[mid] -= 1
+        if self.type_counts[mid] == 0:
+            self.presence &= ~(1 << mid)
+            self._count_caps(catalog.MODULE_CAPS[mid], -1)
+
+    def set_shape(self, shape):
+        self.shape = shape
+
+    def _count_caps(self, caps, delta):
+        while caps:
+            cap = caps & -caps
+            count = self.cap_counts.get(cap, 0) + delta
+            self.cap_counts[cap] = count
+            if count:
+                self.caps |= cap
+            else:
+                self.caps &= ~cap
+            caps ^= cap
+
+    def metrics(self):
+        return metrics_for(self.module_count, self.shape, self.targets,
+                           physics.totals_for_counts(self.shape, self.type_counts))
+
+    def compliance_status(self):
+        return compliance_for(self.metrics(), self.targets)
+
+    def designer_checks(self):
+        return designer_checks_bits(self.presence)
+
+    def requirements_check(self):
+        return requirements_check_bits(self.caps, self.module_count)
+
+    def validity_score(self):
+        return validity_score_bits(self.presence, self.caps, self.module_count, self.mission)
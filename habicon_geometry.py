@@ -0,0 +1,109 @@
+"""
+HABICON - Habitat Geometry
+Interior of each habitat outline, as drawn by the designer canvas, reduced
+to analytic tests. Hulls are computed once per shape and canvas size.
+
+A module fits when its whole footprint lies inside the outline. The Torus
+ring is narrower than a module, so there a module only needs its footprint
+inside the outer wall with its centre on the ring.
+
+Placement checks pair the hull test with a SpatialGrid of placed modules,
+so checking one position costs the same on a 10- or 10,000-module layout.
+"""
+
+import math
+from functools import lru_cache
+from habicon_spatial import MODULE_WIDTH, MODULE_HEIGHT
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+
+
+@lru_cache(maxsize=None)
+def hull(shape, width=CANVAS_WIDTH, height=CANVAS_HEIGHT):
+    # Same construction as draw_habitat_outline
+    cx, cy = width // 2, height // 2
+    if shape == "Torus":
+        outer = min(cx, cy) - 60
+        return {'kind': 'ring', 'cx': cx, 'cy': cy, 'outer': outer, 'inner': outer - 80}
+    if shape == "Dome":
+        radius = min(cx, cy) - 80
+        # Upper half disc standing on the floor line
+        return {'kind': 'dome', 'cx': cx, 'cy': cy + radius // 2, 'radius': radius}
+    if shape == "Modular":
+        # 3 × 2 block of 120 × 80 sections
+        return {'kind': 'rect', 'x0': cx - 180, 'y0': cy - 80, 'x1': cx + 180, 'y1': cy + 80}
+    # Cylinder, Spherical and unknown shapes: circular cross-section
+    return {'kind': 'disc', 'cx': cx, 'cy': cy, 'radius': min(cx, cy) - 80}
+
+
+def contains_point(h, x, y):
+    kind = h['kind']
+    if kind == 'rect':
+        return h['x0'] <= x <= h['x1'] and h['y0'] <= y <= h['y1']
+    dx, dy = x - h['cx'], y - h['cy']
+    d2 = dx * dx + dy * dy
+    if kind == 'disc':
+        return d2 <= h['radius'] ** 2
+    if kind == 'dome':
+        return dy <= 0 and d2 <= h['radius'] ** 2
+    return h['inner'] ** 2 <= d2 <= h['outer'] ** 2
+
+
+def contains_module(h, x, y, width=MODULE_WIDTH, height=MODULE_HEIGHT):
+    hw, hh = width / 2, height / 2
+    kind = h['kind']
+    if kind == 'rect':
+        return h['x0'] <= x - hw and x + hw <= h['x1'] and h['y0'] <= y - hh and y + hh <= h['y1']
+
+    # Round outlines are convex (the ring's outer wall too), so the four
+    # corners decide it
+    dx, dy = abs(x - h['cx']), abs(y - h['cy'])
+    far = (dx + hw) ** 2 + (dy + hh) ** 2
+    if kind == 'disc':
+        return far <= h['radius'] ** 2
+    if kind == 'dome':
+        return y + hh <= h['cy'] and far <= h['radius'] ** 2
+    d2 = dx * dx + dy * dy
+    return far <= h['outer'] ** 2 and d2 >= h['inner'] ** 2
+
+
+@lru_cache(maxsize=None)
+def module_positions(shape, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, step=20):
+    # Module centres on a step-pixel lattice where a module fits the hull
+    h = hull(shape, width, height)
+    cx, cy = width // 2, height // 2
+    reach = int(math.ceil(max(width, height) / step))
+    positions = []
+    for i in range(-reach, reach + 1):
+        for j in range(-reach, reach + 1):
+            x, y = cx + i * step, cy + j * step
+            if contains_module(h, x, y):
+                positions.append((x, y))
+    return tuple(positions)
+
+
+def fits(h, grid, x, y, exclude=None, width=MODULE_WIDTH, height=MODULE_HEIGHT):
+    # Inside the hull and clear of every placed module
+    if not contains_module(h, x, y, width, height):
+        return False
+    hits = grid.query_rect(x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+    hits.discard(exclude)
+    return not hits
+
+
+def placed_ok(h, grid, key):
+    x, y, hw, hh = grid.items[key]
+    return contains_module(h, x, y, hw * 2, hh * 2) and not grid.overlaps(key)
+
+
+def invalid_modules(h, grid):
+    # Keys of placed modules that stick out of the hull or overlap another
+    invalid = set()
+    for key, (x, y, hw, hh) in grid.items.items():
+        if not contains_module(h, x, y, hw * 2, hh * 2):
+            invalid.add(key)
+    for a, b in grid.overlapping_pairs():
+        invalid.add(a)
+        invalid.add(b)
+    return invalid
@@ -0,0 +1,2358 @@
+"""
+HABICON - Space Habitat Designer GUI
+Complete Flow: Login → Dashboard → HabitatCreator → Simulation → Results
+With Drag & Drop and Gamification
+
+Loaded by launch_habicon.py only when a window is about to be shown.
+NumPy (save/load) and the simulation process pool are imported on first
+use, so the login screen waits on Qt alone.
+"""
+
+import sys
+import time
+import habicon_catalog as catalog
+import habicon_engine as engine
+import habicon_sim
+import habicon_optimizer
+import habicon_geometry as geometry
+import habicon_history
+import habicon_layout
+import habicon_requirements
+import habicon_network as network
+from habicon_spatial import SpatialGrid, MODULE_WIDTH, MODULE_HEIGHT
+from PyQt5.QtWidgets import *
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+
+# Cold start, launcher to login screen shown, on the outreach kiosks
+STARTUP_BUDGET_MS = 600
+
+class LoginWindow(QMainWindow):
+    def __init__(self, app_controller):
+        super().__init__()
+        self.app = app_controller
+        self.init_ui()
+    
+    def init_ui(self):
+        self.setWindowTitle("🚀 HABICON - Mission Access Terminal")
+        self.setGeometry(100, 100, 800, 600)
+        self.setStyleSheet("""
+            QMainWindow { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #0a0a0a, stop:1 #1a1a2e); }
+            QLabel { color: #00d4ff; font-family: 'Consolas'; }
+            QLineEdit { background: #16213e; color: #00d4ff; border: 2px solid #00d4ff; 
+                       border-radius: 8px; padding: 10px; font-size: 14px; }
+            QPushButton { background: #16213e; color: #00d4ff; border: 2px solid #00d4ff; 
+                         border-radius: 8px; padding: 12px; font-size: 14px; font-weight: bold; }
+            QPushButton:hover { background: #00d4ff; color: #0a0a0a; }
+        """)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        
+        header = QLabel("🚀 HABICON")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("font-size: 36px; font-weight: bold; margin: 30px;")
+        layout.addWidget(header)
+        
+        subtitle = QLabel("Space Habitat Designer & Controller")
+        subtitle.setAlignment(Qt.AlignCenter)
+        subtitle.setStyleSheet("font-size: 16px; margin-bottom: 40px;")
+        layout.addWidget(subtitle)
+        
+        form_widget = QWidget()
+        form_widget.setMaximumWidth(400)
+        form_layout = QVBoxLayout(form_widget)
+        
+        self.username_input = QLineEdit()
+        self.username_input.setPlaceholderText("Enter Username")
+        form_layout.addWidget(self.username_input)
+        
+        login_btn = QPushButton("🚀 Launch Mission")
+        login_btn.clicked.connect(self.login)
+        form_layout.addWidget(login_btn)
+        
+        layout.addWidget(form_widget, alignment=Qt.AlignCenter)
+        layout.addStretch()
+    
+    def refresh(self):
+        self.username_input.clear()
+    
+    def login(self):
+        username = self.username_input.text() or "Commander"
+        self.app.show_dashboard(self.app.progress_store().login(username))
+
+class DashboardWindow(QMainWindow):
+    def __init__(self, app_controller, user_data):
+        super().__init__()
+        self.app = app_controller
+        self.user_data = user_data
+        self.missions = self.get_nasa_missions()
+        self.init_ui()
+    
+    def init_ui(self):
+        self.setWindowTitle("🎛️ NASA Mission Command Center")
+        self.setGeometry(100, 100, 1400, 900)
+        self.setStyleSheet("""
+            QMainWindow { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #0a0a0a, stop:1 #1a1a2e); }
+            QLabel { color: #00d4ff; font-family: 'Consolas'; }
+            QPushButton { background: #16213e; color: #00d4ff; border: 2px solid #00d4ff; 
+                         border-radius: 8px; padding: 12px; font-size: 14px; font-weight: bold; }
+            QPushButton:hover { background: #00d4ff; color: #0a0a0a; }
+        """)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        
+        # Header
+        self.header_label = QLabel()
+        self.header_label.setAlignment(Qt.AlignCenter)
+        self.header_label.setStyleSheet("font-size: 24px; font-weight: bold; margin: 20px;")
+        layout.addWidget(self.header_label)
+        
+        # Progress info
+        self.progress_info = QLabel()
+        self.progress_info.setAlignment(Qt.AlignCenter)
+        self.progress_info.setStyleSheet("font-size: 16px; margin: 10px; color: #ff6b35;")
+        layout.addWidget(self.progress_info)
+        
+        # Mission grid
+        missions_label = QLabel("🚀 NASA Mission Selection")
+        missions_label.setAlignment(Qt.AlignCenter)
+        missions_label.setStyleSheet("font-size: 20px; font-weight: bold; margin: 20px;")
+        layout.addWidget(missions_label)
+        
+        # Create mission grid
+        scroll_area = QScrollArea()
+        scroll_widget = QWidget()
+        self.grid_layout = QGridLayout(scroll_widget)
+        self.mission_state = None
+        
+        scroll_area.setWidget(scroll_widget)
+        scroll_area.setWidgetResizable(True)
+        layout.addWidget(scroll_area)
+        
+        layout.addStretch()
+        self.update_dashboard()
+    
+    def refresh(self, user_data):
+        self.user_data = user_data
+        self.missions = self.get_nasa_missions()
+        self.update_dashboard()
+    
+    def update_dashboard(self):
+        self.header_label.setText(f"🎛️ NASA Mission Command - Commander {self.user_data['username']}")
+        self.progress_info.setText(f"Level: {self.user_data.get('level', 1)} | Completed Missions: {self.user_data.get('missions_completed', 0)}")
+        
+        # Mission cards only change when a mission unlocks or completes
+        state = [(m['unlocked'], m['completed']) for m in self.missions]
+        if state == self.mission_state:
+            return
+        self.mission_state = state
+        
+        while self.grid_layout.count():
+            self.grid_layout.takeAt(0).widget().deleteLater()
+        for i, mission in enumerate(self.missions):
+            mission_widget = self.create_mission_widget(mission, i)
+            row = i // 3
+            col = i % 3
+            self.grid_layout.addWidget(mission_widget, row, col)
+    
+    def get_nasa_missions(self):
+        completed = self.user_data.get('missions_completed', 0)
+        done = self.user_data.get('completed', set())
+        return [dict(mission, unlocked=completed >= mission['level'] - 1, completed=mission['id'] in done)
+                for mission in catalog.NASA_MISSIONS]
+    
+    def create_mission_widget(self, mission, index):
+        widget = QWidget()
+        widget.setFixedSize(400, 300)
+        layout = QVBoxLayout(widget)
+        
+        # Mission status styling
+        if not mission['unlocked']:
+            widget.setStyleSheet("""
+                QWidget { background: #2a2a2a; border: 2px solid #555; border-radius: 10px; }
+                QLabel { color: #666; }
+            """)
+        elif mission['completed']:
+            widget.setStyleSheet("""
+                QWidget { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #1a4a1a, stop:1 #2a6a2a); border: 2px solid #4CAF50; border-radius: 10px; }
+            """)
+        else:
+            widget.setStyleSheet("""
+                QWidget { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #16213e, stop:1 #1a1a2e); border: 2px solid #00d4ff; border-radius: 10px; }
+            """)
+        
+        # Mission header
+        header_layout = QHBoxLayout()
+        level_label = QLabel(f"Level {mission['level']}")
+        level_label.setStyleSheet("font-size: 12px; font-weight: bold; color: #ff6b35;")
+        header_layout.addWidget(level_label)
+        
+        header_layout.addStretch()
+        
+        difficulty_label = QLabel(mission['difficulty'])
+        difficulty_color = {'Beginner': '#4CAF50', 'Intermediate': '#FF9800', 'Advanced': '#FF5722', 'Expert': '#9C27B0', 'Master': '#F44336', 'Legendary': '#FFD700'}
+        difficulty_label.setStyleSheet(f"font-size: 12px; font-weight: bold; color: {difficulty_color.get(mission['difficulty'], '#00d4ff')};")
+        header_layout.addWidget(difficulty_label)
+        
+        layout.addLayout(header_layout)
+        
+        # Mission name
+        name_label = QLabel(mission['name'])
+        name_label.setAlignment(Qt.AlignCenter)
+        name_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px;")
+        layout.addWidget(name_label)
+        
+        # Mission details
+        details = f"""
+🌍 {mission['location']}
+🕰️ {mission['duration']}
+👥 {mission['crew']} crew
+        """
+        details_label = QLabel(details)
+        details_label.setAlignment(Qt.AlignCenter)
+        details_label.setStyleSheet("font-size: 12px; margin: 5px;")
+        layout.addWidget(details_label)
+        
+        # Description
+        desc_label = QLabel(mission['description'])
+        desc_label.setAlignment(Qt.AlignCenter)
+        desc_label.setWordWrap(True)
+        desc_label.setStyleSheet("font-size: 11px; margin: 10px; color: #ccc;")
+        layout.addWidget(desc_label)
+        
+        # Action button
+        if not mission['unlocked']:
+            btn = QPushButton("🔒 Locked")
+            btn.setEnabled(False)
+            btn.setStyleSheet("background: #555; color: #999; border: 1px solid #666;")
+        elif mission['completed']:
+            btn = QPushButton("✅ Completed")
+            btn.clicked.connect(lambda: self.start_mission(mission))
+            btn.setStyleSheet("background: #4CAF50; color: white; border: 1px solid #4CAF50;")
+        else:
+            btn = QPushButton("🚀 Start Mission")
+            btn.clicked.connect(lambda: self.start_mission(mission))
+            btn.setStyleSheet("background: #ff6b35; color: white; border: 1px solid #ff6b35; font-weight: bold;")
+        
+        layout.addWidget(btn)
+        
+        return widget
+    
+    def start_mission(self, mission):
+        # Add mission data to user data
+        self.user_data['current_mission'] = mission
+        self.app.show_habitat_creator(self.user_data)
+
+class ModuleStyle:
+    # Shared module look (was a per-widget stylesheet): orange rounded
+    # card, white bold 10px label
+    pen = brush = font = None
+    
+    @classmethod
+    def paint(cls, painter, rect, label):
+        if cls.pen is None:
+            cls.pen = QPen(QColor("#ff6b35"), 2)
+            cls.brush = QBrush(QColor("#ff6b35"))
+            cls.font = QFont()
+            cls.font.setPixelSize(10)
+            cls.font.setBold(True)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(cls.pen)
+        painter.setBrush(cls.brush)
+        painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 10, 10)
+        painter.setPen(Qt.white)
+        painter.setFont(cls.font)
+        painter.drawText(rect, Qt.AlignCenter | Qt.TextWordWrap, label)
+    
+    @classmethod
+    def invalidate(cls):
+        cls.pen = cls.brush = cls.font = None
+
+class ModulePixmapCache:
+    # One pre-rendered pixmap per module type and device pixel ratio, shared
+    # by palette items, placed modules, scene items and drag previews
+    pixmaps = {}
+    
+    @classmethod
+    def get(cls, module_type, icon, ratio=1.0):
+        key = (module_type, icon, ratio)
+        pixmap = cls.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap(int(MODULE_WIDTH * ratio), int(MODULE_HEIGHT * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            ModuleStyle.paint(painter, QRectF(0, 0, MODULE_WIDTH, MODULE_HEIGHT), f"{icon} {module_type}")
+            painter.end()
+            cls.pixmaps[key] = pixmap
+        return pixmap
+    
+    @classmethod
+    def warm(cls, modules, ratio=1.0):
+        for icon, module_type in modules:
+            cls.get(module_type, icon, ratio)
+    
+    @classmethod
+    def invalidate(cls):
+        # Theme or DPI changed: drop every pixmap and re-skin live modules
+        cls.pixmaps.clear()
+        ModuleStyle.invalidate()
+        for widget in QApplication.allWidgets():
+            if isinstance(widget, DraggableModule):
+                widget.refresh_pixmap()
+
+# Drags of modules already placed carry their key, not a palette entry
+PLACED_MODULE_MIME = "application/x-habicon-placed-module"
+
+class DraggableModule(QLabel):
+    # A palette entry, or, given a key, a module placed on a DropZone
+    def __init__(self, module_type, icon, parent=None, key=None):
+        super().__init__(parent)
+        self.module_type = module_type
+        self.icon = icon
+        self.key = key
+        self.setAccessibleName(f"{icon} {module_type}")
+        self.setFixedSize(MODULE_WIDTH, MODULE_HEIGHT)
+        if key is not None:
+            self.setFocusPolicy(Qt.ClickFocus)
+        self.refresh_pixmap()
+    
+    def refresh_pixmap(self):
+        self.setPixmap(ModulePixmapCache.get(self.module_type, self.icon, self.devicePixelRatioF()))
+        
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_start_position = event.pos()
+    
+    def mouseMoveEvent(self, event):
+        if not (event.buttons() & Qt.LeftButton):
+            return
+        if ((event.pos() - self.drag_start_position).manhattanLength() < 
+            QApplication.startDragDistance()):
+            return
+        
+        drag = QDrag(self)
+        mimeData = QMimeData()
+        if self.key is None:
+            mimeData.setText(f"{self.icon}|{self.module_type}")
+        else:
+            mimeData.setData(PLACED_MODULE_MIME, str(self.key).encode())
+        drag.setMimeData(mimeData)
+        
+        drag.setPixmap(self.pixmap())
+        if self.key is None:
+            drag.setHotSpot(event.pos())
+        else:
+            # Drops land on the module's centre, so hold it by the centre
+            drag.setHotSpot(QPoint(MODULE_WIDTH // 2, MODULE_HEIGHT // 2))
+        
+        drag.exec_(Qt.MoveAction)
+    
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self.parentWidget().update()
+    
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.parentWidget().update()
+
+# Drop area border: dashed at rest (drawn with the hull backdrop), solid
+# green while a drag is over it
+DROP_BORDER_WIDTH = 3
+DROP_BORDER_RADIUS = 15
+DROP_BORDER_COLOR = QColor(0, 212, 255)
+DROP_BORDER_ACTIVE_COLOR = QColor(76, 175, 80)
+
+PLACEMENT_OK_COLOR = QColor(76, 175, 80)
+PLACEMENT_BAD_COLOR = QColor(244, 67, 54)
+
+def layout_origin(width, height):
+    # Layouts live in one CANVAS_WIDTH × CANVAS_HEIGHT frame, shared with the
+    # scene view and the optimizer; a larger widget centres that frame
+    return QPoint((width - geometry.CANVAS_WIDTH) // 2, (height - geometry.CANVAS_HEIGHT) // 2)
+
+class PlacementPreview(QWidget):
+    # Ghost of the module being dragged: green where it fits, red where it
+    # would stick out of the hull or overlap. Moving a child widget only
+    # repaints the old and new footprints.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ok = True
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.resize(MODULE_WIDTH, MODULE_HEIGHT)
+        self.hide()
+    
+    def show_at(self, x, y, ok):
+        if ok != self.ok:
+            self.ok = ok
+            self.update()
+        self.move(x - MODULE_WIDTH // 2, y - MODULE_HEIGHT // 2)
+        if not self.isVisible():
+            self.show()
+            self.raise_()
+    
+    def paintEvent(self, event):
+        color = QColor(PLACEMENT_OK_COLOR if self.ok else PLACEMENT_BAD_COLOR)
+        painter = QPainter(self)
+        painter.setPen(QPen(color, 3))
+        color.setAlpha(70)
+        painter.setBrush(color)
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(1.5, 1.5, -1.5, -1.5), 10, 10)
+
+# Heat map tints: blue (cool, full voltage) through green to red
+HEAT_MAP_MODES = ["Off", "Temperature", "Voltage Drop"]
+HEAT_TINT_ALPHA = 150
+UNPOWERED_TINT = QColor(90, 90, 90, 170)
+HEAT_TEMP_RANGE = (habicon_requirements.CABIN_TEMP - 3, habicon_requirements.CABIN_TEMP_LIMIT + 3)   # °C
+
+def heat_color(level):
+    # level: 0 (cool) to 1 (hot)
+    color = QColor.fromHsvF((1.0 - min(1.0, max(0.0, level))) * 0.66, 0.9, 1.0)
+    color.setAlpha(HEAT_TINT_ALPHA)
+    return color
+
+class HeatMapOverlay(QWidget):
+    # Translucent tint over each module on a DropZone, above the module widgets
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.colors = {}
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hide()
+    
+    def set_colors(self, colors):
+        self.colors = colors
+        if colors:
+            self.resize(self.parentWidget().size())
+            self.show()
+            self.raise_()
+        else:
+            self.hide()
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(Qt.NoPen)
+        index = self.parentWidget().index
+        painter.translate(self.parentWidget().origin)
+        for key, color in self.colors.items():
+            if key in index:
+                x, y = index.position(key)
+                painter.setBrush(color)
+                painter.drawRoundedRect(QRectF(x - MODULE_WIDTH / 2, y - MODULE_HEIGHT / 2,
+                                               MODULE_WIDTH, MODULE_HEIGHT), 10, 10)
+
+class DropZone(QWidget):
+    # Mirrors the designer's LayoutModel: one widget per placed module, by
+    # key. Drops, moves and removals are only requested through signals;
+    # the designer applies them to the model, which calls back here.
+    moduleDropped = pyqtSignal(str, str, int, int)
+    moduleMoved = pyqtSignal(int, int, int)
+    moduleRemoved = pyqtSignal(int)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAcceptDrops(True)
+        self.setMinimumSize(geometry.CANVAS_WIDTH, geometry.CANVAS_HEIGHT)
+        self.widgets = {}   # key -> DraggableModule
+        self.index = SpatialGrid()     # layout coordinates
+        self.origin = QPoint(0, 0)     # of the layout frame, in widget coordinates
+        self.shape = engine.DEFAULT_SHAPE
+        self.hull = geometry.hull(self.shape)
+        self.invalid = set()
+        self.drag_active = False
+        self.heat_map = HeatMapOverlay(self)
+        self.preview = PlacementPreview(self)
+    
+    def set_shape(self, shape):
+        self.shape = shape
+        self.update_hull()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.heat_map.resize(event.size())
+        origin = layout_origin(self.width(), self.height())
+        if origin != self.origin:
+            self.origin = origin
+            for key, widget in self.widgets.items():
+                widget.move(self.widget_pos(*self.index.position(key)))
+            self.update()
+    
+    def update_hull(self):
+        # Hull interiors are cached per shape
+        self.hull = geometry.hull(self.shape)
+        self.refresh_invalid()
+    
+    def layout_pos(self, pos):
+        # Widget point -> layout coordinates
+        return pos.x() - self.origin.x(), pos.y() - self.origin.y()
+    
+    def widget_pos(self, x, y):
+        # Top-left corner of the module widget centred on layout point x, y
+        return self.origin + QPoint(int(x) - MODULE_WIDTH // 2, int(y) - MODULE_HEIGHT // 2)
+    
+    def refresh_invalid(self):
+        invalid = geometry.invalid_modules(self.hull, self.index)
+        if invalid != self.invalid:
+            self.invalid = invalid
+            self.update()
+    
+    def recheck(self, keys):
+        # Edits only change the validity of the edited module and whatever
+        # it touched before or after
+        changed = False
+        for key in keys:
+            ok = key not in self.index or geometry.placed_ok(self.hull, self.index, key)
+            if ok == (key in self.invalid):
+                changed = True
+                if ok:
+                    self.invalid.discard(key)
+                else:
+                    self.invalid.add(key)
+        if changed:
+            self.update()
+    
+    def placement_ok(self, x, y, exclude=None):
+        return geometry.fits(self.hull, self.index, x, y, exclude)
+    
+    def set_drag_active(self, active):
+        # Only the border strip changes; a stylesheet swap would re-polish
+        # every placed module and repaint the whole layout
+        if active != self.drag_active:
+            self.drag_active = active
+            rect = self.rect()
+            m, r = DROP_BORDER_WIDTH + 1, DROP_BORDER_RADIUS
+            inner = rect.adjusted(m, m, -m, -m)
+            # The strip, plus the squares holding the rounded corners
+            inside = QRegion(inner.adjusted(r, 0, -r, 0)) | QRegion(inner.adjusted(0, r, 0, -r))
+            self.update(QRegion(rect) - inside)
+    
+    def moving_key(self, event):
+        # Key of the placed module being dragged here, None for palette drags
+        mime = event.mimeData()
+        if mime.hasFormat(PLACED_MODULE_MIME):
+            key = int(bytes(mime.data(PLACED_MODULE_MIME)).decode())
+            if self.widgets.get(key) is event.source():
+                return key
+        return None
+    
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasText() or self.moving_key(event) is not None:
+            event.accept()
+            self.set_drag_active(True)
+        else:
+            event.ignore()
+    
+    def dragMoveEvent(self, event):
+        # Constant time per move: one hull test and one grid lookup
+        key = self.moving_key(event)
+        if key is None and not event.mimeData().hasText():
+            event.ignore()
+            return
+        pos = event.pos()
+        ok = self.placement_ok(*self.layout_pos(pos), key)
+        self.preview.show_at(pos.x(), pos.y(), ok)
+        if ok:
+            event.accept()
+        else:
+            event.ignore()
+    
+    def dragLeaveEvent(self, event):
+        self.preview.hide()
+        self.set_drag_active(False)
+    
+    def dropEvent(self, event):
+        self.preview.hide()
+        x, y = self.layout_pos(event.pos())
+        key = self.moving_key(event)
+        if key is not None:
+            # Moved in place: the same widget, repositioned
+            if self.placement_ok(x, y, key):
+                self.moduleMoved.emit(key, x, y)
+                event.accept()
+            else:
+                event.ignore()
+        elif event.mimeData().hasText():
+            data = event.mimeData().text().split('|')
+            if len(data) == 2 and self.placement_ok(x, y):
+                # The designer records the edit and places it back here
+                icon, module_type = data
+                self.moduleDropped.emit(icon, module_type, x, y)
+                event.accept()
+            else:
+                event.ignore()
+        
+        self.set_drag_active(False)
+    
+    def selected_key(self):
+        widget = self.focusWidget()
+        if isinstance(widget, DraggableModule) and widget.hasFocus() and widget.key in self.widgets:
+            return widget.key
+        return None
+    
+    def keyPressEvent(self, event):
+        key = self.selected_key()
+        if event.key() in (Qt.Key_Delete, Qt.Key_Backspace) and key is not None:
+            self.moduleRemoved.emit(key)
+        else:
+            super().keyPressEvent(event)
+    
+    def contextMenuEvent(self, event):
+        key = self.module_at(*self.layout_pos(event.pos()))
+        if key is None:
+            return
+        menu = QMenu(self)
+        remove = menu.addAction("🗑️ Remove Module")
+        if menu.exec_(event.globalPos()) is remove:
+            self.moduleRemoved.emit(key)
+    
+    def add_module(self, key, module_type, icon, x, y):
+        widget = DraggableModule(module_type, icon, self, key)
+        widget.move(self.widget_pos(x, y))
+        widget.show()
+        if self.heat_map.isVisible():
+            self.heat_map.raise_()
+        self.widgets[key] = widget
+        self.index.insert(key, x, y)
+        self.recheck(self.index.overlaps(key) | {key})
+        return widget
+    
+    def load_modules(self, modules):
+        # modules: {key: module record}
+        self.clear_modules()
+        for key, module in modules.items():
+            self.add_module(key, module['type'], module['icon'], module['x'], module['y'])
+    
+    def set_heat_map(self, colors):
+        # colors: {key: QColor}, empty to hide
+        self.heat_map.set_colors(colors)
+    
+    def move_module(self, key, x, y):
+        self.widgets[key].move(self.widget_pos(x, y))
+        touched = self.index.overlaps(key)
+        self.index.move(key, x, y)
+        self.recheck(touched | self.index.overlaps(key) | {key})
+    
+    def remove_module(self, key):
+        self.widgets.pop(key).deleteLater()
+        touched = self.index.overlaps(key)
+        self.index.remove(key)
+        self.invalid.discard(key)
+        self.recheck(touched)
+        self.update()
+    
+    def clear_modules(self):
+        for widget in self.widgets.values():
+            widget.deleteLater()
+        self.widgets.clear()
+        self.index.clear()
+        self.invalid.clear()
+        self.update()
+    
+    # Spatial queries, answered with module keys
+    
+    def module_at(self, x, y):
+        # Topmost (most recently placed) module under the point
+        hits = self.index.query_point(x, y)
+        return max(hits) if hits else None
+    
+    def modules_near(self, x, y, radius):
+        return list(self.index.query_radius(x, y, radius))
+    
+    def nearest_modules(self, x, y, k=1):
+        return [key for _, key in self.index.nearest(x, y, k)]
+    
+    def overlapping_modules(self):
+        return list(self.index.overlapping_pairs())
+    
+    def draw_rim(self, painter, key, color):
+        x, y = self.index.items[key][:2]
+        painter.setPen(QPen(color, 3))
+        painter.drawRoundedRect(x - MODULE_WIDTH // 2 - 3, y - MODULE_HEIGHT // 2 - 3,
+                                MODULE_WIDTH + 6, MODULE_HEIGHT + 6, 10, 10)
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        painter = QPainter(self)
+        if self.drag_active:
+            painter.setRenderHint(QPainter.Antialiasing)
+            draw_drop_border(painter, self.rect(), DROP_BORDER_ACTIVE_COLOR)
+            painter.setRenderHint(QPainter.Antialiasing, False)
+        # Red rim around modules outside the hull or overlapping
+        painter.translate(self.origin)
+        for key in self.invalid:
+            self.draw_rim(painter, key, PLACEMENT_BAD_COLOR)
+        selected = self.selected_key()
+        if selected is not None:
+            self.draw_rim(painter, selected, QColor("#00d4ff"))
+        painter.resetTransform()
+        if not self.widgets:
+            painter.setPen(QPen(QColor("#666666"), 2))
+            painter.setFont(QFont("Consolas", 16))
+            painter.drawText(self.rect(), Qt.AlignCenter, 
+                           "🚀 Drag modules here to design your habitat\n\n"
+                           "💡 Tip: Place related modules close together!")
+
+TOAST_MS = 2500
+TOAST_COALESCE_MS = 150
+TOAST_COLORS = {'info': '#00d4ff', 'success': '#4CAF50', 'warning': '#FF9800'}
+
+class ToastNotifier(QLabel):
+    # Non-modal notifications over the top-right corner of a window.
+    # Events posted within TOAST_COALESCE_MS of each other, or while a toast
+    # is up, are merged into the next toast; nothing runs a nested event
+    # loop, so building never waits on the user.
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.pending = []   # (title, text, kind, key)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setWordWrap(True)
+        self.setFixedWidth(280)
+        self.hide()
+        
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.expire)
+    
+    def notify(self, title, text, kind='info', key=None):
+        # A later event with the same key replaces an earlier pending one
+        if key is not None:
+            self.pending = [p for p in self.pending if p[3] != key]
+        self.pending.append((title, text, kind, key))
+        if not self.hide_timer.isActive() and not self.flush_timer.isActive():
+            self.flush_timer.start(TOAST_COALESCE_MS)
+    
+    def flush(self):
+        if not self.pending:
+            return
+        messages, self.pending = self.pending, []
+        
+        # One block per title, in order of first appearance
+        grouped = {}
+        for title, text, _, _ in messages:
+            texts = grouped.setdefault(title, [])
+            if text not in texts:
+                texts.append(text)
+        self.setText("\n\n".join(title + "\n" + "\n".join(texts) for title, texts in grouped.items()))
+        
+        color = TOAST_COLORS.get(messages[-1][2], TOAST_COLORS['info'])
+        self.setStyleSheet(f"background: #1a1a2e; color: {color}; border: 2px solid {color}; "
+                           "border-radius: 10px; padding: 10px; font-size: 13px;")
+        self.adjustSize()
+        self.move(self.parentWidget().width() - self.width() - 20, 20)
+        self.raise_()
+        self.show()
+        self.hide_timer.start(TOAST_MS)
+    
+    def expire(self):
+        self.hide()
+        self.flush()
+
+class GameStats(QWidget):
+    def __init__(self, toasts, parent=None):
+        super().__init__(parent)
+        self.toasts = toasts
+        self.score = 0
+        self.level = 1
+        self.xp = 0
+        self.achievements = []
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        
+        self.score_label = QLabel("🏆 Score: 0")
+        self.score_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #4CAF50;")
+        layout.addWidget(self.score_label)
+        
+        self.level_label = QLabel("⭐ Level: 1")
+        self.level_label.setStyleSheet("font-size: 14px; color: #FF9800;")
+        layout.addWidget(self.level_label)
+        
+        xp_layout = QHBoxLayout()
+        xp_layout.addWidget(QLabel("XP:"))
+        self.xp_bar = QProgressBar()
+        self.xp_bar.setRange(0, 100)
+        self.xp_bar.setValue(0)
+        self.xp_bar.setStyleSheet("""
+            QProgressBar { border: 2px solid #00d4ff; border-radius: 5px; }
+            QProgressBar::chunk { background: #00d4ff; }
+        """)
+        xp_layout.addWidget(self.xp_bar)
+        layout.addLayout(xp_layout)
+        
+        self.achievements_label = QLabel("🎖️ Achievements: 0")
+        self.achievements_label.setStyleSheet("font-size: 12px; color: #00d4ff;")
+        layout.addWidget(self.achievements_label)
+        
+        layout.addStretch()
+    
+    def reset(self):
+        self.score = 0
+        self.level = 1
+        self.xp = 0
+        self.achievements = []
+        self.update_display()
+    
+    def add_score(self, points):
+        self.score += points
+        self.xp += points // 10
+        
+        if self.xp >= 100:
+            self.level += 1
+            self.xp = 0
+            self.show_level_up()
+        
+        self.update_display()
+    
+    def add_achievement(self, achievement):
+        if achievement not in self.achievements:
+            self.achievements.append(achievement)
+            self.show_achievement(achievement)
+            self.update_display()
+    
+    def update_display(self):
+        self.score_label.setText(f"🏆 Score: {self.score}")
+        self.level_label.setText(f"⭐ Level: {self.level}")
+        self.xp_bar.setValue(self.xp)
+        self.achievements_label.setText(f"🎖️ Achievements: {len(self.achievements)}")
+    
+    def show_level_up(self):
+        self.toasts.notify("🎉 Level Up!", f"Congratulations! You reached Level {self.level}!",
+                           'info', key='level')
+    
+    def show_achievement(self, achievement):
+        self.toasts.notify("🏆 Achievement Unlocked!", f"🎖️ {achievement}", 'success')
+
+class HabitatCanvas(QWidget):
+    # Static backdrop under the DropZone: drop area border and hull outline,
+    # rendered once per (shape, size, DPI) and blitted on every repaint
+    resized = pyqtSignal(QSize)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.shape = "Cylinder"
+        self.modules = []
+        self.hull_key = None
+        self.hull_pixmap = None
+        self.setMinimumSize(geometry.CANVAS_WIDTH, geometry.CANVAS_HEIGHT)
+        
+    def set_shape(self, shape):
+        self.shape = shape
+        self.hull_pixmap = None
+        self.update()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.hull_pixmap = None
+        self.resized.emit(event.size())
+    
+    def render_hull(self):
+        key = (self.shape, self.width(), self.height(), self.devicePixelRatioF())
+        if self.hull_pixmap is None or key != self.hull_key:
+            ratio = key[3]
+            pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            draw_drop_border(painter, self.rect(), DROP_BORDER_COLOR, Qt.DashLine)
+            painter.translate(layout_origin(self.width(), self.height()))
+            draw_habitat_outline(painter, self.shape, geometry.CANVAS_WIDTH, geometry.CANVAS_HEIGHT)
+            painter.end()
+            self.hull_key, self.hull_pixmap = key, pixmap
+        return self.hull_pixmap
+        
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.render_hull())
+
+def draw_drop_border(painter, rect, color, style=Qt.SolidLine):
+    painter.setPen(QPen(color, DROP_BORDER_WIDTH, style))
+    painter.setBrush(Qt.NoBrush)
+    inset = DROP_BORDER_WIDTH / 2
+    painter.drawRoundedRect(QRectF(rect).adjusted(inset, inset, -inset, -inset),
+                            DROP_BORDER_RADIUS, DROP_BORDER_RADIUS)
+
+def draw_habitat_outline(painter, shape, width, height):
+    # Draw habitat shape outline
+    painter.setPen(QPen(QColor(0, 212, 255), 3))
+    center_x, center_y = width//2, height//2
+    
+    if shape == "Cylinder":
+        radius = min(center_x, center_y) - 80
+        painter.drawEllipse(center_x - radius, center_y - radius, radius*2, radius*2)
+    elif shape == "Torus":
+        outer_radius = min(center_x, center_y) - 60
+        inner_radius = outer_radius - 80
+        painter.drawEllipse(center_x - outer_radius, center_y - outer_radius, outer_radius*2, outer_radius*2)
+        painter.drawEllipse(center_x - inner_radius, center_y - inner_radius, inner_radius*2, inner_radius*2)
+    elif shape == "Dome":
+        radius = min(center_x, center_y) - 80
+        painter.drawArc(center_x - radius, center_y - radius//2, radius*2, radius*2, 0, 180*16)
+        painter.drawLine(center_x - radius, center_y + radius//2, center_x + radius, center_y + radius//2)
+    elif shape == "Spherical":
+        radius = min(center_x, center_y) - 80
+        painter.drawEllipse(center_x - radius, center_y - radius, radius*2, radius*2)
+        # Add sphere lines
+        painter.drawLine(center_x - radius, center_y, center_x + radius, center_y)
+        painter.drawLine(center_x, center_y - radius, center_x, center_y + radius)
+    elif shape == "Modular":
+        # Draw connected rectangular modules
+        module_width, module_height = 120, 80
+        for i in range(3):
+            for j in range(2):
+                x = center_x - 180 + i * module_width
+                y = center_y - 80 + j * module_height
+                painter.drawRect(x, y, module_width, module_height)
+
+class ModuleItem(QGraphicsItem):
+    # Lightweight placed module for the scene canvas: no widget, no
+    # stylesheet, blitted from the shared pixmap and cached per device transform
+    RECT = QRectF(-MODULE_WIDTH / 2, -MODULE_HEIGHT / 2, MODULE_WIDTH, MODULE_HEIGHT)
+    
+    def __init__(self, module_id, module_type, icon):
+        super().__init__()
+        self.module_id = module_id
+        self.module_type = module_type
+        self.icon = icon
+        self.invalid = False
+        self.heat = None
+        self.setFlags(QGraphicsItem.ItemIsMovable | QGraphicsItem.ItemIsSelectable)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+    
+    def boundingRect(self):
+        return self.RECT
+    
+    def set_invalid(self, invalid):
+        if invalid != self.invalid:
+            self.invalid = invalid
+            self.update()
+    
+    def set_heat(self, color):
+        if color != self.heat:
+            self.heat = color
+            self.update()
+    
+    def paint(self, painter, option, widget=None):
+        # Zoomed in past the pixmap's resolution: draw vectors instead
+        if option.levelOfDetailFromTransform(painter.worldTransform()) > 1.0:
+            ModuleStyle.paint(painter, self.RECT, f"{self.icon} {self.module_type}")
+        else:
+            ratio = widget.devicePixelRatioF() if widget else 1.0
+            painter.drawPixmap(self.RECT.topLeft(), ModulePixmapCache.get(self.module_type, self.icon, ratio))
+        if self.heat is not None:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.heat)
+            painter.drawRoundedRect(self.RECT, 10, 10)
+        if self.invalid or self.isSelected():
+            painter.setPen(QPen(PLACEMENT_BAD_COLOR if self.invalid else QColor("#00d4ff"), 3))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRoundedRect(self.RECT.adjusted(1.5, 1.5, -1.5, -1.5), 10, 10)
+
+class HabitatSceneView(QGraphicsView):
+    # Scene-graph canvas for large station layouts, with zoom and pan.
+    # Like DropZone it mirrors the designer's LayoutModel: modules dragged
+    # around the scene are only committed once the designer accepts the move.
+    moduleDropped = pyqtSignal(str, str, int, int)
+    moduleMoved = pyqtSignal(int, int, int)
+    moduleRemoved = pyqtSignal(int)
+    
+    HULL_RECT = QRectF(0, 0, geometry.CANVAS_WIDTH, geometry.CANVAS_HEIGHT)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.shape = "Cylinder"
+        self.module_items = {}
+        self.index = SpatialGrid()
+        self.dragged = []
+        self.zoom = 1.0
+        
+        self.habitat_scene = QGraphicsScene(self)
+        self.habitat_scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.habitat_scene.setSceneRect(self.HULL_RECT.adjusted(-2400, -1800, 2400, 1800))
+        self.setScene(self.habitat_scene)
+        
+        self.setAcceptDrops(True)
+        self.setMinimumSize(geometry.CANVAS_WIDTH, geometry.CANVAS_HEIGHT)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState)
+        self.setBackgroundBrush(QColor("#16213e"))
+        self.setStyleSheet("HabitatSceneView { border: 3px dashed #00d4ff; border-radius: 15px; }")
+        self.centerOn(self.HULL_RECT.center())
+        
+        self.preview = QGraphicsRectItem(ModuleItem.RECT)
+        self.preview.setZValue(1000)
+        self.preview.hide()
+        self.habitat_scene.addItem(self.preview)
+        self.set_preview_ok(True)
+    
+    def set_shape(self, shape):
+        self.shape = shape
+        self.resetCachedContent()
+        self.viewport().update()
+        self.refresh_invalid()
+    
+    def hull(self):
+        return geometry.hull(self.shape)
+    
+    def placement_ok(self, x, y, exclude=None):
+        # Hull test, then the scene's BSP index for anything already there
+        if not geometry.contains_module(self.hull(), x, y):
+            return False
+        footprint = ModuleItem.RECT.translated(x, y).adjusted(0.5, 0.5, -0.5, -0.5)
+        return not any(isinstance(item, ModuleItem) and item is not exclude
+                       for item in self.habitat_scene.items(footprint))
+    
+    def refresh_invalid(self):
+        invalid = geometry.invalid_modules(self.hull(), self.index)
+        for key, item in self.module_items.items():
+            item.set_invalid(key in invalid)
+    
+    def recheck(self, keys):
+        # Same incremental check as DropZone.recheck
+        hull = self.hull()
+        for key in keys:
+            item = self.module_items.get(key)
+            if item is not None:
+                item.set_invalid(not geometry.placed_ok(hull, self.index, key))
+    
+    def set_preview_ok(self, ok):
+        color = QColor(PLACEMENT_OK_COLOR if ok else PLACEMENT_BAD_COLOR)
+        self.preview.setPen(QPen(color, 3))
+        color.setAlpha(70)
+        self.preview.setBrush(color)
+        self.preview_ok = ok
+    
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        painter.save()
+        painter.translate(self.HULL_RECT.topLeft())
+        draw_habitat_outline(painter, self.shape, int(self.HULL_RECT.width()), int(self.HULL_RECT.height()))
+        painter.restore()
+    
+    def wheelEvent(self, event):
+        factor = 1.15 ** (event.angleDelta().y() / 120)
+        zoom = max(0.1, min(8.0, self.zoom * factor))
+        self.scale(zoom / self.zoom, zoom / self.zoom)
+        self.zoom = zoom
+    
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasText():
+            event.accept()
+        else:
+            event.ignore()
+    
+    def dragMoveEvent(self, event):
+        if not event.mimeData().hasText():
+            event.ignore()
+            return
+        pos = self.mapToScene(event.pos())
+        x, y = int(pos.x()), int(pos.y())
+        ok = self.placement_ok(x, y)
+        if ok != self.preview_ok:
+            self.set_preview_ok(ok)
+        self.preview.setPos(x, y)
+        self.preview.show()
+        if ok:
+            event.accept()
+        else:
+            event.ignore()
+    
+    def dragLeaveEvent(self, event):
+        self.preview.hide()
+    
+    def dropEvent(self, event):
+        self.preview.hide()
+        if event.mimeData().hasText():
+            data = event.mimeData().text().split('|')
+            pos = self.mapToScene(event.pos())
+            x, y = int(pos.x()), int(pos.y())
+            if len(data) == 2 and self.placement_ok(x, y):
+                icon, module_type = data
+                self.moduleDropped.emit(icon, module_type, x, y)
+                event.accept()
+            else:
+                event.ignore()
+    
+    def mousePressEvent(self, event):
+        super().mousePressEvent(event)
+        # Whatever is selected now moves with the mouse until release
+        self.dragged = [item for item in self.habitat_scene.selectedItems() if isinstance(item, ModuleItem)]
+    
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        # Modules dragged by hand: request the move, or put them back
+        dragged, self.dragged = self.dragged, []
+        for item in dragged:
+            if item.module_id not in self.module_items:
+                continue
+            x, y = self.index.items[item.module_id][:2]
+            new_x, new_y = int(round(item.x())), int(round(item.y()))
+            if (new_x, new_y) == (x, y):
+                continue
+            item.setPos(x, y)
+            if self.placement_ok(new_x, new_y, exclude=item):
+                self.moduleMoved.emit(item.module_id, new_x, new_y)
+    
+    def keyPressEvent(self, event):
+        selected = [item for item in self.habitat_scene.selectedItems() if isinstance(item, ModuleItem)]
+        if event.key() in (Qt.Key_Delete, Qt.Key_Backspace) and selected:
+            for item in selected:
+                self.moduleRemoved.emit(item.module_id)
+        else:
+            super().keyPressEvent(event)
+    
+    def contextMenuEvent(self, event):
+        pos = self.mapToScene(event.pos())
+        item = self.module_at(pos.x(), pos.y())
+        if item is None:
+            return
+        menu = QMenu(self)
+        remove = menu.addAction("🗑️ Remove Module")
+        if menu.exec_(event.globalPos()) is remove:
+            self.moduleRemoved.emit(item.module_id)
+    
+    def add_module(self, key, module_type, icon, x, y):
+        item = ModuleItem(key, module_type, icon)
+        item.setPos(x, y)
+        self.habitat_scene.addItem(item)
+        self.module_items[key] = item
+        self.index.insert(key, x, y)
+        self.recheck(self.index.overlaps(key) | {key})
+        return item
+    
+    def load_modules(self, modules):
+        # modules: {key: module record}
+        self.clear_modules()
+        for key, module in modules.items():
+            self.add_module(key, module['type'], module['icon'], module['x'], module['y'])
+        self.refresh_invalid()
+    
+    def set_heat_map(self, colors):
+        for key, item in self.module_items.items():
+            item.set_heat(colors.get(key))
+    
+    def move_module(self, module_id, x, y):
+        self.module_items[module_id].setPos(x, y)
+        touched = self.index.overlaps(module_id)
+        self.index.move(module_id, x, y)
+        self.recheck(touched | self.index.overlaps(module_id) | {module_id})
+    
+    def remove_module(self, module_id):
+        self.habitat_scene.removeItem(self.module_items.pop(module_id))
+        touched = self.index.overlaps(module_id)
+        self.index.remove(module_id)
+        self.recheck(touched)
+    
+    def clear_modules(self):
+        for item in self.module_items.values():
+            self.habitat_scene.removeItem(item)
+        self.module_items.clear()
+        self.index.clear()
+    
+    def module_at(self, x, y):
+        for item in self.habitat_scene.items(QPointF(x, y)):
+            if isinstance(item, ModuleItem):
+                return item
+        return None
+
+def nasa_standards_text(mission):
+    # From the tables the requirement checks use; the volume tier that
+    # applies to the mission is marked
+    days = habicon_requirements.mission_days(mission) if mission else None
+    tiers = []
+    for start, volume in habicon_requirements.VOLUME_PER_PERSON:
+        tier = f"{volume:g}m³" + (f" from day {start}" if start else "")
+        if days is not None and volume == habicon_requirements.volume_per_person(days):
+            tier = "▶" + tier
+        tiers.append(tier)
+    per_crew = dict(zip(habicon_requirements.RESOURCES, habicon_requirements.PER_CREW))
+    return "\n".join([
+        "📐 Volume/person: " + ", ".join(tiers),
+        f"⚡ Power: {habicon_requirements.POWER_PER_PERSON:g}kW/person",
+        f"🌡️ Temp: {habicon_requirements.CABIN_TEMP_MIN:g}-{habicon_requirements.CABIN_TEMP_LIMIT:g}°C",
+        "💨 Pressure: 101.3 kPa",
+        "🫁 O₂: 21% ±2%",
+        f"💧 Water: {per_crew['water']:g}L/person/day",
+        f"🍽️ Food: {per_crew['food']:g}kg/person/day"
+    ])
+
+LAYOUT_FILE_FILTER = "HABICON Layout (*.habl);;JSON Layout (*.json)"
+
+class HabitatCreatorWindow(QMainWindow):
+    def __init__(self, app_controller, user_data):
+        super().__init__()
+        self.app = app_controller
+        self.user_data = user_data
+        self.current_mission = user_data.get('current_mission', {})
+        self.model = habicon_layout.LayoutModel(mission=self.current_mission, listener=self)
+        self.history = habicon_history.History(self.model.shape)
+        self.arrange_runs = 0
+        self.toasts = ToastNotifier(self)
+        self.init_ui()
+    
+    def init_ui(self):
+        self.setWindowTitle("🏗️ Habitat Creator")
+        self.setGeometry(100, 100, 1600, 1000)
+        self.setStyleSheet("""
+            QMainWindow { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #0a0a0a, stop:1 #1a1a2e); }
+            QLabel { color: #00d4ff; font-family: 'Consolas'; }
+            QPushButton { background: #16213e; color: #00d4ff; border: 2px solid #00d4ff; 
+                         border-radius: 8px; padding: 8px; font-size: 12px; }
+        """)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QHBoxLayout(central_widget)
+        
+        # Left panel - Module palette
+        left_panel = QWidget()
+        left_panel.setMaximumWidth(200)
+        left_layout = QVBoxLayout(left_panel)
+        
+        title = QLabel("🧩 Module Palette")
+        title.setStyleSheet("font-size: 16px; font-weight: bold; color: #00d4ff; margin: 10px;")
+        left_layout.addWidget(title)
+        
+        # NASA Standard Habitat Modules
+        for icon, name in catalog.MODULE_PALETTE:
+            module = DraggableModule(name, icon)
+            left_layout.addWidget(module)
+        
+        left_layout.addStretch()
+        layout.addWidget(left_panel)
+        
+        # Center panel - Design area
+        center_panel = QWidget()
+        center_layout = QVBoxLayout(center_panel)
+        
+        header_layout = QHBoxLayout()
+        back_btn = QPushButton("← Dashboard")
+        back_btn.clicked.connect(self.back_to_dashboard)
+        header_layout.addWidget(back_btn)
+        
+        mission_name = self.current_mission.get('name', 'Free Design')
+        self.header_label = QLabel(f"🏗️ {mission_name}")
+        self.header_label.setAlignment(Qt.AlignCenter)
+        self.header_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        header_layout.addWidget(self.header_label)
+        
+        save_btn = QPushButton("💾 Save")
+        save_btn.clicked.connect(self.save_layout)
+        header_layout.addWidget(save_btn)
+        
+        load_btn = QPushButton("📂 Load")
+        load_btn.clicked.connect(self.load_layout)
+        header_layout.addWidget(load_btn)
+        
+        self.arrange_btn = QPushButton("🤖 Auto-Arrange")
+        self.arrange_btn.clicked.connect(self.auto_arrange)
+        header_layout.addWidget(self.arrange_btn)
+        
+        self.undo_btn = QPushButton("↶ Undo")
+        self.undo_btn.clicked.connect(self.undo)
+        self.undo_btn.setEnabled(False)
+        header_layout.addWidget(self.undo_btn)
+        
+        self.redo_btn = QPushButton("↷ Redo")
+        self.redo_btn.clicked.connect(self.redo)
+        self.redo_btn.setEnabled(False)
+        header_layout.addWidget(self.redo_btn)
+        
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+        
+        clear_btn = QPushButton("🗑️ Clear All")
+        clear_btn.clicked.connect(self.clear_all)
+        clear_btn.setStyleSheet("background: #F44336; border-color: #F44336;")
+        header_layout.addWidget(clear_btn)
+        
+        center_layout.addLayout(header_layout)
+        
+        # Shape selector
+        shape_layout = QHBoxLayout()
+        shape_layout.addWidget(QLabel("Habitat Shape:"))
+        self.shape_combo = QComboBox()
+        self.shape_combo.addItems(catalog.HABITAT_SHAPES)
+        self.shape_combo.currentTextChanged.connect(self.change_shape)
+        self.shape_combo.setStyleSheet("""
+            QComboBox { background: #16213e; color: #00d4ff; border: 2px solid #00d4ff; 
+                       border-radius: 5px; padding: 5px; }
+        """)
+        shape_layout.addWidget(self.shape_combo)
+        shape_layout.addStretch()
+        
+        # Scene graph mode for large station layouts
+        shape_layout.addWidget(QLabel("Canvas:"))
+        self.canvas_combo = QComboBox()
+        self.canvas_combo.addItems(["Standard", "Scene Graph"])
+        self.canvas_combo.currentIndexChanged.connect(self.change_canvas_mode)
+        self.canvas_combo.setStyleSheet(self.shape_combo.styleSheet())
+        shape_layout.addWidget(self.canvas_combo)
+        
+        # Live power / thermal overlay
+        shape_layout.addWidget(QLabel("Heat Map:"))
+        self.heat_combo = QComboBox()
+        self.heat_combo.addItems(HEAT_MAP_MODES)
+        self.heat_combo.currentIndexChanged.connect(self.heat_map_changed)
+        self.heat_combo.setStyleSheet(self.shape_combo.styleSheet())
+        shape_layout.addWidget(self.heat_combo)
+        center_layout.addLayout(shape_layout)
+        
+        # Combined canvas with drop zone
+        canvas_container = QWidget()
+        canvas_layout = QVBoxLayout(canvas_container)
+        canvas_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.habitat_canvas = HabitatCanvas()
+        self.drop_zone = DropZone()
+        self.drop_zone.moduleDropped.connect(self.on_module_dropped)
+        self.drop_zone.moduleMoved.connect(self.on_module_moved)
+        self.drop_zone.moduleRemoved.connect(self.on_module_removed)
+        
+        self.scene_view = HabitatSceneView()
+        self.scene_view.moduleDropped.connect(self.on_module_dropped)
+        self.scene_view.moduleMoved.connect(self.on_module_moved)
+        self.scene_view.moduleRemoved.connect(self.on_module_removed)
+        
+        # Stack the canvas and drop zone
+        self.canvas_stack = QStackedWidget()
+        
+        # Create combined widget
+        combined_widget = QWidget()
+        combined_layout = QVBoxLayout(combined_widget)
+        combined_layout.setContentsMargins(0, 0, 0, 0)
+        combined_layout.addWidget(self.habitat_canvas)
+        
+        # Overlay drop zone on canvas
+        self.drop_zone.setParent(combined_widget)
+        self.drop_zone.setGeometry(0, 0, 800, 600)
+        # Keep the overlay, and so its hull, aligned with the outline drawn below
+        self.habitat_canvas.resized.connect(self.drop_zone.resize)
+        
+        self.canvas_stack.addWidget(combined_widget)
+        self.canvas_stack.addWidget(self.scene_view)
+        center_layout.addWidget(self.canvas_stack)
+        
+        simulate_btn = QPushButton("🚀 Run Simulation")
+        simulate_btn.clicked.connect(self.run_simulation)
+        simulate_btn.setStyleSheet("background: #4CAF50; border-color: #4CAF50; padding: 15px; font-size: 16px; font-weight: bold;")
+        center_layout.addWidget(simulate_btn)
+        
+        layout.addWidget(center_panel)
+        
+        # Right panel - Stats and metrics
+        right_panel = QWidget()
+        right_panel.setMaximumWidth(300)
+        right_layout = QVBoxLayout(right_panel)
+        
+        self.game_stats = GameStats(self.toasts)
+        right_layout.addWidget(self.game_stats)
+        
+        metrics_label = QLabel("📊 Live Metrics")
+        metrics_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px;")
+        right_layout.addWidget(metrics_label)
+        
+        self.metrics_display = QLabel(self.get_metrics_text())
+        self.metrics_display.setStyleSheet("background: #16213e; padding: 15px; border-radius: 10px; font-size: 11px;")
+        right_layout.addWidget(self.metrics_display)
+        
+        # Mission requirements
+        self.mission_info = QLabel("🎯 Mission Requirements")
+        self.mission_info.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px;")
+        right_layout.addWidget(self.mission_info)
+        
+        self.mission_display = QLabel(self.get_mission_requirements())
+        self.mission_display.setStyleSheet("background: #16213e; padding: 10px; border-radius: 10px; font-size: 10px;")
+        right_layout.addWidget(self.mission_display)
+        self.mission_info.setVisible(bool(self.current_mission))
+        self.mission_display.setVisible(bool(self.current_mission))
+        
+        # NASA Standards info
+        nasa_info = QLabel("📋 NASA Standards")
+        nasa_info.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px;")
+        right_layout.addWidget(nasa_info)
+        
+        self.nasa_display = QLabel(nasa_standards_text(self.current_mission))
+        self.nasa_display.setStyleSheet("background: #16213e; padding: 10px; border-radius: 10px; font-size: 10px;")
+        right_layout.addWidget(self.nasa_display)
+        
+        validation_label = QLabel("✅ Validation")
+        validation_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px;")
+        right_layout.addWidget(validation_label)
+        
+        self.validation_display = QLabel("Add modules to see validation")
+        self.validation_display.setStyleSheet("background: #16213e; padding: 15px; border-radius: 10px;")
+        right_layout.addWidget(self.validation_display)
+        
+        # Auto-Arrange candidates, shown when a run finishes; clicking one
+        # applies it, and the list stays up to compare others
+        self.arrangements = []
+        self.arrange_label = QLabel("🤖 Auto-Arrange")
+        self.arrange_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px;")
+        right_layout.addWidget(self.arrange_label)
+        
+        self.arrange_list = QListWidget()
+        self.arrange_list.setStyleSheet("""
+            QListWidget { background: #16213e; color: #00d4ff; border-radius: 10px; padding: 5px; font-size: 11px; }
+            QListWidget::item:selected { background: #00d4ff; color: #0a0a0a; }
+        """)
+        self.arrange_list.itemClicked.connect(self.apply_arrangement)
+        right_layout.addWidget(self.arrange_list)
+        self.show_arrangements([])
+        
+        layout.addWidget(right_panel)
+    
+    def refresh(self, user_data):
+        # Same mission: keep the in-progress layout. New mission: start fresh.
+        self.user_data = user_data
+        mission = user_data.get('current_mission', {})
+        if mission.get('id') == self.current_mission.get('id'):
+            return
+        
+        self.current_mission = mission
+        self.header_label.setText(f"🏗️ {mission.get('name', 'Free Design')}")
+        self.mission_display.setText(self.get_mission_requirements())
+        self.nasa_display.setText(nasa_standards_text(mission))
+        self.mission_info.setVisible(bool(mission))
+        self.mission_display.setVisible(bool(mission))
+        self.game_stats.reset()
+        self.show_arrangements([])
+        self.reset_layout(mission)
+    
+    def on_module_dropped(self, icon, module_type, x, y):
+        self.edit(('add', self.model.new_key(), {
+            'type': module_type,
+            'icon': icon,
+            'x': x,
+            'y': y
+        }))
+        
+        self.game_stats.add_score(50)
+        
+        if len(self.model) == 1:
+            self.game_stats.add_achievement("First Module Placed!")
+        elif len(self.model) == 5:
+            self.game_stats.add_achievement("Habitat Taking Shape!")
+        elif len(self.model) == 10:
+            self.game_stats.add_achievement("Master Builder!")
+    
+    def on_module_moved(self, key, x, y):
+        command = self.model.move_command(key, x, y)
+        if command:
+            self.edit(command)
+    
+    def on_module_removed(self, key):
+        self.edit(self.model.remove_command(key))
+    
+    def active_canvas(self):
+        return self.scene_view if self.canvas_stack.currentIndex() == 1 else self.drop_zone
+    
+    # LayoutModel listener: mirror every change to the layout, whether a new
+    # edit, an undo or a redo, onto the visible canvas
+    
+    def module_added(self, key, module):
+        self.active_canvas().add_module(key, module['type'], module['icon'], module['x'], module['y'])
+    
+    def module_removed(self, key, module):
+        self.active_canvas().remove_module(key)
+    
+    def module_moved(self, key, x, y):
+        self.active_canvas().move_module(key, x, y)
+    
+    def shape_changed(self, shape):
+        if self.shape_combo.currentText() != shape:
+            self.shape_combo.blockSignals(True)
+            self.shape_combo.setCurrentText(shape)
+            self.shape_combo.blockSignals(False)
+        self.habitat_canvas.set_shape(shape)
+        self.drop_zone.set_shape(shape)
+        self.scene_view.set_shape(shape)
+    
+    def edit(self, command):
+        habicon_history.apply(self.model, command)
+        self.history.record(command)
+        self.edited()
+    
+    def undo(self):
+        if self.history.undo(self.model):
+            self.edited()
+    
+    def redo(self):
+        if self.history.redo(self.model):
+            self.edited()
+    
+    def edited(self):
+        self.undo_btn.setEnabled(self.history.can_undo())
+        self.redo_btn.setEnabled(self.history.can_redo())
+        self.update_metrics()
+        self.update_heat_map()
+    
+    def heat_map_changed(self):
+        # The bus and heat lines of the metrics panel come and go with it
+        self.update_heat_map()
+        self.update_metrics()
+    
+    def update_heat_map(self):
+        # Re-solves only if the layout changed since the last solve
+        mode = HEAT_MAP_MODES[self.heat_combo.currentIndex()]
+        grid = self.model.network
+        colors = {}
+        if mode == "Temperature":
+            grid.solve()
+            low, high = HEAT_TEMP_RANGE
+            for key, temp in grid.temperature.items():
+                colors[key] = heat_color((temp - low) / (high - low))
+        elif mode == "Voltage Drop":
+            for key in self.model.modules:
+                drop = grid.voltage_drop(key)
+                colors[key] = UNPOWERED_TINT if drop is None else heat_color(drop / (2 * network.VOLTAGE_DROP_LIMIT))
+        self.active_canvas().set_heat_map(colors)
+    
+    def clear_all(self):
+        if self.model.modules:
+            self.edit(habicon_history.clear_command(self.model.modules))
+    
+    def reset_layout(self, mission=None):
+        # Fresh start for a new mission: nothing to undo back to
+        self.drop_zone.clear_modules()
+        self.scene_view.clear_modules()
+        self.model.reset(mission)
+        self.history.reset(self.model.shape)
+        self.edited()
+    
+    def update_metrics(self):
+        # Mission requirements and NASA standards don't depend on the layout
+        self.set_label_text(self.metrics_display, self.get_metrics_text())
+        self.set_label_text(self.validation_display, self.get_validation_text())
+    
+    def set_label_text(self, label, text):
+        # Skip the relayout when nothing changed
+        if label.text() != text:
+            label.setText(text)
+    
+    def get_layout(self):
+        return self.model.layout()
+    
+    def save_layout(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Habitat Layout", "habitat.habl", LAYOUT_FILE_FILTER)
+        if not path:
+            return
+        import habicon_archive
+        layout = self.get_layout()
+        try:
+            habicon_archive.save_layouts(path, [layout])
+        except OSError as e:
+            self.toasts.notify("Save Failed", str(e), 'warning')
+            return
+        # A copy goes into the player's profile too
+        self.app.progress_store().save_layout(self.user_data['username'], QFileInfo(path).fileName(), layout)
+    
+    def load_layout(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Habitat Layout", "", LAYOUT_FILE_FILTER)
+        if not path:
+            return
+        import habicon_archive
+        try:
+            layouts = habicon_archive.load_layouts(path)
+        except (OSError, ValueError) as e:
+            self.toasts.notify("Load Failed", str(e), 'warning')
+            return
+        if layouts:
+            self.apply_layout(layouts[0])
+    
+    def auto_arrange(self):
+        self.arrange_btn.setEnabled(False)
+        self.arrange_btn.setText("🤖 Arranging...")
+        # A new seed each time, so asking again explores further
+        self.arrange_runs += 1
+        worker = OptimizerWorker(self.model.shape, self.current_mission,
+                                 self.arrange_runs, self.app.process_pool())
+        worker.signals.finished.connect(self.choose_arrangement)
+        worker.signals.failed.connect(self.arrange_failed)
+        self.app.thread_pool.start(worker)
+    
+    def arrange_done(self):
+        self.arrange_btn.setEnabled(True)
+        self.arrange_btn.setText("🤖 Auto-Arrange")
+    
+    def arrange_failed(self, message):
+        self.arrange_done()
+        self.toasts.notify("Auto-Arrange Failed", message, 'warning')
+    
+    def choose_arrangement(self, candidates):
+        self.arrange_done()
+        self.show_arrangements(candidates)
+        if candidates:
+            self.toasts.notify("🤖 Auto-Arrange", f"{len(candidates)} ranked layouts ready - pick one from the list", 'info')
+        else:
+            self.toasts.notify("🤖 Auto-Arrange", "No layout fits this shape and mission", 'warning')
+    
+    def show_arrangements(self, candidates):
+        self.arrangements = candidates
+        self.arrange_list.clear()
+        for rank, c in enumerate(candidates, 1):
+            self.arrange_list.addItem(f"#{rank}  Validity {c['validity']}%  ·  {len(c['layout']['modules'])} modules  ·  {c['mass']:,.0f} kg")
+        self.arrange_label.setVisible(bool(candidates))
+        self.arrange_list.setVisible(bool(candidates))
+    
+    def apply_arrangement(self, item):
+        self.apply_layout(self.arrangements[self.arrange_list.row(item)]['layout'])
+    
+    def apply_layout(self, layout):
+        # Switch to the saved mission and shape, then place its modules.
+        # Another mission starts a fresh history (see refresh), so the
+        # previous design is gone and undo only empties the loaded one;
+        # for the same mission a single undo brings the previous design back.
+        self.user_data['current_mission'] = layout.get('mission') or {}
+        self.refresh(self.user_data)
+        
+        steps = list(habicon_history.clear_command(self.model.modules)[1])
+        shape = engine.layout_shape(layout)
+        if shape != self.model.shape:
+            steps.append(('shape', self.model.shape, shape))
+        for module in layout.get('modules', []):
+            steps.append(('add', self.model.new_key(),
+                          {'type': module['type'], 'icon': module['icon'], 'x': module['x'], 'y': module['y']}))
+        self.edit(('batch', tuple(steps)))
+    
+    def get_metrics_text(self):
+        metrics = self.model.metrics.compliance_status()
+        
+        return f"""
+👥 Crew: {metrics['crew']} for {metrics['days']} days
+🏗️ Modules: {metrics['module_count']}
+🏠 Shape: {metrics['shape']}
+📏 Volume: {metrics['volume']:.1f} / {metrics['min_volume']:.0f} m³
+⚡ Power: {metrics['power']:.1f} / {metrics['min_power']:.1f} kW
+⚖️ Mass: {metrics['mass']:.0f} kg
+💧 Water: {metrics['water']:.1f} L/day
+🫁 O₂: {metrics['oxygen']:.2f} kg/day
+🍽️ Food: {metrics['food']:.2f} kg/day
+{self.get_traffic_text(metrics['crew'])}
+{self.get_network_text()}
+        """
+    
+    def get_network_text(self):
+        if not self.model.modules:
+            return "🔌 Bus: no modules"
+        if not self.heat_combo.currentIndex():
+            # Solving the network brings in NumPy; edits don't pay for it
+            # until the overlay asks
+            return "🔌 Bus & heat: pick a Heat Map to solve"
+        grid = self.model.network.report()
+        if grid['unpowered'] == len(self.model.modules):
+            bus = "🔌 Bus: no power module connected"
+        else:
+            bus = f"🔌 Bus: worst drop {grid['max_drop'] * 100:.1f}%"
+            if grid['brownout']:
+                bus += f", {grid['brownout']} over {network.VOLTAGE_DROP_LIMIT * 100:.0f}%"
+            if grid['unpowered']:
+                bus += f", {grid['unpowered']} unpowered"
+        heat = f"🌡️ Hottest: {grid['max_temp']:.1f} °C"
+        if grid['overheated']:
+            heat += f", {grid['overheated']} over {habicon_requirements.CABIN_TEMP_LIMIT:.0f} °C"
+        return f"{bus}\n{heat}"
+    
+    def get_traffic_text(self, crew):
+        traffic = self.model.traffic.report(crew)
+        if traffic['commute'] is None:
+            commute = "🚶 Daily trips: no route from quarters"
+        else:
+            commute = f"🚶 Daily trips: {traffic['commute']:.1f} m avg"
+            if traffic['trips_unreachable']:
+                commute += f", {traffic['trips_unreachable']} unreachable"
+        if traffic['egress'] is None:
+            egress = "🚪 Egress: no airlock reachable"
+        else:
+            egress = f"🚪 Egress: {traffic['egress']:.1f} m worst case"
+            if traffic['egress_unreachable']:
+                egress += f", {traffic['egress_unreachable']} cut off"
+        lines = [commute, egress]
+        if traffic['hotspots']:
+            _, module_type, passes = traffic['hotspots'][0]
+            lines.append(f"🚦 Busiest: {module_type} ({passes:.0f} passes/day)")
+        return "\n".join(lines)
+    
+    def get_mission_requirements(self):
+        if not self.current_mission:
+            return "No active mission"
+        
+        requirements = self.current_mission.get('requirements', [])
+        req_text = f"""
+🎯 {self.current_mission['name']}
+🌍 {self.current_mission['location']}
+🕰️ {self.current_mission['duration']}
+👥 {self.current_mission['crew']} crew
+
+📋 Required Modules:
+        """
+        
+        for req in requirements:
+            req_text += f"• {req}\n"
+        
+        return req_text
+    
+    def change_shape(self, shape):
+        if shape != self.model.shape:
+            self.edit(('shape', self.model.shape, shape))
+    
+    def change_canvas_mode(self, index):
+        # Only the visible canvas holds placed modules; rebuild it on switch
+        if index == 1:
+            self.drop_zone.clear_modules()
+            self.scene_view.load_modules(self.model.modules)
+        else:
+            self.scene_view.clear_modules()
+            self.drop_zone.load_modules(self.model.modules)
+        self.canvas_stack.setCurrentIndex(index)
+        self.update_heat_map()
+    
+    def get_validation_text(self):
+        if not self.model.modules:
+            return "❌ No modules placed"
+        
+        status = []
+        checks = self.model.metrics.designer_checks() + engine.connectivity_checks(self.model.connectivity)
+        for req, passed in checks:
+            status.append(f"{'✅' if passed else '❌'} {req}")
+        
+        return "\n".join(status)
+    
+    def run_simulation(self):
+        if len(self.model) < 4:
+            self.toasts.notify("⚠️ Warning", "Place at least 4 NASA modules before simulation!", 'warning')
+            return
+        
+        habitat_data = self.get_layout()
+        habitat_data.update({
+            'user': self.user_data,
+            'score': self.game_stats.score
+        })
+        self.app.show_validity_check(habitat_data)
+    
+    def back_to_dashboard(self):
+        self.app.show_dashboard(self.user_data)
+
+class ValidityCheckWindow(QMainWindow):
+    def __init__(self, app_controller, habitat_data):
+        super().__init__()
+        self.app = app_controller
+        self.habitat_data = habitat_data
+        self.init_ui()
+    
+    def init_ui(self):
+        self.setWindowTitle("📋 NASA Validity Check")
+        self.setGeometry(100, 100, 1000, 700)
+        self.setStyleSheet("""
+            QMainWindow { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #0a0a0a, stop:1 #1a1a2e); }
+            QLabel { color: #00d4ff; font-family: 'Consolas'; }
+            QPushButton { background: #16213e; color: #00d4ff; border: 2px solid #00d4ff; 
+                         border-radius: 8px; padding: 8px; }
+        """)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        
+        # Header
+        header_layout = QHBoxLayout()
+        back_btn = QPushButton("← Back to Designer")
+        back_btn.clicked.connect(self.back_to_designer)
+        header_layout.addWidget(back_btn)
+        
+        header_layout.addStretch()
+        header = QLabel("📋 NASA Habitat Validity Check")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("font-size: 24px; font-weight: bold; margin: 20px;")
+        header_layout.addWidget(header)
+        header_layout.addStretch()
+        
+        layout.addLayout(header_layout)
+        
+        # Validity results
+        content_layout = QHBoxLayout()
+        
+        # Left panel - Requirements check
+        left_panel = QWidget()
+        left_layout = QVBoxLayout(left_panel)
+        
+        req_label = QLabel("📋 NASA Requirements Check")
+        req_label.setStyleSheet("font-size: 18px; font-weight: bold; margin: 10px;")
+        left_layout.addWidget(req_label)
+        
+        self.requirements_display = QLabel()
+        self.requirements_display.setStyleSheet("background: #16213e; padding: 20px; border-radius: 10px; font-size: 12px;")
+        left_layout.addWidget(self.requirements_display)
+        
+        content_layout.addWidget(left_panel)
+        
+        # Right panel - Compliance status
+        right_panel = QWidget()
+        right_layout = QVBoxLayout(right_panel)
+        
+        status_label = QLabel("✅ Compliance Status")
+        status_label.setStyleSheet("font-size: 18px; font-weight: bold; margin: 10px;")
+        right_layout.addWidget(status_label)
+        
+        self.status_display = QLabel()
+        self.status_display.setStyleSheet("background: #16213e; padding: 20px; border-radius: 10px; font-size: 12px;")
+        right_layout.addWidget(self.status_display)
+        
+        # Overall validity
+        self.overall_label = QLabel()
+        self.overall_label.setAlignment(Qt.AlignCenter)
+        right_layout.addWidget(self.overall_label)
+        
+        content_layout.addWidget(right_panel)
+        layout.addLayout(content_layout)
+        
+        self.warning_label = QLabel()
+        self.warning_label.setAlignment(Qt.AlignCenter)
+        self.warning_label.setStyleSheet("color: #F44336; font-size: 16px; font-weight: bold; margin: 20px;")
+        layout.addWidget(self.warning_label)
+        
+        # Action buttons
+        button_layout = QHBoxLayout()
+        
+        self.proceed_btn = QPushButton("🚀 Proceed to Simulation")
+        self.proceed_btn.clicked.connect(self.proceed_to_simulation)
+        self.proceed_btn.setStyleSheet("background: #4CAF50; border-color: #4CAF50; color: white; font-weight: bold; padding: 15px; font-size: 16px;")
+        button_layout.addWidget(self.proceed_btn)
+        
+        redesign_btn = QPushButton("🏗️ Redesign Habitat")
+        redesign_btn.clicked.connect(self.back_to_designer)
+        button_layout.addWidget(redesign_btn)
+        
+        layout.addLayout(button_layout)
+        self.update_report()
+    
+    def refresh(self, habitat_data):
+        self.habitat_data = habitat_data
+        self.update_report()
+    
+    def update_report(self):
+        checks = engine.requirements_check(self.habitat_data)
+        self.requirements_display.setText(self.get_requirements_check(checks))
+        self.status_display.setText(self.get_compliance_status())
+        
+        validity_score = self.calculate_validity_score()
+        validity_color = "#4CAF50" if validity_score >= 80 else "#FF9800" if validity_score >= 60 else "#F44336"
+        
+        mission = self.habitat_data.get('mission', {})
+        mission_name = mission.get('name', 'Free Design') if mission else 'Free Design'
+        
+        self.overall_label.setText(f"Mission: {mission_name}\nValidity: {validity_score}%")
+        self.overall_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {validity_color}; margin: 20px; padding: 15px; background: #16213e; border-radius: 10px;")
+        
+        min_score = engine.min_validity_score(mission)
+        passed = engine.layout_passed(validity_score, mission, checks)
+        self.proceed_btn.setVisible(passed)
+        self.warning_label.setVisible(not passed)
+        if validity_score < min_score:
+            self.warning_label.setText(f"⚠️ Mission requires {min_score}% validity. Current: {validity_score}%")
+        else:
+            self.warning_label.setText("⚠️ Dock every module into one pressurized habitat before launch")
+    
+    def get_requirements_check(self, checks):
+        result = ""
+        for requirement, passed in checks:
+            status = "✅" if passed else "❌"
+            result += f"{status} {requirement}\n"
+        
+        return result
+    
+    def get_compliance_status(self):
+        status = engine.compliance_status(self.habitat_data)
+        
+        return f"""
+📏 Volume: {status['volume']:.1f} m³ {'(✅ OK)' if status['volume_ok'] else '(❌ LOW)'}
+   Required: {status['min_volume']:.0f} m³ minimum
+
+⚡ Power: {status['power']:.1f} kW {'(✅ OK)' if status['power_ok'] else '(❌ LOW)'}
+   Required: {status['min_power']} kW minimum
+
+⚖️ Mass: {status['mass']:.0f} kg {'(✅ OK)' if status['mass_ok'] else '(❌ HIGH)'}
+   Limit: {status['mass_limit']:,} kg maximum
+
+🏠 Shape: {status['shape']}
+   Hull: {status['length']:.1f} m pressurized, {status['structure']:,.0f} kg structure
+
+👥 Crew: {status['crew']} astronauts, {status['days']} days
+📋 Modules: {status['module_count']} NASA standard
+        """
+    
+    def calculate_validity_score(self):
+        return engine.validity_score(self.habitat_data)
+    
+    def proceed_to_simulation(self):
+        self.app.show_simulation(self.habitat_data)
+    
+    def back_to_designer(self):
+        user_data = self.habitat_data['user']
+        self.app.show_habitat_creator(user_data)
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(int, int, object)   # trials done, total, running summary
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class SimulationWorker(QRunnable):
+    # Runs one layout's Monte Carlo trials off the GUI thread, chunk by chunk,
+    # on the app's process pool when there is one
+    def __init__(self, layout, executor=None):
+        super().__init__()
+        self.layout = layout
+        self.executor = executor
+        self.cancelled = False
+        self.signals = WorkerSignals()
+    
+    def cancel(self):
+        self.cancelled = True
+    
+    def run(self):
+        chunks = habicon_sim.simulate_chunks(self.layout, executor=self.executor)
+        summary = None
+        try:
+            for done, total, summary in chunks:
+                if self.cancelled:
+                    return
+                self.signals.progress.emit(done, total, summary)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            chunks.close()
+        self.signals.finished.emit(summary)
+
+class OptimizerWorker(QRunnable):
+    # Searches for ranked auto-arranged layouts off the GUI thread
+    def __init__(self, shape, mission, seed=0, executor=None):
+        super().__init__()
+        self.shape = shape
+        self.mission = mission
+        self.seed = seed
+        self.executor = executor
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        try:
+            candidates = habicon_optimizer.optimize(self.shape, self.mission, seed=self.seed, executor=self.executor)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(candidates)
+
+class SimulationWindow(QMainWindow):
+    def __init__(self, app_controller, habitat_data):
+        super().__init__()
+        self.app = app_controller
+        self.habitat_data = habitat_data
+        self.worker = None
+        self.phases = [
+            "Testing life support systems...",
+            "Analyzing power distribution...",
+            "Simulating crew activities...",
+            "Evaluating safety protocols...",
+            "Generating NASA report..."
+        ]
+        self.init_ui()
+        self.start_simulation()
+    
+    def refresh(self, habitat_data):
+        self.habitat_data = habitat_data
+        self.start_simulation()
+    
+    def init_ui(self):
+        self.setWindowTitle("🧪 Habitat Simulation")
+        self.setGeometry(100, 100, 1000, 700)
+        self.setStyleSheet("""
+            QMainWindow { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #0a0a0a, stop:1 #1a1a2e); }
+            QLabel { color: #00d4ff; font-family: 'Consolas'; }
+            QProgressBar { border: 2px solid #00d4ff; border-radius: 8px; 
+                          text-align: center; background: #16213e; }
+            QProgressBar::chunk { background: #00d4ff; border-radius: 6px; }
+        """)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        
+        header = QLabel("🧪 Running Habitat Simulation")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("font-size: 24px; font-weight: bold; margin: 20px;")
+        layout.addWidget(header)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        layout.addWidget(self.progress_bar)
+        
+        self.progress_label = QLabel("Initializing simulation...")
+        self.progress_label.setAlignment(Qt.AlignCenter)
+        self.progress_label.setStyleSheet("font-size: 16px; margin: 10px;")
+        layout.addWidget(self.progress_label)
+        
+        self.metrics_label = QLabel("")
+        self.metrics_label.setAlignment(Qt.AlignCenter)
+        self.metrics_label.setStyleSheet("font-size: 14px; background: #16213e; padding: 20px; border-radius: 10px; margin: 20px;")
+        layout.addWidget(self.metrics_label)
+        
+        self.cancel_btn = QPushButton("✖ Cancel Simulation")
+        self.cancel_btn.setStyleSheet("""
+            QPushButton { background: #ff4757; color: white; border: none; padding: 12px 25px;
+                         font-size: 14px; font-weight: bold; border-radius: 8px; }
+            QPushButton:hover { background: #ff3838; }
+        """)
+        self.cancel_btn.clicked.connect(self.cancel_simulation)
+        layout.addWidget(self.cancel_btn, alignment=Qt.AlignCenter)
+        
+        layout.addStretch()
+    
+    def start_simulation(self):
+        self.stop_worker()
+        self.progress_bar.setValue(0)
+        self.progress_label.setText("Initializing simulation...")
+        self.metrics_label.setText("")
+        self.cancel_btn.setEnabled(True)
+        
+        self.worker = SimulationWorker(self.habitat_data, self.app.process_pool())
+        self.worker.signals.progress.connect(self.update_simulation)
+        self.worker.signals.finished.connect(self.show_results)
+        self.worker.signals.failed.connect(self.simulation_failed)
+        self.app.thread_pool.start(self.worker)
+    
+    def stop_worker(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.signals.disconnect()
+            self.worker = None
+    
+    def cancel_simulation(self):
+        self.stop_worker()
+        self.app.show_habitat_creator(self.habitat_data.get('user', {}))
+    
+    def from_current_worker(self):
+        # Signals queued by a cancelled worker can still arrive; drop them
+        return self.worker is not None and self.sender() is self.worker.signals
+    
+    def update_simulation(self, done, total, summary):
+        if not self.from_current_worker():
+            return
+        self.progress_bar.setValue(100 * done // total)
+        self.progress_label.setText(self.phases[min(len(self.phases) - 1, len(self.phases) * done // total)])
+        
+        # Running averages over the trials finished so far
+        margins = summary['margins']
+        self.metrics_label.setText(f"""
+🎲 Trials: {done} / {total} ({summary['days']}-day mission)
+👥 Crew Survival: {summary['success_rate'] * 100:.1f}%
+🫁 Lowest Oxygen Reserve: {margins['o2'] * 100:.1f}%
+💧 Lowest Water Reserve: {margins['water'] * 100:.1f}%
+🍴 Lowest Food Reserve: {margins['food'] * 100:.1f}%
+⚡ Power Availability: {summary['power_ratio'] * 100:.1f}%
+🌡️ Cabin Temperature: {summary['timeline'][-1]['temperature']:.1f}°C
+        """)
+    
+    def simulation_failed(self, message):
+        if not self.from_current_worker():
+            return
+        self.worker = None
+        self.cancel_btn.setEnabled(False)
+        self.progress_label.setText(f"Simulation failed: {message}")
+    
+    def show_results(self, result):
+        if not self.from_current_worker():
+            return
+        self.worker = None
+        self.progress_bar.setValue(100)
+        self.progress_label.setText("Simulation complete! Generating results...")
+        results_data = {
+            'habitat': self.habitat_data,
+            'scores': result['scores'],
+            'simulation': result
+        }
+        self.app.show_results(results_data)
+
+class ResultsWindow(QMainWindow):
+    def __init__(self, app_controller, results_data):
+        super().__init__()
+        self.app = app_controller
+        self.results_data = results_data
+        self.init_ui()
+        self.record_result()
+    
+    def init_ui(self):
+        self.setWindowTitle("📄 NASA Evaluation Report")
+        self.setGeometry(100, 100, 1000, 700)
+        self.setStyleSheet("""
+            QMainWindow { background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+                         stop:0 #0a0a0a, stop:1 #1a1a2e); }
+            QLabel { color: #00d4ff; font-family: 'Consolas'; }
+            QPushButton { background: #16213e; color: #00d4ff; border: 2px solid #00d4ff; 
+                         border-radius: 8px; padding: 8px; }
+        """)
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        layout = QVBoxLayout(central_widget)
+        
+        header_layout = QHBoxLayout()
+        
+        back_creator_btn = QPushButton("← Redesign Habitat")
+        back_creator_btn.clicked.connect(self.back_to_creator)
+        back_creator_btn.setStyleSheet("background: #ff6b35; color: white; font-weight: bold;")
+        header_layout.addWidget(back_creator_btn)
+        
+        back_dashboard_btn = QPushButton("← Dashboard")
+        back_dashboard_btn.clicked.connect(self.back_to_dashboard)
+        header_layout.addWidget(back_dashboard_btn)
+        
+        header_layout.addStretch()
+        
+        header = QLabel("📄 NASA Evaluation Report")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet("font-size: 24px; font-weight: bold;")
+        header_layout.addWidget(header)
+        
+        header_layout.addStretch()
+        layout.addLayout(header_layout)
+        
+        content_layout = QHBoxLayout()
+        
+        # Score display
+        score_widget = QWidget()
+        score_widget.setMaximumWidth(300)
+        score_layout = QVBoxLayout(score_widget)
+        
+        self.score_label = QLabel()
+        self.score_label.setAlignment(Qt.AlignCenter)
+        self.score_label.setStyleSheet("font-size: 20px; font-weight: bold; margin: 20px;")
+        score_layout.addWidget(self.score_label)
+        
+        self.score_value = QLabel()
+        self.score_value.setAlignment(Qt.AlignCenter)
+        score_layout.addWidget(self.score_value)
+        
+        self.game_score_label = QLabel()
+        self.game_score_label.setAlignment(Qt.AlignCenter)
+        self.game_score_label.setStyleSheet("font-size: 16px; color: #4CAF50; margin: 10px;")
+        score_layout.addWidget(self.game_score_label)
+        
+        content_layout.addWidget(score_widget)
+        
+        # Details
+        details_widget = QWidget()
+        details_layout = QVBoxLayout(details_widget)
+        
+        self.metrics_display = QLabel()
+        self.metrics_display.setStyleSheet("font-size: 14px; padding: 20px; background: #16213e; border-radius: 10px;")
+        details_layout.addWidget(self.metrics_display)
+        
+        content_layout.addWidget(details_widget)
+        layout.addLayout(content_layout)
+        self.update_report()
+    
+    def refresh(self, results_data):
+        self.results_data = results_data
+        self.update_report()
+        self.record_result()
+    
+    def record_result(self):
+        # Saved as soon as the report is up, whichever way the player leaves it
+        habitat = self.results_data['habitat']
+        user_data = habitat['user']
+        mission = habitat.get('mission') or {}
+        scores = self.results_data['scores']
+        passed = habicon_sim.mission_passed(self.results_data['simulation'], mission)
+        if passed:
+            user_data['missions_completed'] = user_data.get('missions_completed', 0) + 1
+            user_data['level'] = user_data.get('level', 1) + 1
+            if 'id' in mission:
+                user_data.setdefault('completed', set()).add(mission['id'])
+        self.app.progress_store().record_result(user_data['username'], mission.get('id', 0), scores,
+                                                engine.validity_score(habitat), passed, habitat)
+    
+    def update_report(self):
+        overall_score = self.results_data['scores']['overall']
+        grade = self.get_grade(overall_score)
+        
+        self.score_label.setText(f"Mission Grade: {grade}")
+        self.score_value.setText(f"{overall_score}%")
+        self.score_value.setStyleSheet(f"font-size: 48px; font-weight: bold; color: {self.get_score_color(overall_score)};")
+        
+        game_score = self.results_data['habitat'].get('score', 0)
+        self.game_score_label.setText(f"🎮 Game Score: {game_score}")
+        
+        scores = self.results_data['scores']
+        module_count = len(self.results_data['habitat'].get('modules', []))
+        habitat_shape = self.results_data['habitat'].get('shape', 'Unknown')
+        
+        # NASA module analysis
+        _, caps = engine.layout_bits(self.results_data['habitat'])
+        has_node = bool(caps & catalog.CAP_NODE)
+        has_eclss = bool(caps & catalog.CAP_ECLSS)
+        has_crew_quarters = bool(caps & catalog.CAP_CREW)
+        
+        metrics_text = f"""
+🫁 Life Support: {scores['lifesupport']}%
+⚡ Power Management: {scores['power']}%
+😊 Crew Comfort: {scores['comfort']}%
+🚨 Safety Systems: {scores['safety']}%
+
+🏗️ NASA Modules: {module_count}
+🏠 Habitat Shape: {habitat_shape}
+👥 Crew Size: {engine.layout_crew(self.results_data['habitat'])}
+
+📋 NASA Compliance:
+{'✅' if has_node else '❌'} Structural Node
+{'✅' if has_eclss else '❌'} Life Support (ECLSS)
+{'✅' if has_crew_quarters else '❌'} Crew Quarters
+
+✅ Strengths:
+• NASA-standard modules used
+• Proper habitat configuration
+• ISS-based design principles
+
+⚠️ Recommendations:
+• Add redundant life support
+• Include emergency systems
+        """
+        
+        self.metrics_display.setText(metrics_text)
+    
+    def get_grade(self, score):
+        if score >= 95: return 'A+'
+        if score >= 90: return 'A'
+        if score >= 85: return 'B+'
+        if score >= 80: return 'B'
+        if score >= 75: return 'C+'
+        if score >= 70: return 'C'
+        return 'D'
+    
+    def get_score_color(self, score):
+        if score >= 90: return '#4CAF50'
+        if score >= 70: return '#FF9800'
+        return '#F44336'
+    
+    def back_to_creator(self):
+        user_data = self.results_data['habitat']['user']
+        self.app.show_habitat_creator(user_data)
+    
+    def back_to_dashboard(self):
+        self.app.show_dashboard(self.results_data['habitat']['user'])
+
+class HabiconApp:
+    def __init__(self):
+        self.app = QApplication(sys.argv)
+        self.current_window = None
+        self.windows = {}
+        self.thread_pool = QThreadPool.globalInstance()
+        self.executor = None
+        self.progress = None
+        self.app.aboutToQuit.connect(self.shutdown)
+        
+        self.app.paletteChanged.connect(lambda palette: ModulePixmapCache.invalidate())
+        self.app.primaryScreenChanged.connect(lambda screen: ModulePixmapCache.invalidate())
+        self.show_login()
+        
+        # Render module pixmaps once the login screen is up, not before it
+        QTimer.singleShot(0, lambda: ModulePixmapCache.warm(catalog.MODULE_PALETTE, self.app.devicePixelRatio()))
+    
+    def show_window(self, window_class, *args):
+        # Each screen is built once, then refreshed with new data on entry
+        window = self.windows.get(window_class)
+        if window is None:
+            window = window_class(self, *args)
+            self.windows[window_class] = window
+        else:
+            window.refresh(*args)
+        
+        if self.current_window is not None and self.current_window is not window:
+            self.current_window.hide()
+        self.current_window = window
+        window.show()
+    
+    def show_login(self):
+        self.show_window(LoginWindow)
+    
+    def show_dashboard(self, user_data):
+        self.show_window(DashboardWindow, user_data)
+    
+    def show_habitat_creator(self, user_data):
+        self.show_window(HabitatCreatorWindow, user_data)
+    
+    def show_validity_check(self, habitat_data):
+        self.show_window(ValidityCheckWindow, habitat_data)
+    
+    def show_simulation(self, habitat_data):
+        self.show_window(SimulationWindow, habitat_data)
+    
+    def show_results(self, results_data):
+        self.show_window(ResultsWindow, results_data)
+    
+    def process_pool(self):
+        # Simulation trials run across every core; started on first use.
+        # Spawned, not forked: forking a process with Qt and progress writer
+        # threads running can leave a child waiting on a lock nobody holds.
+        if self.executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            try:
+                self.executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+            except (OSError, NotImplementedError):
+                return None
+        return self.executor
+    
+    def progress_store(self):
+        # Player progress database; opened at first login, written off the GUI thread
+        if self.progress is None:
+            import habicon_progress
+            self.progress = habicon_progress.ProgressStore()
+        return self.progress
+    
+    def shutdown(self):
+        for window in self.windows.values():
+            if isinstance(window, SimulationWindow):
+                window.stop_worker()
+        self.thread_pool.waitForDone()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        if self.progress is not None:
+            self.progress.close()
+    
+    def check_startup(self, started, budget_ms):
+        # Called once the event loop first goes idle with the login screen up
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        within = elapsed_ms <= budget_ms
+        print(f"Startup to login screen: {elapsed_ms:.0f} ms (budget {budget_ms} ms)"
+              f"{'' if within else ' - OVER BUDGET'}", file=sys.stderr)
+        self.app.exit(0 if within else 1)
+    
+    def run(self):
+        return self.app.exec_()
+
+def main(started=None, check_startup=False, budget_ms=STARTUP_BUDGET_MS):
+    started = time.perf_counter() if started is None else started
+    habicon = HabiconApp()
+    if check_startup:
+        QTimer.singleShot(0, lambda: habicon.check_startup(started, budget_ms))
+    return habicon.run()
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+HABICON - Edit History
+Undo / redo for the habitat designer as a tree of edit commands. An edit
+stores only what it changed (the module record added or removed, a move's
+old and new position, the old and new shape) and module records are never
+mutated in place, so every edit costs O(1) memory however large the
+layout, and earlier states share everything they have in common. Undoing
+and then editing starts a new branch; the old branch stays reachable.
+
+Any point in the tree is rebuilt by replaying its path from the root onto
+a LayoutState, or reached from the current point by undoing up to the
+common ancestor and redoing down.
+
+Commands are plain tuples:
+    ('add', key, module)          ('remove', key, module)
+    ('move', key, (x0, y0), (x1, y1))
+    ('shape', old, new)           ('batch', (command, ...))
+
+They are applied to an editor: any object with add_module(key, module),
+remove_module(key), move_module(key, x, y) and set_shape(shape).
+"""
+
+
+class Edit:
+    __slots__ = ('parent', 'command', 'children', 'depth')
+
+    def __init__(self, parent, command):
+        self.parent = parent
+        self.command = command
+        self.children = []
+        self.depth = parent.depth + 1 if parent else 0
+
+
+def apply(editor, command):
+    kind = command[0]
+    if kind == 'add':
+        editor.add_module(command[1], command[2])
+    elif kind == 'remove':
+        editor.remove_module(command[1])
+    elif kind == 'move':
+        editor.move_module(command[1], *command[3])
+    elif kind == 'shape':
+        editor.set_shape(command[2])
+    elif kind == 'batch':
+        for step in command[1]:
+            apply(editor, step)
+
+
+def revert(editor, command):
+    kind = command[0]
+    if kind == 'add':
+        editor.remove_module(command[1])
+    elif kind == 'remove':
+        editor.add_module(command[1], command[2])
+    elif kind == 'move':
+        editor.move_module(command[1], *command[2])
+    elif kind == 'shape':
+        editor.set_shape(command[1])
+    elif kind == 'batch':
+        for step in reversed(command[1]):
+            revert(editor, step)
+
+
+def clear_command(modules):
+    # Removes every module of a {key: module} mapping
+    return ('batch', tuple(('remove', key, module) for key, module in modules.items()))
+
+
+class LayoutState:
+    # Bare editor for replaying history without a GUI
+    def __init__(self, shape=None):
+        self.modules = {}
+        self.shape = shape
+
+    def add_module(self, key, module):
+        self.modules[key] = module
+
+    def remove_module(self, key):
+        del self.modules[key]
+
+    def move_module(self, key, x, y):
+        self.modules[key] = dict(self.modules[key], x=x, y=y)
+
+    def set_shape(self, shape):
+        self.shape = shape
+
+    def layout(self, mission=None):
+        return {'modules': list(self.modules.values()), 'shape': self.shape, 'mission': mission or {}}
+
+
+class History:
+    def __init__(self, shape=None):
+        self.reset(shape)
+
+    def reset(self, shape=None):
+        # shape: the layout's shape before the first edit, for replay
+        self.shape = shape
+        self.root = Edit(None, None)
+        self.current = self.root
+
+    def record(self, command):
+        # Call after applying the command to the editor
+        edit = Edit(self.current, command)
+        self.current.children.append(edit)
+        self.current = edit
+        return edit
+
+    def can_undo(self):
+        return self.current is not self.root
+
+    def can_redo(self):
+        return bool(self.current.children)
+
+    def undo(self, editor):
+        if not self.can_undo():
+            return None
+        edit = self.current
+        revert(editor, edit.command)
+        self.current = edit.parent
+        return edit
+
+    def redo(self, editor, branch=-1):
+        # The most recent branch unless told otherwise
+        if not self.can_redo():
+            return None
+        edit = self.current.children[branch]
+        apply(editor, edit.command)
+        self.current = edit
+        return edit
+
+    def branches(self):
+        return list(self.current.children)
+
+    def checkout(self, node, editor):
+        # Undo up to the common ancestor, then redo down to node
+        up, down = self.current, node
+        path = []
+        while up.depth > down.depth:
+            revert(editor, up.command)
+            up = up.parent
+        while down.depth > up.depth:
+            path.append(down)
+            down = down.parent
+        while up is not down:
+            revert(editor, up.command)
+            up = up.parent
+            path.append(down)
+            down = down.parent
+        for edit in reversed(path):
+            apply(editor, edit.command)
+        self.current = node
+
+    def path(self, node=None):
+        node = node or self.current
+        edits = []
+        while node.parent is not None:
+            edits.append(node)
+            node = node.parent
+        edits.reverse()
+        return edits
+
+    def replay(self, node=None):
+        state = LayoutState(self.shape)
+        for edit in self.path(node):
+            apply(state, edit.command)
+        return state
@@ -0,0 +1,98 @@
+"""
+HABICON - Layout Model
+The designer's one copy of a habitat layout: module records by key, the
+hull shape, the mission, and a MetricsAccumulator, ConnectivityGraph,
+TrafficAnalysis and PowerThermalNetwork kept in step with every edit.
+Canvases and panels only mirror it, through a listener with
+module_added / module_removed / module_moved / shape_changed callbacks.
+
+It is also the editor habicon_history replays commands onto, so new
+edits, undo and redo all take the same path.
+"""
+
+import habicon_engine as engine
+from habicon_connectivity import ConnectivityGraph
+from habicon_traffic import TrafficAnalysis
+from habicon_network import PowerThermalNetwork
+
+
+class LayoutModel:
+    def __init__(self, shape=engine.DEFAULT_SHAPE, mission=None, listener=None):
+        self.shape = shape
+        self.listener = listener
+        self.next_key = 0
+        self.mission = mission or {}
+        self.modules = {}   # key -> module record; records are replaced, never mutated
+        self.connectivity = ConnectivityGraph()
+        self.traffic = TrafficAnalysis(self.connectivity)
+        self.network = PowerThermalNetwork(self.connectivity)
+        self.reset()
+
+    def reset(self, mission=None):
+        # Empty layout, optionally for another mission
+        if mission is not None:
+            self.mission = mission
+        self.modules.clear()
+        self.connectivity.clear()
+        self.traffic.clear()
+        self.network.clear()
+        self.metrics = engine.MetricsAccumulator(self.shape, self.mission)
+
+    def __len__(self):
+        return len(self.modules)
+
+    def __contains__(self, key):
+        return key in self.modules
+
+    def new_key(self):
+        self.next_key += 1
+        return self.next_key - 1
+
+    def add_module(self, key, module):
+        self.modules[key] = module
+        self.metrics.add(module['type'])
+        self.connectivity.add_module(key, module['type'], module['x'], module['y'], module.get('rotation', 0))
+        self.traffic.add_module(key, module['type'])
+        self.network.add_module(key, module['type'])
+        if self.listener:
+            self.listener.module_added(key, module)
+
+    def remove_module(self, key):
+        module = self.modules.pop(key)
+        self.metrics.remove(module['type'])
+        self.connectivity.remove_module(key)
+        self.traffic.remove_module(key)
+        self.network.remove_module(key)
+        if self.listener:
+            self.listener.module_removed(key, module)
+
+    def move_module(self, key, x, y):
+        module = self.modules[key] = dict(self.modules[key], x=x, y=y)
+        self.connectivity.move_module(key, module['type'], x, y, module.get('rotation', 0))
+        self.traffic.move_module(key, module['type'])
+        self.network.move_module(key, module['type'])
+        if self.listener:
+            self.listener.module_moved(key, x, y)
+
+    def set_shape(self, shape):
+        self.shape = shape
+        self.metrics.set_shape(shape)
+        if self.listener:
+            self.listener.shape_changed(shape)
+
+    def move_command(self, key, x, y):
+        # History command for moving a placed module, None if it stays put
+        module = self.modules[key]
+        if (module['x'], module['y']) == (x, y):
+            return None
+        return ('move', key, (module['x'], module['y']), (x, y))
+
+    def remove_command(self, key):
+        return ('remove', key, self.modules[key])
+
+    def layout(self):
+        return {
+            'modules': list(self.modules.values()),
+            'shape': self.shape,
+            'mission': self.mission
+        }
@@ -0,0 +1,214 @@
+"""
+HABICON - Power & Thermal Network
+Per-module bus voltage and temperature for a layout, from the docking graph
+of habicon_connectivity. Power runs along feeders between docked modules:
+Power & Thermal modules feed the DC bus through their internal resistance,
+and every module draws its load as a constant current at the nominal bus
+voltage. Heat flows along the coolant loop between docked modules. Each
+powered module dissipates its electrical load (a module cut off from every
+power source draws nothing, so adds no heat), every module leaks a little
+through its wall, and radiators reject heat to the sink.
+
+Both are sparse, symmetric positive definite conductance systems (a graph
+Laplacian plus grounding terms), solved with Jacobi-preconditioned conjugate
+gradients; no SciPy needed. The network is mirrored edit by edit and the
+previous solution is the starting guess, so a re-solve after a single-module
+edit only has to work off that module's disturbance. NumPy does the vector
+work and is imported on the first solve, not with the designer.
+"""
+
+import habicon_catalog as catalog
+from habicon_connectivity import ConnectivityGraph
+from habicon_requirements import CABIN_TEMP, CABIN_TEMP_LIMIT
+
+# Electrical: DC bus, ISS-like secondary power
+BUS_VOLTAGE = 120.0         # V
+SOURCE_RESISTANCE = 0.05    # Ω, inside each power module
+FEEDER_RESISTANCE = 0.004   # Ω per metre between docked module centres
+VOLTAGE_DROP_LIMIT = 0.05   # of bus voltage
+
+# Thermal: coolant loop and radiators
+SINK_TEMP = 4.0             # °C, radiator / deep space side of the loop
+LOOP_CONDUCTANCE = 2.0      # kW·m/°C, divided by the distance between centres
+WALL_CONDUCTANCE = 0.02     # kW/°C, each module through its insulation
+
+TOLERANCE = 1e-6            # CG residual, relative to the right-hand side
+
+
+def conjugate_gradient(diag, rows, cols, conductance, b, x, tol=TOLERANCE, max_iter=None):
+    # Solves A x = b for a symmetric positive definite A given as its
+    # diagonal and off-diagonal entries A[rows[k]][cols[k]] = -conductance[k].
+    # x is the starting guess. Returns (x, iterations).
+    import numpy as np
+    n = len(b)
+
+    def mul(v):
+        return diag * v - np.bincount(rows, weights=conductance * v[cols], minlength=n)
+
+    r = b - mul(x)
+    limit = tol * (np.linalg.norm(b) or 1.0)
+    inverse = 1.0 / diag
+    z = r * inverse
+    p = z.copy()
+    rz = r @ z
+    max_iter = max_iter or 2 * n + 10
+    for iteration in range(max_iter):
+        if np.linalg.norm(r) <= limit:
+            return x, iteration
+        q = mul(p)
+        alpha = rz / (p @ q)
+        x = x + alpha * p
+        r = r - alpha * q
+        z = r * inverse
+        rz, previous = r @ z, rz
+        p = z + (rz / previous) * p
+    return x, max_iter
+
+
+class PowerThermalNetwork:
+    # Mirrors a ConnectivityGraph like TrafficAnalysis: add_module after
+    # the graph's add_module. solve() only runs when something changed.
+    def __init__(self, graph):
+        self.graph = graph
+        self.types = {}
+        self.links = {}         # key -> {neighbour: metres between centres}
+        self.voltage = {}       # key -> V; missing if no power source reachable
+        self.temperature = {}   # key -> °C
+        self.iterations = 0
+        self.dirty = False
+
+    def clear(self):
+        self.types.clear()
+        self.links.clear()
+        self.voltage.clear()
+        self.temperature.clear()
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.types)
+
+    @staticmethod
+    def spec(module_type):
+        return catalog.module_spec(module_type) or catalog.SPEC_DEFAULTS
+
+    def add_module(self, key, module_type):
+        if key in self.types:
+            self.remove_module(key)
+        self.types[key] = module_type
+        half = self.spec(module_type)['length'] / 2
+        own = self.links[key] = {}
+        for other in self.graph.links.get(key, ()):
+            own[other] = self.links[other][key] = half + self.spec(self.types[other])['length'] / 2
+        # Start the module at its neighbours' mean, so the next solve
+        # begins close to the answer
+        for values, default in ((self.voltage, BUS_VOLTAGE), (self.temperature, CABIN_TEMP)):
+            near = [values[other] for other in own if other in values]
+            values[key] = sum(near) / len(near) if near else default
+        self.dirty = True
+
+    def remove_module(self, key):
+        for other in self.links.pop(key):
+            del self.links[other][key]
+        del self.types[key]
+        self.voltage.pop(key, None)
+        self.temperature.pop(key, None)
+        self.dirty = True
+
+    def move_module(self, key, module_type):
+        # After the graph has moved it. Feeders and coolant loop only depend
+        # on who is docked to whom, so a move within the same neighbours
+        # leaves the solution as it is.
+        if self.types[key] == module_type and self.graph.links.get(key, set()) == self.links[key].keys():
+            return
+        self.remove_module(key)
+        self.add_module(key, module_type)
+
+    def _solve(self, keys, values, default, node_terms, link_conductance):
+        # node_terms(key) -> (grounding conductance, injection)
+        import numpy as np
+        index = {key: i for i, key in enumerate(keys)}
+        diag, b, rows, cols, conductance = [], [], [], [], []
+        for i, key in enumerate(keys):
+            ground, inject = node_terms(key)
+            for other, metres in self.links[key].items():
+                g = link_conductance(metres)
+                rows.append(i)
+                cols.append(index[other])
+                conductance.append(g)
+                ground += g
+            diag.append(ground)
+            b.append(inject)
+        x, iterations = conjugate_gradient(
+            np.array(diag), np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp),
+            np.array(conductance), np.array(b), np.array([values.get(key, default) for key in keys]))
+        values.clear()
+        values.update(zip(keys, x.tolist()))
+        return iterations
+
+    def solve(self):
+        if not self.dirty:
+            return self.iterations
+        self.dirty = False
+        if not self.types:
+            self.iterations = 0
+            return 0
+
+        # Only components with a power module have a bus to speak of
+        fed = {self.graph.component(key) for key, t in self.types.items() if self.spec(t)['power'] > 0}
+        powered = [key for key in self.types if self.graph.component(key) in fed]
+        live = set(powered)
+
+        def electrical(key):
+            spec = self.spec(self.types[key])
+            g = 1.0 / SOURCE_RESISTANCE if spec['power'] > 0 else 0.0
+            return g, g * BUS_VOLTAGE - spec['load'] * 1000.0 / BUS_VOLTAGE
+
+        def thermal(key):
+            spec = self.spec(self.types[key])
+            k = WALL_CONDUCTANCE + spec['thermal'] / (CABIN_TEMP - SINK_TEMP)
+            # Load only turns into heat where the bus delivers it
+            return k, (spec['load'] if key in live else 0.0) + k * SINK_TEMP
+
+        self.iterations = 0
+        if powered:
+            self.iterations += self._solve(powered, self.voltage, BUS_VOLTAGE, electrical,
+                                           lambda metres: 1.0 / (FEEDER_RESISTANCE * metres))
+        else:
+            self.voltage.clear()
+        self.iterations += self._solve(list(self.types), self.temperature, CABIN_TEMP, thermal,
+                                       lambda metres: LOOP_CONDUCTANCE / metres)
+        return self.iterations
+
+    def voltage_drop(self, key):
+        # Fraction of bus voltage lost, None when unpowered
+        self.solve()
+        v = self.voltage.get(key)
+        return None if v is None else 1.0 - v / BUS_VOLTAGE
+
+    def report(self):
+        self.solve()
+        worst_drop, worst_key = 0.0, None
+        for key, v in self.voltage.items():
+            drop = 1.0 - v / BUS_VOLTAGE
+            if worst_key is None or drop > worst_drop:
+                worst_drop, worst_key = drop, key
+        hottest = max(self.temperature, key=self.temperature.get, default=None)
+        return {
+            'max_drop': worst_drop,
+            'max_drop_module': worst_key,
+            'brownout': sum(1 - v / BUS_VOLTAGE > VOLTAGE_DROP_LIMIT for v in self.voltage.values()),
+            'unpowered': len(self.types) - len(self.voltage),
+            'max_temp': self.temperature[hottest] if hottest is not None else None,
+            'hottest_module': hottest,
+            'overheated': sum(t > CABIN_TEMP_LIMIT for t in self.temperature.values()),
+            'iterations': self.iterations
+        }
+
+
+def network_for(layout):
+    graph = ConnectivityGraph()
+    network = PowerThermalNetwork(graph)
+    for key, m in enumerate(layout.get('modules', [])):
+        graph.add_module(key, m['type'], m['x'], m['y'], m.get('rotation', 0))
+        network.add_module(key, m['type'])
+    return network
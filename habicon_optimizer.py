@@ -0,0 +1,220 @@
+"""
+HABICON - Layout Optimizer
+Simulated annealing over module selection and placement inside a habitat
+outline. Each chain edits one layout with add / remove / swap / move steps;
+a MetricsAccumulator and running position sums give every step's score
+change in constant time, and placements are checked against the hull and
+the spatial index. Chains run in parallel, one per core, and their best
+layouts are merged into a ranked candidate list.
+
+Fitness is the validity score, plus a few points for meeting the volume
+and power minimums, less a penalty for every piece not docked to the rest,
+with lighter and more compact habitats breaking ties. Layouts over the mass
+limit are never accepted. A docking graph from habicon_connectivity follows
+every step, and new or moved modules often go straight to a free port.
+"""
+
+import math
+import os
+import random
+import habicon_catalog as catalog
+import habicon_engine as engine
+import habicon_geometry as geometry
+import habicon_requirements as requirements
+from habicon_connectivity import ConnectivityGraph
+from habicon_spatial import SpatialGrid, MODULE_WIDTH, MODULE_HEIGHT
+
+DEFAULT_ITERATIONS = 20000
+DEFAULT_TOP = 10
+START_TEMPERATURE = 8.0
+END_TEMPERATURE = 0.05
+
+COMPLIANCE_POINTS = 5       # each for meeting minimum volume and power
+SPREAD_WEIGHT = 1e-5        # per px² of mean squared distance from the centroid
+DETACHED_PENALTY = 30       # per extra connected component; outweighs any one module
+DOCK_CHANCE = 0.6           # share of placements made at another module's port
+
+# Where a module's centre goes to dock at an end port of another, or to a
+# Node's side port (Nodes stack on Nodes)
+END_DOCKS = ((-MODULE_WIDTH, 0), (MODULE_WIDTH, 0))
+NODE_DOCKS = END_DOCKS + ((0, -MODULE_HEIGHT), (0, MODULE_HEIGHT))
+
+
+class Chain:
+    def __init__(self, shape, mission, crew, mass_limit, rng):
+        self.mass_limit = mass_limit
+        self.rng = rng
+        self.hull = geometry.hull(shape)
+        self.positions = geometry.module_positions(shape)
+        self.metrics = engine.MetricsAccumulator(shape, mission, crew)
+        self.grid = SpatialGrid()
+        self.graph = ConnectivityGraph()
+        self.modules = {}   # key -> [module id, x, y]
+        self.next_key = 0
+        self.sx = self.sy = self.sq = 0.0
+
+    def fitness(self):
+        metrics = self.metrics.metrics()
+        if metrics['mass'] > self.mass_limit:
+            return None
+        status = engine.compliance_for(metrics, self.metrics.targets)
+        score = self.metrics.validity_score()
+        score += COMPLIANCE_POINTS * (status['volume_ok'] + status['power_ok'])
+        score -= DETACHED_PENALTY * max(0, self.graph.component_count() - 1)
+        score -= metrics['mass'] / self.mass_limit
+        n = len(self.modules)
+        if n:
+            spread = self.sq / n - (self.sx / n) ** 2 - (self.sy / n) ** 2
+            score -= SPREAD_WEIGHT * spread
+        return score
+
+    def free_position(self, exclude=None, mid=None):
+        # Usually a free spot docked to another module, else a few random
+        # lattice points; None if the hull looks full
+        if self.rng.random() < DOCK_CHANCE:
+            spot = self.docked_position(exclude, mid)
+            if spot is not None:
+                return spot
+        for _ in range(8):
+            x, y = self.rng.choice(self.positions)
+            if geometry.fits(self.hull, self.grid, x, y, exclude):
+                return x, y
+        return None
+
+    def docked_position(self, exclude, mid):
+        others = [key for key in self.modules if key != exclude]
+        if not others:
+            return None
+        target, x, y = self.modules[self.rng.choice(others)]
+        both_nodes = catalog.MODULE_CAPS[target] & catalog.MODULE_CAPS[mid] & catalog.CAP_NODE
+        docks = list(NODE_DOCKS if both_nodes else END_DOCKS)
+        self.rng.shuffle(docks)
+        for dx, dy in docks:
+            if geometry.fits(self.hull, self.grid, x + dx, y + dy, exclude):
+                return x + dx, y + dy
+        return None
+
+    def place(self, key, mid, x, y):
+        self.modules[key] = [mid, x, y]
+        self.grid.insert(key, x, y)
+        self.graph.add_module(key, catalog.MODULE_CATALOG[mid]['name'], x, y)
+        self.metrics.add(catalog.MODULE_CATALOG[mid]['name'])
+        self.sx += x
+        self.sy += y
+        self.sq += x * x + y * y
+
+    def lift(self, key):
+        mid, x, y = self.modules.pop(key)
+        self.grid.remove(key)
+        self.graph.remove_module(key)
+        self.metrics.remove(catalog.MODULE_CATALOG[mid]['name'])
+        self.sx -= x
+        self.sy -= y
+        self.sq -= x * x + y * y
+        return mid, x, y
+
+    def propose(self):
+        # Apply one random edit; returns its undo, or None if nothing changed
+        rng = self.rng
+        move = rng.random()
+        if not self.modules or (move < 0.3 and len(self.modules) < engine.MAX_MODULES):
+            mid = rng.randrange(len(catalog.MODULE_CATALOG))
+            spot = self.free_position(mid=mid)
+            if spot is None:
+                return None
+            key = self.next_key
+            self.next_key += 1
+            self.place(key, mid, *spot)
+            return lambda: self.lift(key)
+
+        key = rng.choice(list(self.modules))
+        if move < 0.5:
+            old = self.lift(key)
+            return lambda: self.place(key, *old)
+        if move < 0.75:
+            mid, x, y = self.lift(key)
+            self.place(key, rng.randrange(len(catalog.MODULE_CATALOG)), x, y)
+            return lambda: (self.lift(key), self.place(key, mid, x, y))
+
+        spot = self.free_position(exclude=key, mid=self.modules[key][0])
+        if spot is None:
+            return None
+        mid, x, y = self.lift(key)
+        self.place(key, mid, *spot)
+        return lambda: (self.lift(key), self.place(key, mid, x, y))
+
+    def snapshot(self):
+        return tuple(sorted((mid, x, y) for mid, x, y in self.modules.values()))
+
+
+def run_chain(shape, mission, crew, mass_limit, iterations, seed, top):
+    rng = random.Random(seed)
+    chain = Chain(shape, mission, crew, mass_limit, rng)
+    current = chain.fitness()
+    best = {}   # module selection -> (fitness, snapshot), so candidates differ
+
+    cooling = (END_TEMPERATURE / START_TEMPERATURE) ** (1.0 / max(1, iterations))
+    temperature = START_TEMPERATURE
+    for _ in range(iterations):
+        undo = chain.propose()
+        temperature *= cooling
+        if undo is None:
+            continue
+        score = chain.fitness()
+        if score is not None and (score >= current or rng.random() < math.exp((score - current) / temperature)):
+            current = score
+            snapshot = chain.snapshot()
+            selection = tuple(mid for mid, _, _ in snapshot)
+            if score > best.get(selection, (-math.inf,))[0]:
+                best[selection] = (score, snapshot)
+                if len(best) > top * 4:
+                    best = dict(sorted(best.items(), key=lambda item: -item[1][0])[:top])
+        else:
+            undo()
+
+    return sorted(best.values(), key=lambda item: -item[0])[:top]
+
+
+def candidate(snapshot, fitness, shape, mission, crew):
+    modules = []
+    for mid, x, y in snapshot:
+        entry = catalog.MODULE_CATALOG[mid]
+        modules.append({'type': entry['name'], 'icon': entry['icon'], 'x': x, 'y': y})
+    layout = {'modules': modules, 'shape': shape, 'mission': mission, 'crew': crew}
+    status = engine.compliance_status(layout)
+    return {
+        'layout': layout,
+        'fitness': fitness,
+        'validity': engine.validity_score(layout),
+        'mass': status['mass'],
+        'volume': status['volume'],
+        'power': status['power']
+    }
+
+
+def optimize(shape=engine.DEFAULT_SHAPE, mission=None, crew=None, mass_limit=engine.MASS_LIMIT,
+             iterations=DEFAULT_ITERATIONS, chains=None, seed=0, top=DEFAULT_TOP, executor=None):
+    # Ranked candidate layouts, best first. Chains go to the executor when
+    # given, else to a process pool with one worker per core.
+    mission = mission or {}
+    crew = crew or requirements.mission_crew(mission)
+    chains = chains or os.cpu_count() or 1
+    args = [(shape, mission, crew, mass_limit, iterations, seed * 1000003 + c, top) for c in range(chains)]
+
+    if executor is not None:
+        results = [future.result() for future in [executor.submit(run_chain, *a) for a in args]]
+    elif chains == 1:
+        results = [run_chain(*args[0])]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=chains) as pool:
+            results = list(pool.map(run_chain, *zip(*args)))
+
+    merged = {}
+    for found in results:
+        for fitness, snapshot in found:
+            selection = tuple(mid for mid, _, _ in snapshot)
+            if fitness > merged.get(selection, (-math.inf,))[0]:
+                merged[selection] = (fitness, snapshot)
+    ranked = sorted(merged.values(), key=lambda item: -item[0])[:top]
+    return [candidate(snapshot, fitness, shape, mission, crew) for fitness, snapshot in ranked]
@@ -0,0 +1,132 @@
+"""
+HABICON - Habitat Physical Model
+Pressurized volume, mass and power of a layout from its modules and the
+hull they are built into. Every module occupies a segment of hull along
+its length; the hull shape sets the segment's cross-section, so volume is
+section area × length and structural mass is shell area × areal density.
+Each hull also has fixed closures (end caps, domes, torus spokes).
+
+Per-module figures are memoized per hull shape and parameters, so a layout
+total is a sum over module-type counts and an edit changes one count.
+"""
+
+import math
+from functools import lru_cache
+import habicon_catalog as catalog
+
+DEFAULT_HULL = "Cylinder"
+SHELL_AREAL_DENSITY = 45.0      # kg/m²: pressure shell, MMOD shielding, insulation
+
+# Hull geometry, metres
+HULL_GEOMETRY = {
+    "Cylinder": {'radius': 2.2},
+    "Torus": {'major_radius': 12.0, 'section_radius': 2.0, 'spokes': 4},
+    "Dome": {'radius': 3.0},
+    "Spherical": {'radius': 2.5},
+    "Modular": {'width': 3.0, 'height': 2.6}
+}
+SPOKE_MASS_PER_METRE = 150.0    # kg/m, torus hub spokes
+
+
+def hull_geometry(shape):
+    return HULL_GEOMETRY.get(shape) or HULL_GEOMETRY[DEFAULT_HULL]
+
+
+@lru_cache(maxsize=None)
+def _hull_properties(shape, params):
+    p = dict(params)
+    if shape == "Torus":
+        # Modules are arcs of the tube; the ring closes on itself, hung
+        # from a hub by spokes
+        a = p['section_radius']
+        section, perimeter = math.pi * a * a, 2 * math.pi * a
+        closure_volume, closure_area = 0.0, 0.0
+        fixed_mass = p['spokes'] * p['major_radius'] * SPOKE_MASS_PER_METRE
+    elif shape == "Dome":
+        # Semicircular vault on a floor slab, quarter-sphere ends
+        r = p['radius']
+        section, perimeter = math.pi * r * r / 2, math.pi * r + 2 * r
+        closure_volume, closure_area = 2 / 3 * math.pi * r ** 3, 2 * math.pi * r * r + math.pi * r * r
+        fixed_mass = 0.0
+    elif shape == "Spherical":
+        # Barrel between two hemispherical end domes
+        r = p['radius']
+        section, perimeter = math.pi * r * r, 2 * math.pi * r
+        closure_volume, closure_area = 4 / 3 * math.pi * r ** 3, 4 * math.pi * r * r
+        fixed_mass = 0.0
+    elif shape == "Modular":
+        # Rectangular section with flat end bulkheads
+        w, h = p['width'], p['height']
+        section, perimeter = w * h, 2 * (w + h)
+        closure_volume, closure_area = 0.0, 2 * w * h
+        fixed_mass = 0.0
+    else:
+        # Cylinder with flat end caps
+        r = p['radius']
+        section, perimeter = math.pi * r * r, 2 * math.pi * r
+        closure_volume, closure_area = 0.0, 2 * math.pi * r * r
+        fixed_mass = 0.0
+
+    return {
+        'section': section,                 # m² pressurized per metre of module
+        'perimeter': perimeter,             # m² of shell per metre of module
+        'closure_volume': closure_volume,
+        'closure_mass': closure_area * SHELL_AREAL_DENSITY + fixed_mass
+    }
+
+
+def hull_properties(shape, params=None):
+    params = params or hull_geometry(shape)
+    return _hull_properties(shape, tuple(sorted(params.items())))
+
+
+@lru_cache(maxsize=None)
+def _module_table(shape, params):
+    # (volume m³, shell mass kg, outfitting mass kg, power kW, length m)
+    # per catalog module, in ID order
+    hull = _hull_properties(shape, params)
+    return tuple((hull['section'] * m['length'],
+                  hull['perimeter'] * m['length'] * SHELL_AREAL_DENSITY,
+                  m['mass'], m['power'], m['length'])
+                 for m in catalog.MODULE_CATALOG)
+
+
+def module_table(shape, params=None):
+    params = params or hull_geometry(shape)
+    return _module_table(shape, tuple(sorted(params.items())))
+
+
+def totals_for_counts(shape, counts, params=None):
+    # counts: per-catalog-module counts, in ID order. An empty layout has
+    # no hull, so no closures either.
+    volume = structure = outfit = power = length = 0.0
+    if any(counts):
+        hull = hull_properties(shape, params)
+        volume, structure = hull['closure_volume'], hull['closure_mass']
+        for count, (v, s, o, p, l) in zip(counts, module_table(shape, params)):
+            if count:
+                volume += count * v
+                structure += count * s
+                outfit += count * o
+                power += count * p
+                length += count * l
+    return {
+        'volume': volume,
+        'mass': structure + outfit,
+        'structure': structure,
+        'power': power,
+        'length': length
+    }
+
+
+def type_counts(types):
+    counts = [0] * len(catalog.MODULE_CATALOG)
+    for name in types:
+        mid = catalog.module_id(name)
+        if mid is not None:
+            counts[mid] += 1
+    return counts
+
+
+def layout_totals(types, shape, params=None):
+    return totals_for_counts(shape, type_counts(types), params)
@@ -0,0 +1,236 @@
+"""
+HABICON - Progress Store
+Persistent player progress for shared installs: profiles, mission results
+and scores, and saved layouts, in one SQLite database in WAL mode.
+
+Writes are queued and applied by a background thread in batches, one
+transaction per batch, so the GUI thread never waits on the disk. Each
+write runs in its own savepoint inside the batch: a write that fails is
+rolled back and logged on its own, and the rest of the batch still lands.
+Reads use their own connection; WAL lets them run alongside the writer.
+Every lookup by username goes through the unique index on users.username.
+
+Layouts are stored in the binary layout record format of habicon_archive.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.habicon', 'progress.db')
+BATCH_SIZE = 256
+FLUSH_POLL = 0.1    # s between checks that the writer is still alive
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    level INTEGER NOT NULL DEFAULT 1,
+    missions_completed INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    last_login REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    mission_id INTEGER NOT NULL,
+    overall INTEGER NOT NULL,
+    lifesupport INTEGER NOT NULL,
+    power INTEGER NOT NULL,
+    comfort INTEGER NOT NULL,
+    safety INTEGER NOT NULL,
+    validity INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    layout BLOB,
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_user_mission ON results (user_id, mission_id);
+CREATE TABLE IF NOT EXISTS layouts (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    name TEXT NOT NULL,
+    layout BLOB NOT NULL,
+    saved REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS layouts_user ON layouts (user_id, saved);
+"""
+
+USER_ID = "(SELECT id FROM users WHERE username = ?)"
+
+
+def connect(path):
+    db = sqlite3.connect(path, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+def _encode(layout):
+    # NumPy comes in with habicon_archive; only the writer thread pays for it
+    import habicon_archive
+    return habicon_archive.encode_layout(layout)
+
+
+def _decode(blob):
+    import habicon_archive
+    return habicon_archive.decode_bytes(blob)
+
+
+class ProgressStore:
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('HABICON_PROGRESS_DB') or DEFAULT_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = connect(self.path)
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+        self.writes = queue.Queue()
+        self.failed = 0     # writes rolled back or lost
+        self.writer = threading.Thread(target=self._write_loop, name='habicon-progress', daemon=True)
+        self.writer.start()
+
+    # Writes: queued, applied in batches on the writer thread
+
+    def _write_loop(self):
+        # Progress is best effort: nothing a write raises may stop the
+        # writer, or flush() would wait forever on what is left queued
+        try:
+            db = connect(self.path)
+        except Exception:
+            log.exception("progress store: cannot open %s; progress will not be saved", self.path)
+            db = None
+        while True:
+            batch = [self.writes.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.writes.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [write for write in batch if write is not None]
+            try:
+                if db is None:
+                    self.failed += len(writes)
+                elif writes:
+                    self._apply(db, writes)
+            except Exception:
+                self.failed += len(writes)
+                log.exception("progress store: lost a batch of %d writes", len(writes))
+            finally:
+                for _ in batch:
+                    self.writes.task_done()
+            if len(writes) < len(batch):
+                if db is not None:
+                    db.close()
+                return
+
+    def _apply(self, db, writes):
+        # One transaction for the batch, one savepoint per write
+        with db:
+            db.execute("BEGIN")
+            for write in writes:
+                db.execute("SAVEPOINT write")
+                try:
+                    write(db)
+                except Exception:
+                    db.execute("ROLLBACK TO write")
+                    self.failed += 1
+                    log.exception("progress store: write failed and was rolled back")
+                db.execute("RELEASE write")
+
+    def _queue(self, write):
+        self.writes.put(write)
+
+    def touch_user(self, username):
+        now = time.time()
+
+        def write(db):
+            db.execute("INSERT INTO users (username, created, last_login) VALUES (?, ?, ?) "
+                       "ON CONFLICT (username) DO UPDATE SET last_login = excluded.last_login",
+                       (username, now, now))
+        self._queue(write)
+
+    def record_result(self, username, mission_id, scores, validity, passed, layout=None):
+        # A passed mission also levels the player up, as on the dashboard
+        now = time.time()
+
+        def write(db):
+            db.execute(f"INSERT INTO results (user_id, mission_id, overall, lifesupport, power, comfort, safety, "
+                       f"validity, passed, layout, recorded) VALUES ({USER_ID}, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       (username, mission_id, scores['overall'], scores['lifesupport'], scores['power'],
+                        scores['comfort'], scores['safety'], validity, int(passed),
+                        _encode(layout) if layout else None, now))
+            if passed:
+                db.execute("UPDATE users SET level = level + 1, missions_completed = missions_completed + 1 "
+                           "WHERE username = ?", (username,))
+        self._queue(write)
+
+    def save_layout(self, username, name, layout):
+        now = time.time()
+
+        def write(db):
+            db.execute(f"INSERT INTO layouts (user_id, name, layout, saved) VALUES ({USER_ID}, ?, ?, ?)",
+                       (username, name, _encode(layout), now))
+        self._queue(write)
+
+    def flush(self):
+        # Wait for every queued write to land or fail; returns at once if
+        # the writer has stopped
+        done = self.writes.all_tasks_done
+        with done:
+            while self.writes.unfinished_tasks and self.writer.is_alive():
+                done.wait(FLUSH_POLL)
+
+    def close(self):
+        if self.writer.is_alive():
+            self.writes.put(None)
+            self.writer.join()
+        self.db.close()
+
+    # Reads: straight from the reader connection
+
+    def user(self, username):
+        row = self.db.execute("SELECT username, level, missions_completed FROM users WHERE username = ?",
+                              (username,)).fetchone()
+        if row is None:
+            return None
+        return {'username': row[0], 'level': row[1], 'missions_completed': row[2],
+                'completed': self.completed_missions(username)}
+
+    def login(self, username):
+        # Profile for the dashboard; new players start at level 1
+        self.touch_user(username)
+        return self.user(username) or {'username': username, 'level': 1, 'missions_completed': 0,
+                                       'completed': set()}
+
+    def completed_missions(self, username):
+        rows = self.db.execute(f"SELECT DISTINCT mission_id FROM results WHERE user_id = {USER_ID} AND passed",
+                               (username,))
+        return {row[0] for row in rows}
+
+    def best_scores(self, username):
+        rows = self.db.execute(f"SELECT mission_id, MAX(overall) FROM results WHERE user_id = {USER_ID} "
+                               f"GROUP BY mission_id", (username,))
+        return dict(rows.fetchall())
+
+    def saved_layouts(self, username):
+        # (layout id, name, saved time), newest first
+        rows = self.db.execute(f"SELECT id, name, saved FROM layouts WHERE user_id = {USER_ID} "
+                               f"ORDER BY saved DESC", (username,))
+        return rows.fetchall()
+
+    def load_layout(self, layout_id):
+        row = self.db.execute("SELECT layout FROM layouts WHERE id = ?", (layout_id,)).fetchone()
+        return _decode(row[0]) if row else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
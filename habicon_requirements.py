@@ -0,0 +1,83 @@
+"""
+HABICON - Mission Requirements
+Numeric requirement targets derived from a mission's crew and duration:
+minimum pressurized volume and power, and daily water, O₂ and food needs.
+Durations are parsed once per distinct text and targets are cached per
+(crew, days), so validating a layout is a comparison against the cached
+figures.
+"""
+
+from functools import lru_cache
+
+DEFAULT_CREW = 4
+DEFAULT_DAYS = 30
+
+DURATION_UNITS = {'day': 1, 'week': 7, 'month': 30.44, 'year': 365.25}
+
+# NASA standards
+POWER_PER_PERSON = 2.5      # kW
+
+# Cabin air temperature, °C: the comfort band and its nominal set point
+CABIN_TEMP_MIN = 18.0
+CABIN_TEMP = 21.0
+CABIN_TEMP_LIMIT = 27.0
+
+# Habitable volume per person grows with time confined: (from day, m³)
+VOLUME_PER_PERSON = ((0, 14.0), (180, 20.0), (365, 25.0))
+
+# Per-crew daily needs, in resource order
+RESOURCES = ('o2', 'co2', 'water', 'food')
+PER_CREW = (0.84, 1.0, 3.5, 1.83)   # kg O₂, kg CO₂ scrubbed, L water, kg food
+
+
+@lru_cache(maxsize=None)
+def parse_duration(duration):
+    # "30 days", "6 months", "5 years" -> days
+    parts = (duration or '').split()
+    if len(parts) == 2:
+        unit = DURATION_UNITS.get(parts[1].lower().rstrip('s'))
+        if unit:
+            try:
+                return int(round(float(parts[0]) * unit))
+            except ValueError:
+                pass
+    return DEFAULT_DAYS
+
+
+def mission_days(mission):
+    return parse_duration((mission or {}).get('duration', ''))
+
+
+def mission_crew(mission):
+    return (mission or {}).get('crew') or DEFAULT_CREW
+
+
+def volume_per_person(days):
+    per_person = VOLUME_PER_PERSON[0][1]
+    for start, volume in VOLUME_PER_PERSON:
+        if days >= start:
+            per_person = volume
+    return per_person
+
+
+@lru_cache(maxsize=None)
+def targets(crew, days):
+    o2, co2, water, food = (crew * need for need in PER_CREW)
+    return {
+        'crew': crew,
+        'days': days,
+        'min_volume': crew * volume_per_person(days),
+        'min_power': crew * POWER_PER_PERSON,
+        'oxygen': o2,           # kg/day
+        'co2': co2,             # kg/day
+        'water': water,         # L/day
+        'food': food,           # kg/day
+        'oxygen_total': o2 * days,
+        'water_total': water * days,
+        'food_total': food * days
+    }
+
+
+def for_mission(mission, crew=None):
+    # Cached targets; treat as read-only
+    return targets(crew or mission_crew(mission), mission_days(mission))
@@ -0,0 +1,323 @@
+"""
+HABICON - Mission Simulation Engine
+Time-stepped habitat simulation driven by the placed modules, crew size
+and mission duration: O₂ and CO₂ balance, the water loop, the power budget
+and food stores. Random module failures make each run a seeded Monte Carlo
+trial, so a layout's results are reproducible and statistically meaningful.
+
+Between events (failures, repairs, resupply, report checkpoints) every rate
+is constant, so the simulation steps from event to event and integrates each
+resource in closed form instead of walking the mission day by day.
+
+Trials are independent, so they split into chunks that can run across a
+process pool; simulate_chunks streams a running summary after each chunk
+and simulate_many spreads whole layouts over cores.
+"""
+
+import os
+import random
+import zlib
+import habicon_catalog as catalog
+import habicon_engine as engine
+import habicon_requirements as requirements
+import habicon_traffic as traffic
+
+DEFAULT_TRIALS = 200
+DEFAULT_CHECKPOINTS = 5
+DEFAULT_CHUNK = 20
+
+RESOURCES = requirements.RESOURCES
+BASE_RESERVE_DAYS = 45              # days of consumables per crew, unless the mission says
+WATER_RECOVERY_LIMIT = 0.95         # recycling can't close the loop fully
+
+# Repair turnaround, days
+REPAIR_DAYS = 10
+REPAIR_DAYS_MAINTENANCE = 4
+
+# Cargo resupply interval by mission location, days (needs a docking port)
+RESUPPLY_DAYS = {'Low Earth Orbit': 60, 'Lunar Orbit': 90}
+
+# Cabin temperature: how hot it gets above nominal with no heat rejection
+CABIN_TEMP_RISE = 8.0
+
+# Overall score that completes a free design or a mission without its own
+DEFAULT_PASS_SCORE = 75
+# A pass also needs crews that come home: some trials must run the whole
+# mission, and on average the crew must last this share of it
+MIN_SURVIVAL = 0.9
+
+
+def layout_seed(layout):
+    # Stable across runs and processes for the same layout
+    mission = layout.get('mission') or {}
+    key = (sorted(engine.module_types(layout)), engine.layout_shape(layout),
+           mission.get('name'), engine.layout_crew(layout))
+    return zlib.crc32(repr(key).encode())
+
+
+def pass_score(mission):
+    return (mission or {}).get('pass_score', DEFAULT_PASS_SCORE)
+
+
+def mission_passed(summary, mission):
+    return (summary['scores']['overall'] >= pass_score(mission)
+            and summary['success_rate'] > 0 and summary['survival'] >= MIN_SURVIVAL)
+
+
+def build_model(layout):
+    targets = engine.layout_targets(layout)
+    crew = targets['crew']
+    mission = layout.get('mission') or {}
+    totals = dict.fromkeys(catalog.SPEC_DEFAULTS, 0.0)
+    units = []
+
+    for module_type in engine.module_types(layout):
+        spec = catalog.module_spec(module_type)
+        if spec is None:
+            continue
+        for key in totals:
+            totals[key] += spec[key]
+        # Modules that can fail, with what they stop providing while down
+        if spec['mtbf']:
+            units.append((spec['mtbf'], (spec['power'], spec['thermal'], spec['o2'],
+                                         spec['co2'], spec['water'], spec['food'])))
+
+    presence, caps = engine.layout_bits(layout)
+    routes = traffic.analyze(layout, crew)
+    # Crew-days of consumables: the mission's provisions plus module stores
+    reserve_days = mission.get('provisions', BASE_RESERVE_DAYS) * crew + totals['stores']
+    resupply = RESUPPLY_DAYS.get(mission.get('location')) if caps & catalog.CAP_DOCKING else None
+
+    return {
+        'crew': crew,
+        'days': targets['days'],
+        'needs': (targets['oxygen'], targets['co2'], targets['water'], targets['food']),
+        'load': totals['load'],
+        'nominal': (totals['power'], totals['thermal'], totals['o2'],
+                    totals['co2'], totals['water'], totals['food']),
+        'capacity': tuple(reserve_days * need for need in requirements.PER_CREW),
+        'units': units,
+        'repair_days': REPAIR_DAYS_MAINTENANCE if caps & catalog.CAP_MAINTENANCE else REPAIR_DAYS,
+        'resupply_days': resupply,
+        'caps': caps,
+        'volume': engine.compute_metrics(layout)['volume'],
+        'min_volume': targets['min_volume'],
+        'flow': traffic.flow_score(routes),
+        'egress': traffic.egress_score(routes, len(layout.get('modules', [])))
+    }
+
+
+def _checkpoint(day, stocks, capacity, pf, temp):
+    point = {'day': day, 'power': pf, 'temperature': temp}
+    for r, name in enumerate(RESOURCES):
+        point[name] = stocks[r] / capacity[r]
+    return point
+
+
+def run_trial(model, rng, checkpoints=DEFAULT_CHECKPOINTS):
+    days = model['days']
+    load = model['load']
+    capacity = model['capacity']
+    metabolism = min(1.2, max(0.8, rng.gauss(1.0, 0.05)))
+    consumption = [need * metabolism for need in model['needs']]
+
+    # Event list: (day, kind, payload). Kinds sort checkpoints first.
+    events = [(days * k / checkpoints, 0, k) for k in range(1, checkpoints + 1)]
+    for index, (mtbf, _) in enumerate(model['units']):
+        t = rng.expovariate(1.0 / mtbf)
+        while t < days:
+            repair = rng.expovariate(1.0 / model['repair_days'])
+            events.append((t, 2, (index, -1)))
+            if t + repair < days:
+                events.append((t + repair, 2, (index, 1)))
+            t += repair + rng.expovariate(1.0 / mtbf)
+    if model['resupply_days']:
+        t = model['resupply_days']
+        while t < days:
+            events.append((t, 1, None))
+            t += model['resupply_days']
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    running = list(model['nominal'])
+    stocks = list(capacity)
+    lowest = [1.0] * len(RESOURCES)
+    timeline = []
+    failures = 0
+    failed_at = None
+    t = 0.0
+    power_time = hot_time = 0.0
+    pf = temp = 0.0
+
+    for when, kind, payload in events:
+        dt = when - t
+        if dt > 0:
+            # Power shortfall throttles every powered system
+            pf = 1.0 if load <= 0 else min(1.0, running[0] / load)
+            heat = load * pf
+            excess = max(0.0, heat - running[1] * pf) / heat if heat > 0 else 0.0
+            temp = requirements.CABIN_TEMP + CABIN_TEMP_RISE * excess
+            production = (running[2] * pf, running[3] * pf,
+                          min(running[4] * pf, consumption[2] * WATER_RECOVERY_LIMIT), running[5] * pf)
+
+            rates = [production[r] - consumption[r] for r in range(len(RESOURCES))]
+
+            # A resource running dry mid-step ends the mission there
+            for r, rate in enumerate(rates):
+                if stocks[r] + rate * dt < 0:
+                    dt = stocks[r] / -rate
+                    failed_at = t + dt
+
+            for r, rate in enumerate(rates):
+                stocks[r] = min(capacity[r], max(0.0, stocks[r] + rate * dt))
+                lowest[r] = min(lowest[r], stocks[r] / capacity[r])
+
+            power_time += pf * dt
+            if temp > requirements.CABIN_TEMP_LIMIT:
+                hot_time += dt
+            t += dt
+
+        if failed_at is not None:
+            break
+        if kind == 0:
+            timeline.append(_checkpoint(when, stocks, capacity, pf, temp))
+        elif kind == 1:
+            stocks = list(capacity)
+        else:
+            index, sign = payload
+            failures += sign < 0
+            _, provides = model['units'][index]
+            for i, amount in enumerate(provides):
+                running[i] += sign * amount
+
+    # A failed crew's remaining checkpoints read as the moment of failure
+    while len(timeline) < checkpoints:
+        timeline.append(_checkpoint(days * (len(timeline) + 1) / checkpoints, stocks, capacity, pf, temp))
+
+    elapsed = t if t > 0 else 1.0
+    return {
+        'survived_days': days if failed_at is None else failed_at,
+        'success': failed_at is None,
+        'lowest': lowest,
+        'power_ratio': power_time / elapsed,
+        'hot_fraction': hot_time / elapsed,
+        'failures': failures,
+        'timeline': timeline
+    }
+
+
+def run_trials(model, seed, first, count, checkpoints=DEFAULT_CHECKPOINTS):
+    # Trial i always uses the same stream, however trials are split up
+    return [run_trial(model, random.Random(seed * 1000003 + i), checkpoints)
+            for i in range(first, first + count)]
+
+
+def summarize(model, trials, seed):
+    n = len(trials)
+    days = model['days']
+    caps = model['caps']
+    crew = model['crew']
+
+    survival = sum(trial['survived_days'] for trial in trials) / (n * days)
+    success_rate = sum(trial['success'] for trial in trials) / n
+    margins = [sum(trial['lowest'][r] for trial in trials) / n for r in range(len(RESOURCES))]
+    power_ratio = sum(trial['power_ratio'] for trial in trials) / n
+    hot_fraction = sum(trial['hot_fraction'] for trial in trials) / n
+    failures = sum(trial['failures'] for trial in trials) / n
+
+    timeline = []
+    for k in range(len(trials[0]['timeline'])):
+        points = [trial['timeline'][k] for trial in trials]
+        timeline.append({key: sum(p[key] for p in points) / n for key in points[0]})
+
+    # Scores (0-100)
+    headroom = model['nominal'][0] / model['load'] if model['load'] else 1.0
+    lifesupport = 100 * (0.7 * survival + 0.3 * sum(margins) / len(margins))
+    power = 100 * (0.8 * power_ratio + 0.2 * min(1.0, max(0.0, headroom - 1.0) / 0.5))
+    space = min(1.0, model['volume'] / (model['min_volume'] * 2))
+    # Crew traffic: short, reachable daily trips and a short way out
+    comfort = 100 * (0.3 * space
+                     + 0.1 * bool(caps & catalog.CAP_CREW)
+                     + 0.1 * bool(caps & catalog.CAP_EXERCISE)
+                     + 0.1 * bool(caps & catalog.CAP_HYGIENE)
+                     + 0.15 * (1.0 - hot_fraction)
+                     + 0.25 * model['flow'])
+    safety = 100 * (0.5 * success_rate
+                    + 0.1 * bool(caps & catalog.CAP_AIRLOCK)
+                    + 0.15 * bool(caps & catalog.CAP_MEDICAL)
+                    + 0.1 * bool(caps & catalog.CAP_MAINTENANCE)
+                    + 0.15 * model['egress'])
+    overall = 0.3 * lifesupport + 0.2 * power + 0.2 * comfort + 0.3 * safety
+
+    return {
+        'seed': seed,
+        'trials': n,
+        'days': days,
+        'crew': crew,
+        'survival': survival,
+        'success_rate': success_rate,
+        'margins': dict(zip(RESOURCES, margins)),
+        'power_ratio': power_ratio,
+        'failures': failures,
+        'timeline': timeline,
+        'scores': {
+            'overall': round(overall),
+            'lifesupport': round(lifesupport),
+            'power': round(power),
+            'comfort': round(comfort),
+            'safety': round(safety)
+        }
+    }
+
+
+def simulate(layout, seed=None, trials=None, checkpoints=DEFAULT_CHECKPOINTS):
+    model = build_model(layout)
+    seed = layout_seed(layout) if seed is None else seed
+    trials = trials or DEFAULT_TRIALS
+    return summarize(model, run_trials(model, seed, 0, trials, checkpoints), seed)
+
+
+def simulate_chunks(layout, seed=None, trials=None, checkpoints=DEFAULT_CHECKPOINTS,
+                    chunk=DEFAULT_CHUNK, executor=None):
+    # Yields (trials done, total, summary so far) after each chunk. With an
+    # executor the chunks run in parallel but are still consumed in order,
+    # so the final summary matches simulate() exactly. Closing the generator
+    # early cancels chunks that haven't started.
+    model = build_model(layout)
+    seed = layout_seed(layout) if seed is None else seed
+    total = trials or DEFAULT_TRIALS
+    starts = range(0, total, chunk)
+
+    if executor is None:
+        pending = None
+        parts = (run_trials(model, seed, first, min(chunk, total - first), checkpoints)
+                 for first in starts)
+    else:
+        pending = [executor.submit(run_trials, model, seed, first, min(chunk, total - first), checkpoints)
+                   for first in starts]
+        parts = (future.result() for future in pending)
+
+    done = []
+    try:
+        for part in parts:
+            done.extend(part)
+            yield len(done), total, summarize(model, done, seed)
+    finally:
+        for future in pending or ():
+            future.cancel()
+
+
+def _simulate_job(args):
+    layout, seed, trials, checkpoints = args
+    return simulate(layout, seed, trials, checkpoints)
+
+
+def simulate_many(layouts, seed=None, trials=None, checkpoints=DEFAULT_CHECKPOINTS, jobs=None):
+    # One process per core, whole layouts per task; results keep input order
+    jobs = jobs or os.cpu_count() or 1
+    tasks = [(layout, seed, trials, checkpoints) for layout in layouts]
+    if jobs == 1 or len(tasks) < 2:
+        return [_simulate_job(task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        return list(executor.map(_simulate_job, tasks, chunksize=chunksize))
@@ -0,0 +1,158 @@
+"""
+HABICON - Spatial Index
+Uniform grid over placed module footprints. Range, radius, nearest
+neighbour and overlap queries only visit the cells they touch, so
+proximity questions stay fast on layouts with thousands of modules.
+"""
+
+import math
+
+MODULE_WIDTH = 120
+MODULE_HEIGHT = 60
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}   # (cx, cy) -> set of keys
+        self.items = {}   # key -> (x, y, half_width, half_height), centred
+        self.bounds = None  # occupied cell range, grows only
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+        self.bounds = None
+
+    def _cell(self, x, y):
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def _cell_range(self, x0, y0, x1, y1):
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def _footprint(self, key):
+        x, y, hw, hh = self.items[key]
+        return x - hw, y - hh, x + hw, y + hh
+
+    def insert(self, key, x, y, width=MODULE_WIDTH, height=MODULE_HEIGHT):
+        if key in self.items:
+            self.remove(key)
+        self.items[key] = (x, y, width / 2, height / 2)
+        x0, y0, x1, y1 = self._footprint(key)
+        for cell in self._cell_range(x0, y0, x1, y1):
+            self.cells.setdefault(cell, set()).add(key)
+
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        if self.bounds is None:
+            self.bounds = [cx0, cy0, cx1, cy1]
+        else:
+            b = self.bounds
+            self.bounds = [min(b[0], cx0), min(b[1], cy0), max(b[2], cx1), max(b[3], cy1)]
+
+    def remove(self, key):
+        if key not in self.items:
+            return
+        x0, y0, x1, y1 = self._footprint(key)
+        for cell in self._cell_range(x0, y0, x1, y1):
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[cell]
+        del self.items[key]
+
+    def move(self, key, x, y):
+        _, _, hw, hh = self.items[key]
+        self.insert(key, x, y, hw * 2, hh * 2)
+
+    def position(self, key):
+        x, y, _, _ = self.items[key]
+        return x, y
+
+    def query_rect(self, x0, y0, x1, y1):
+        # Keys whose footprint intersects the rectangle
+        found = set()
+        for cell in self._cell_range(x0, y0, x1, y1):
+            for key in self.cells.get(cell, ()):
+                if key in found:
+                    continue
+                kx0, ky0, kx1, ky1 = self._footprint(key)
+                if kx0 < x1 and x0 < kx1 and ky0 < y1 and y0 < ky1:
+                    found.add(key)
+        return found
+
+    def query_point(self, x, y):
+        # Hit-test: keys whose footprint contains the point
+        hits = []
+        for key in self.cells.get(self._cell(x, y), ()):
+            kx0, ky0, kx1, ky1 = self._footprint(key)
+            if kx0 <= x <= kx1 and ky0 <= y <= ky1:
+                hits.append(key)
+        return hits
+
+    def query_radius(self, x, y, radius):
+        # Keys whose centre lies within radius of the point
+        r2 = radius * radius
+        found = set()
+        for cell in self._cell_range(x - radius, y - radius, x + radius, y + radius):
+            for key in self.cells.get(cell, ()):
+                kx, ky, _, _ = self.items[key]
+                if (kx - x) ** 2 + (ky - y) ** 2 <= r2:
+                    found.add(key)
+        return found
+
+    def nearest(self, x, y, k=1, exclude=None):
+        # Up to k (distance, key) pairs by centre distance, searching rings
+        # of cells outward until nothing closer can remain
+        if not self.items or self.bounds is None:
+            return []
+        cx, cy = self._cell(x, y)
+        b = self.bounds
+        max_ring = max(abs(cx - b[0]), abs(cx - b[2]), abs(cy - b[1]), abs(cy - b[3]))
+        best, seen = [], set()
+        ring = 0
+        while ring <= max_ring:
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) != ring:
+                        continue
+                    for key in self.cells.get((gx, gy), ()):
+                        if key in seen or key == exclude:
+                            continue
+                        seen.add(key)
+                        kx, ky, _, _ = self.items[key]
+                        best.append((math.hypot(kx - x, ky - y), key))
+            best.sort(key=lambda item: item[0])
+            # Anything outside the searched rings is at least ring cells away
+            if len(best) >= k and best[k - 1][0] <= ring * self.cell_size:
+                break
+            ring += 1
+        return best[:k]
+
+    def overlaps(self, key):
+        # Other keys whose footprint intersects this one
+        hits = self.query_rect(*self._footprint(key))
+        hits.discard(key)
+        return hits
+
+    def overlapping_pairs(self):
+        pairs = set()
+        for bucket in self.cells.values():
+            keys = list(bucket)
+            for i, a in enumerate(keys):
+                ax0, ay0, ax1, ay1 = self._footprint(a)
+                for b in keys[i + 1:]:
+                    bx0, by0, bx1, by1 = self._footprint(b)
+                    if ax0 < bx1 and bx0 < ax1 and ay0 < by1 and by0 < ay1:
+                        pairs.add((min(a, b), max(a, b)))
+        return pairs
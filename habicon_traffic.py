@@ -0,0 +1,253 @@
+"""
+HABICON - Crew Traffic & Egress
+How the crew get around a layout: daily trips from Crew Quarters to the
+nearest Galley, Hygiene and Exercise modules, and the emergency route from
+every module to the nearest Airlock. Routes follow the docking graph of
+habicon_connectivity; a hop between docked modules costs the walk between
+their centres, half of each module's length.
+
+Every trip and escape route is a shortest path to the nearest module of one
+kind, so one shortest-path forest per destination kind (rooted at every
+module of that kind) answers them all. The forests are cached and repaired
+after each edit: a new module only relaxes outward from itself, and a
+removed module only invalidates the subtree that routed through it, which
+is re-attached from its boundary. Unchanged paths are never recomputed.
+The report walks every crew route, so it is cached until the forests next
+change; a move that keeps a module's docking links changes nothing.
+"""
+
+import heapq
+import habicon_catalog as catalog
+from habicon_connectivity import ConnectivityGraph
+
+INF = float('inf')
+
+# Round trips per crew member per day, from quarters to the nearest module
+# with the capability
+DAILY_TRIPS = {catalog.CAP_FOOD: 3, catalog.CAP_HYGIENE: 2, catalog.CAP_EXERCISE: 1}
+
+COMMUTE_TARGET = 10.0   # m, mean one-way trip that still feels close
+EGRESS_TARGET = 25.0    # m, farthest any module should be from an airlock
+HOTSPOTS = 3
+
+
+class PathForest:
+    # Shortest paths from every module to the nearest source module
+    def __init__(self, links):
+        self.links = links      # key -> {neighbour: metres}, shared
+        self.sources = set()
+        self.dist = {}          # key -> metres; missing if unreachable
+        self.parent = {}        # key -> next hop toward the source
+        self.children = {}      # key -> keys whose next hop is key
+
+    def _attach(self, key, parent):
+        old = self.parent.get(key)
+        if old is not None:
+            self.children[old].discard(key)
+        self.parent[key] = parent
+        if parent is not None:
+            self.children.setdefault(parent, set()).add(key)
+
+    def _relax(self, heap):
+        # Dijkstra from the seeded keys; only keys that improve are touched
+        dist, links = self.dist, self.links
+        while heap:
+            d, key = heapq.heappop(heap)
+            if d > dist.get(key, INF):
+                continue
+            for other, w in links[key].items():
+                if d + w < dist.get(other, INF):
+                    dist[other] = d + w
+                    self._attach(other, key)
+                    heapq.heappush(heap, (d + w, other))
+
+    def add(self, key, source):
+        # key and its links are already in self.links
+        if source:
+            self.sources.add(key)
+            self.dist[key] = 0.0
+            self._attach(key, None)
+        else:
+            best, via = INF, None
+            for other, w in self.links[key].items():
+                d = self.dist.get(other, INF) + w
+                if d < best:
+                    best, via = d, other
+            if via is None:
+                return
+            self.dist[key] = best
+            self._attach(key, via)
+        self._relax([(self.dist[key], key)])
+
+    def detach(self, key):
+        # Before key's links go: drop key and everything routed through it
+        self.sources.discard(key)
+        lost, stack = [], [key]
+        while stack:
+            k = stack.pop()
+            lost.append(k)
+            stack.extend(self.children.pop(k, ()))
+        for k in lost:
+            self.dist.pop(k, None)
+            parent = self.parent.pop(k, None)
+            if parent is not None and parent in self.children:
+                self.children[parent].discard(k)
+        lost.remove(key)
+        return lost
+
+    def repair(self, lost):
+        # After key's links are gone: re-attach the lost subtree from its
+        # boundary, then let the improvements spread
+        heap = []
+        for k in lost:
+            best, via = INF, None
+            for other, w in self.links[k].items():
+                d = self.dist.get(other, INF) + w
+                if d < best:
+                    best, via = d, other
+            if via is not None:
+                self.dist[k] = best
+                self._attach(k, via)
+                heap.append((best, k))
+        heapq.heapify(heap)
+        self._relax(heap)
+
+    def path(self, key):
+        # key, next hop, ..., source; empty if no source is reachable
+        if key not in self.dist:
+            return []
+        route = [key]
+        while self.parent.get(route[-1]) is not None:
+            route.append(self.parent[route[-1]])
+        return route
+
+
+class TrafficAnalysis:
+    # Mirrors a ConnectivityGraph: call add_module after the graph's own
+    # add_module, and remove_module before or after the graph's
+    def __init__(self, graph):
+        self.graph = graph
+        self.types = {}
+        self.links = {}
+        kinds = tuple(DAILY_TRIPS) + (catalog.CAP_AIRLOCK,)
+        self.forests = {cap: PathForest(self.links) for cap in kinds}
+        self.reports = {}       # crew -> report, until the next change
+
+    def clear(self):
+        self.types.clear()
+        self.links.clear()
+        self.reports.clear()
+        for cap in self.forests:
+            self.forests[cap] = PathForest(self.links)
+
+    def __len__(self):
+        return len(self.types)
+
+    @staticmethod
+    def caps(module_type):
+        return (catalog.module_spec(module_type) or {}).get('caps', 0)
+
+    @staticmethod
+    def length(module_type):
+        return (catalog.module_spec(module_type) or catalog.SPEC_DEFAULTS)['length']
+
+    def add_module(self, key, module_type):
+        if key in self.types:
+            self.remove_module(key)
+        self.reports.clear()
+        self.types[key] = module_type
+        half = self.length(module_type) / 2
+        own = self.links[key] = {}
+        for other in self.graph.links.get(key, ()):
+            w = half + self.length(self.types[other]) / 2
+            own[other] = w
+            self.links[other][key] = w
+        caps = self.caps(module_type)
+        for cap, forest in self.forests.items():
+            forest.add(key, bool(caps & cap))
+
+    def remove_module(self, key):
+        self.reports.clear()
+        lost = {cap: forest.detach(key) for cap, forest in self.forests.items()}
+        for other in self.links.pop(key):
+            del self.links[other][key]
+        del self.types[key]
+        for cap, forest in self.forests.items():
+            forest.repair(lost[cap])
+
+    def move_module(self, key, module_type):
+        # After the graph has moved it. Routes only depend on who is docked
+        # to whom, so a move within the same neighbours leaves them be.
+        if self.types[key] == module_type and self.graph.links.get(key, set()) == self.links[key].keys():
+            return
+        self.remove_module(key)
+        self.add_module(key, module_type)
+
+    def report(self, crew):
+        # Cached per crew size until the layout changes; treat as read-only
+        report = self.reports.get(crew)
+        if report is None:
+            report = self.reports[crew] = self._report(crew)
+        return report
+
+    def _report(self, crew):
+        quarters = [key for key, t in self.types.items() if self.caps(t) & catalog.CAP_CREW]
+        per_quarters = crew / len(quarters) if quarters else 0.0
+
+        passes = {}
+        trips = reached = 0
+        walked = 0.0
+        for cap, per_day in DAILY_TRIPS.items():
+            forest = self.forests[cap]
+            load = 2 * per_day * per_quarters
+            for key in quarters:
+                trips += 1
+                route = forest.path(key)
+                if not route:
+                    continue
+                reached += 1
+                walked += forest.dist[key]
+                for hop in route[1:]:
+                    passes[hop] = passes.get(hop, 0.0) + load
+
+        airlock = self.forests[catalog.CAP_AIRLOCK]
+        egress, farthest = None, None
+        for key, d in airlock.dist.items():
+            if egress is None or d > egress:
+                egress, farthest = d, key
+        hotspots = heapq.nlargest(HOTSPOTS, passes.items(), key=lambda item: item[1])
+
+        return {
+            'trips': trips,
+            'trips_unreachable': trips - reached,
+            'commute': walked / reached if reached else None,   # m, mean one way
+            'hotspots': [(key, self.types[key], round(load, 1)) for key, load in hotspots],
+            'egress': egress,                                    # m, worst case
+            'egress_module': farthest,
+            'egress_unreachable': len(self.types) - len(airlock.dist)
+        }
+
+
+def flow_score(report):
+    # 0-1: share of daily trips that can be made, times how short they are
+    if not report['trips'] or report['commute'] is None:
+        return 0.0
+    reachable = 1 - report['trips_unreachable'] / report['trips']
+    return reachable * min(1.0, COMMUTE_TARGET / max(report['commute'], 1e-9))
+
+
+def egress_score(report, module_count):
+    # 0-1: share of modules with a way out, times how short the worst one is
+    if report['egress'] is None or not module_count:
+        return 0.0
+    reachable = 1 - report['egress_unreachable'] / module_count
+    return reachable * min(1.0, EGRESS_TARGET / max(report['egress'], 1e-9))
+
+
+def analyze(layout, crew):
+    graph = ConnectivityGraph()
+    traffic = TrafficAnalysis(graph)
+    for key, m in enumerate(layout.get('modules', [])):
+        graph.add_module(key, m['type'], m['x'], m['y'], m.get('rotation', 0))
+        traffic.add_module(key, m['type'])
+    return traffic.report(crew)
@@ -0,0 +1,30 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import habicon_catalog as catalog
+
+
+def random_layout(rng, count=None, spread=600):
+    count = rng.randint(0, 18) if count is None else count
+    modules = []
+    for _ in range(count):
+        entry = rng.choice(catalog.MODULE_CATALOG)
+        modules.append({'type': entry['name'], 'icon': entry['icon'],
+                        'x': rng.randrange(spread), 'y': rng.randrange(spread),
+                        'rotation': rng.choice((0, 90, 180, 270))})
+    return {
+        'modules': modules,
+        'shape': rng.choice(catalog.HABITAT_SHAPES),
+        'mission': catalog.mission_by_id(rng.randint(0, len(catalog.NASA_MISSIONS))),
+        'crew': rng.choice((None, 2, 5, 12))
+    }
+
+
+@pytest.fixture
+def rng():
+    return random.Random(20241005)
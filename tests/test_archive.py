@@ -0,0 +1,163 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import habicon_archive as archive
+import habicon_batch as batch
+import habicon_cli as cli
+import habicon_engine as engine
+from conftest import random_layout
+
+
+@pytest.fixture
+def layouts(rng):
+    return [random_layout(rng) for _ in range(200)] + [{'modules': [], 'mission': {}}]
+
+
+def normalized(layout):
+    data = archive.layout_to_json(layout)
+    data['modules'] = [dict(m, rotation=m['rotation'] % 360) for m in data['modules']]
+    return data
+
+
+def test_round_trip(tmp_path, layouts):
+    path = str(tmp_path / 'layouts.habl')
+    assert archive.write_archive(path, layouts) == len(layouts)
+    loaded = archive.read_archive(path)
+    assert [normalized(layout) for layout in loaded] == [normalized(layout) for layout in layouts]
+
+
+def test_json_round_trip(tmp_path, layouts):
+    path = str(tmp_path / 'layouts.json')
+    archive.save_layouts(path, layouts)
+    loaded = archive.load_layouts(path)
+    assert [normalized(layout) for layout in loaded] == [normalized(layout) for layout in layouts]
+
+
+def test_single_layout_bytes(layouts):
+    for layout in layouts[:20]:
+        assert normalized(archive.decode_bytes(archive.encode_layout(layout))) == normalized(layout)
+
+
+def test_headers_and_records_are_views(tmp_path, layouts):
+    path = str(tmp_path / 'layouts.habl')
+    archive.write_archive(path, layouts)
+    with archive.ArchiveReader(path) as reader:
+        headers = reader.headers(10, 20)
+        assert list(headers['count']) == [len(layout['modules']) for layout in layouts[10:20]]
+        assert list(headers['crew']) == [engine.layout_crew(layout) for layout in layouts[10:20]]
+        types = reader.module_types(10, 20)
+        assert list(types) == [t for i in range(10, 20) for t in reader.records(i)['type']]
+        del headers, types
+
+
+def test_encode_archive_matches_encode_layouts(tmp_path, layouts):
+    path = str(tmp_path / 'layouts.habl')
+    archive.write_archive(path, layouts)
+    expected = batch.evaluate_layouts(layouts[50:150])
+    with archive.ArchiveReader(path) as reader:
+        results = batch.evaluate_batch(batch.encode_archive(reader, 50, 150))
+    for key in ('module_count', 'validity', 'checks', 'volume_ok', 'power_ok', 'mass_ok'):
+        assert (results[key] == expected[key]).all(), key
+    assert np.allclose(results['mass'], expected['mass'])
+
+
+def test_reads_version_1(tmp_path, layouts):
+    path = tmp_path / 'old.habl'
+    body = b''.join(archive.encode_layout(layout) for layout in layouts)
+    path.write_bytes(archive.FILE_HEADER_V1.pack(archive.MAGIC, 1, archive.MODULE_RECORD.size, len(layouts)) + body)
+    with archive.ArchiveReader(str(path)) as reader:
+        assert len(reader) == len(layouts)
+        assert [normalized(layout) for layout in reader.layouts()] == [normalized(layout) for layout in layouts]
+        assert len(reader.module_types()) == sum(len(layout['modules']) for layout in layouts)
+
+
+def written(tmp_path, layouts):
+    path = tmp_path / 'layouts.habl'
+    archive.write_archive(str(path), layouts)
+    return path, bytearray(path.read_bytes())
+
+
+@pytest.mark.parametrize('cut', [0, 3, archive.FILE_HEADER.size - 1, archive.FILE_HEADER.size + 5, -1, -17])
+def test_truncated_archive(tmp_path, layouts, cut):
+    path, data = written(tmp_path, layouts)
+    path.write_bytes(data[:cut])
+    with pytest.raises(ValueError):
+        archive.ArchiveReader(str(path))
+
+
+def test_truncated_version_1(tmp_path, layouts):
+    path = tmp_path / 'old.habl'
+    body = b''.join(archive.encode_layout(layout) for layout in layouts)
+    header = archive.FILE_HEADER_V1.pack(archive.MAGIC, 1, archive.MODULE_RECORD.size, len(layouts))
+    path.write_bytes(header + body[:-7])
+    with pytest.raises(ValueError):
+        archive.ArchiveReader(str(path))
+
+
+def test_corrupt_index(tmp_path, layouts):
+    path, data = written(tmp_path, layouts)
+    offset = struct.unpack_from('<Q', data, 16)[0]
+    bad = bytearray(data)
+    bad[offset + 8] = 200                       # shape ID
+    path.write_bytes(bad)
+    with pytest.raises(ValueError, match="shape"):
+        archive.ArchiveReader(str(path))
+
+    bad = bytearray(data)
+    bad[offset + 9] = 99                        # mission ID
+    path.write_bytes(bad)
+    with pytest.raises(ValueError, match="mission"):
+        archive.ArchiveReader(str(path))
+
+    bad = bytearray(data)
+    struct.pack_into('<I', bad, offset + 12, 10 ** 6)   # module count
+    path.write_bytes(bad)
+    with pytest.raises(ValueError):
+        archive.ArchiveReader(str(path))
+
+
+def test_corrupt_module_type(tmp_path, layouts):
+    path, data = written(tmp_path, layouts)
+    struct.pack_into('<H', data, archive.FILE_HEADER.size, 999)
+    path.write_bytes(data)
+    with archive.ArchiveReader(str(path)) as reader:
+        first = next(i for i in range(len(reader)) if reader.header(i)[3])
+        with pytest.raises(ValueError, match="module type"):
+            reader.layout(first)
+        with pytest.raises(ValueError, match="module type"):
+            batch.encode_archive(reader)
+
+
+def test_not_an_archive(tmp_path):
+    path = tmp_path / 'empty.habl'
+    path.write_bytes(b'')
+    with pytest.raises(ValueError):
+        archive.ArchiveReader(str(path))
+    path.write_bytes(b'PK\x03\x04' + bytes(40))
+    with pytest.raises(ValueError, match="not a HABICON"):
+        archive.ArchiveReader(str(path))
+
+
+def test_decode_bytes_rejects_bad_records():
+    blob = archive.encode_layout({'modules': [{'type': "Node (Unity)", 'x': 1, 'y': 2}]})
+    with pytest.raises(ValueError):
+        archive.decode_bytes(blob[:-1])
+    with pytest.raises(ValueError):
+        archive.decode_bytes(blob[:3])
+    with pytest.raises(ValueError):
+        archive.decode_layout(0, 0, 4, [(500, 0.0, 0.0, 0)])
+
+
+def test_cli_reports_corrupt_archive(tmp_path, layouts, capsys):
+    path, data = written(tmp_path, layouts)
+    path.write_bytes(data[:-3])
+    assert cli.main(['score', '--input', str(path), '--jobs', '1', '--trials', '0']) == 2
+    assert "habicon score:" in capsys.readouterr().err
+
+    path, data = written(tmp_path, layouts)
+    struct.pack_into('<H', data, archive.FILE_HEADER.size, 999)
+    path.write_bytes(data)
+    assert cli.main(['score', '--input', str(path), '--jobs', '1', '--trials', '0']) == 2
@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import habicon_batch as batch
+import habicon_engine as engine
+from conftest import random_layout
+
+
+def test_evaluate_batch_matches_engine(rng):
+    layouts = [random_layout(rng) for _ in range(300)]
+    layouts.append({'modules': [], 'shape': 'Torus', 'mission': {}})
+    layouts.append({'modules': [{'type': 'Not In Catalog', 'icon': '', 'x': 0, 'y': 0}]})
+    results = batch.evaluate_layouts(layouts)
+
+    for i, layout in enumerate(layouts):
+        status = engine.compliance_status(layout)
+        assert results['module_count'][i] == status['module_count']
+        assert results['volume'][i] == pytest.approx(status['volume'])
+        assert results['mass'][i] == pytest.approx(status['mass'])
+        assert results['power'][i] == pytest.approx(status['power'])
+        assert results['min_volume'][i] == pytest.approx(status['min_volume'])
+        assert results['min_power'][i] == pytest.approx(status['min_power'])
+        for key in ('volume_ok', 'power_ok', 'mass_ok'):
+            assert bool(results[key][i]) == status[key]
+        assert int(results['validity'][i]) == engine.validity_score(layout)
+        checks = engine.requirements_check(layout)
+        assert [name for name, _ in checks] == batch.CHECK_NAMES
+        assert [bool(ok) for ok in results['checks'][i]] == [ok for _, ok in checks]
+
+
+def test_rank_layouts_prefers_validity_then_mass():
+    results = {'validity': np.array([50, 90, 90]), 'mass': np.array([1.0, 30.0, 20.0])}
+    assert list(batch.rank_layouts(results)) == [2, 1, 0]
+
+
+def test_connectivity_checks_match_engine_on_dense_layouts(rng):
+    # Packed tight, with odd rotations, so modules dock, branch and split
+    layouts = [random_layout(rng, spread=250) for _ in range(400)]
+    for layout in layouts:
+        for m in layout['modules']:
+            m['rotation'] = rng.choice((0, 30, 45, 90, 360, 450, -90, 12.5))
+    checks = batch.evaluate_layouts(layouts)['checks']
+    connected = 0
+    for i, layout in enumerate(layouts):
+        expected = [ok for _, ok in engine.requirements_check(layout)]
+        assert [bool(ok) for ok in checks[i]] == expected
+        connected += expected[-2] and len(layout['modules']) > 1
+    assert connected
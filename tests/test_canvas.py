@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from PyQt5.QtCore import QMimeData, QPoint, QPointF, QSize, Qt
+from PyQt5.QtGui import QDropEvent
+
+import habicon_catalog as catalog
+import habicon_geometry as geometry
+import habicon_gui as gui
+from test_sim import KNOWN_GOOD, station
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def designer(app, tmp_path, monkeypatch):
+    monkeypatch.setenv('HABICON_PROGRESS_DB', str(tmp_path / 'progress.db'))
+    window = gui.HabitatCreatorWindow(None, {'username': 'test', 'current_mission': catalog.mission_by_id(1)})
+    window.resize(2000, 1400)
+    window.show()
+    app.processEvents()
+    yield window
+    window.close()
+    window.deleteLater()
+
+
+def drop(zone, module_type, pos):
+    mime = QMimeData()
+    mime.setText(f"|{module_type}")
+    event = QDropEvent(QPointF(pos), Qt.CopyAction, mime, Qt.LeftButton, Qt.NoModifier)
+    zone.dropEvent(event)
+    return event.isAccepted()
+
+
+def test_layout_survives_canvas_switch_on_resized_drop_zone(designer):
+    zone = designer.drop_zone
+    origin = gui.layout_origin(zone.width(), zone.height())
+    assert zone.origin == origin and origin.x() > 0 and origin.y() > 0
+
+    # Dropped where the outline is drawn on the widget, stored in the layout frame
+    layout = station(KNOWN_GOOD[1], catalog.mission_by_id(1))
+    for m in layout['modules']:
+        assert drop(zone, m['type'], origin + QPoint(m['x'], m['y']))
+    assert [(m['x'], m['y']) for m in designer.model.modules.values()] == \
+        [(m['x'], m['y']) for m in layout['modules']]
+    assert not zone.invalid
+
+    designer.canvas_combo.setCurrentIndex(1)
+    items = designer.scene_view.module_items
+    assert len(items) == len(layout['modules'])
+    assert not any(item.invalid for item in items.values())
+
+    designer.canvas_combo.setCurrentIndex(0)
+    assert not zone.invalid
+    for key, m in designer.model.modules.items():
+        assert zone.widgets[key].pos() == zone.widget_pos(m['x'], m['y'])
+        assert zone.widgets[key].pos() - origin == QPoint(m['x'] - gui.MODULE_WIDTH // 2,
+                                                          m['y'] - gui.MODULE_HEIGHT // 2)
+
+
+def test_drop_zone_keeps_modules_in_layout_frame_on_resize(app):
+    zone = gui.DropZone()
+    zone.show()
+    centre = (geometry.CANVAS_WIDTH // 2, geometry.CANVAS_HEIGHT // 2)
+    zone.add_module(0, "Node (Unity)", "", *centre)
+
+    zone.resize(QSize(geometry.CANVAS_WIDTH + 400, geometry.CANVAS_HEIGHT + 200))
+    app.processEvents()
+    assert zone.origin == QPoint(200, 100)
+    assert zone.widgets[0].pos() == QPoint(200 + centre[0] - gui.MODULE_WIDTH // 2,
+                                           100 + centre[1] - gui.MODULE_HEIGHT // 2)
+    assert zone.module_at(*zone.layout_pos(QPoint(200 + centre[0], 100 + centre[1]))) == 0
+    assert not zone.invalid
+    zone.close()
+    zone.deleteLater()
+
+
+def test_standards_text_follows_requirement_tables():
+    import habicon_requirements as requirements
+    for mission in catalog.NASA_MISSIONS:
+        volume = requirements.for_mission(mission)['min_volume'] / requirements.mission_crew(mission)
+        text = gui.nasa_standards_text(mission)
+        assert f"▶{volume:g}m³" in text
+        assert text.count("▶") == 1
+        assert f"{requirements.POWER_PER_PERSON:g}kW/person" in text
+
+
+def test_loading_a_layout_is_one_undoable_edit(designer):
+    mission = catalog.mission_by_id(1)
+    designer.on_module_dropped("", "Node (Unity)", 400, 300)
+    before = dict(designer.model.modules)
+
+    designer.apply_layout(station(KNOWN_GOOD[1], mission))
+    assert len(designer.model) == 12
+    designer.undo()
+    assert designer.model.modules == before
+
+    # Another mission starts a fresh history: undo empties the loaded layout
+    # and goes no further back
+    designer.apply_layout(station(KNOWN_GOOD[2], catalog.mission_by_id(2)))
+    assert designer.current_mission['id'] == 2
+    assert len(designer.model) == 12
+    loaded = dict(designer.model.modules)
+    designer.undo()
+    assert not designer.model.modules
+    assert not designer.history.can_undo()
+    designer.undo()
+    assert not designer.model.modules
+
+    # Redo brings back the loaded design, never mission 1's
+    designer.redo()
+    assert designer.model.modules == loaded
+
+
+def test_disconnected_layout_cannot_proceed(app):
+    layout = station(KNOWN_GOOD[1], catalog.mission_by_id(1))
+    window = gui.ValidityCheckWindow(None, layout)
+    assert not window.proceed_btn.isHidden()
+    assert window.warning_label.isHidden()
+
+    # Pulled off its Node: every module still there, so validity is unchanged
+    layout['modules'][-1]['x'] += 40
+    window.refresh(layout)
+    assert window.calculate_validity_score() >= 60
+    assert window.proceed_btn.isHidden()
+    assert not window.warning_label.isHidden()
+    assert "Dock every module" in window.warning_label.text()
+    window.close()
+    window.deleteLater()
@@ -0,0 +1,78 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import habicon_archive as archive
+import habicon_catalog as catalog
+import habicon_cli as cli
+from conftest import random_layout
+from test_sim import KNOWN_GOOD, station
+
+
+def score(capsys, *args):
+    code = cli.main(['score', '--trials', '0', *args])
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+@pytest.fixture
+def inputs(tmp_path, rng):
+    # An archive split over several tasks, a JSON export and a nested folder
+    archive.write_archive(str(tmp_path / 'many.habl'), [random_layout(rng) for _ in range(300)])
+    archive.export_json(str(tmp_path / 'few.json'), [random_layout(rng) for _ in range(5)])
+    (tmp_path / 'more').mkdir()
+    archive.write_archive(str(tmp_path / 'more' / 'some.habl'), [random_layout(rng) for _ in range(40)])
+    return tmp_path
+
+
+def test_exit_codes(tmp_path, capsys):
+    good = station(KNOWN_GOOD[2], catalog.mission_by_id(2))
+    loose = station(KNOWN_GOOD[2], catalog.mission_by_id(2))
+    loose['modules'][-1]['x'] += 40
+    archive.write_archive(str(tmp_path / 'good.habl'), [good])
+    archive.write_archive(str(tmp_path / 'loose.habl'), [good, loose])
+
+    code, out, err = score(capsys, '--input', str(tmp_path / 'good.habl'), '--jobs', '1', '--strict')
+    assert code == 0
+    assert len(out.splitlines()) == 2
+    assert "Scored 1 layouts from 1 files, 0 below" in err
+
+    # A layout pulled off its Node fails only under --strict
+    path = str(tmp_path / 'loose.habl')
+    assert score(capsys, '--input', path, '--jobs', '1')[0] == 0
+    code, out, err = score(capsys, '--input', path, '--jobs', '1', '--strict')
+    assert code == 1
+    assert "1 below" in err
+
+
+def test_jobs_do_not_change_the_output(inputs, capsys, monkeypatch):
+    monkeypatch.setattr(cli, 'CHUNK_LAYOUTS', 64)
+    args = ['--input', str(inputs), '--format', 'jsonl', '--trials', '3', '--seed', '7']
+    serial = score(capsys, *args, '--jobs', '1')
+    parallel = score(capsys, *args, '--jobs', '3')
+    assert serial == parallel
+    code, out, err = serial
+    assert code == 0
+    assert len(out.splitlines()) == 345
+    assert "from 3 files" in err
+
+
+@pytest.mark.parametrize('jobs', ['1', '3'])
+def test_corrupt_file_exits_with_2(inputs, capsys, jobs):
+    path = inputs / 'more' / 'some.habl'
+    path.write_bytes(path.read_bytes()[:-5])
+    code, _, err = score(capsys, '--input', str(inputs), '--jobs', jobs)
+    assert code == 2
+    assert "habicon score:" in err
+
+
+@pytest.mark.parametrize('jobs', ['1', '3'])
+def test_missing_file_exits_with_2(inputs, capsys, jobs):
+    code, _, err = score(capsys, '--input', str(inputs / 'many.habl'), str(inputs / 'gone.habl'), '--jobs', jobs)
+    assert code == 2
+    assert "gone.habl" in err
+
+    (inputs / 'empty').mkdir()
+    code, _, err = score(capsys, '--input', str(inputs / 'empty'), '--jobs', jobs)
+    assert code == 2
+    assert "No layout files found" in err
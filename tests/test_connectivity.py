@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+import habicon_engine as engine
+from habicon_connectivity import ConnectivityGraph
+
+TYPES = ["Node (Unity)", "Crew Quarters (COLPA)", "Power & Thermal (ECLSS)", "Not In Catalog"]
+
+
+def rebuilt(modules):
+    graph = ConnectivityGraph()
+    for key, (module_type, x, y, rotation) in modules.items():
+        graph.add_module(key, module_type, x, y, rotation)
+    return graph
+
+
+def assert_same(graph, modules):
+    fresh = rebuilt(modules)
+    assert graph.component_count() == fresh.component_count()
+    assert sorted(map(sorted, graph.components())) == sorted(map(sorted, fresh.components()))
+    assert graph.isolated == fresh.isolated
+    assert graph.links == fresh.links
+    assert engine.connectivity_checks(graph) == engine.connectivity_checks(fresh)
+    for key in modules:
+        assert graph.component_size(key) == fresh.component_size(key)
+
+
+def random_module(rng):
+    # Half-module lattice steps, so ports often meet and stations branch
+    return (rng.choice(TYPES), 60 * rng.randrange(8), 30 * rng.randrange(10), rng.choice((0, 90, 180, 270)))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_matches_rebuild(seed):
+    rng = random.Random(seed)
+    graph = ConnectivityGraph()
+    modules = {}
+    next_key = 0
+    for _ in range(250):
+        roll = rng.random()
+        if modules and roll < 0.3:
+            key = rng.choice(list(modules))
+            graph.remove_module(key)
+            del modules[key]
+        elif modules and roll < 0.5:
+            key = rng.choice(list(modules))
+            module_type = modules[key][0]
+            modules[key] = (module_type,) + random_module(rng)[1:]
+            graph.move_module(key, *modules[key])
+        else:
+            modules[next_key] = random_module(rng)
+            graph.add_module(next_key, *modules[next_key])
+            next_key += 1
+        assert_same(graph, modules)
+
+
+def test_engine_checks_from_graph():
+    node, crew = "Node (Unity)", "Crew Quarters (COLPA)"
+    layout = {'modules': [{'type': node, 'icon': '', 'x': 400, 'y': 300},
+                          {'type': crew, 'icon': '', 'x': 520, 'y': 300}]}
+    checks = dict(engine.requirements_check(layout))
+    assert checks["All Modules Pressurized & Connected"] and checks["No Isolated Modules"]
+
+    layout['modules'].append({'type': crew, 'icon': '', 'x': 100, 'y': 100})
+    checks = dict(engine.requirements_check(layout))
+    assert not checks["All Modules Pressurized & Connected"] and not checks["No Isolated Modules"]
+
+    # A lone module is connected and not counted as isolated
+    alone = {'modules': layout['modules'][:1]}
+    assert all(ok for _, ok in engine.connectivity_checks(rebuilt({0: (node, 400, 300, 0)})))
+    assert [name for name, _ in engine.requirements_check(alone)][-2:] == engine.CONNECTIVITY_CHECKS
+
+
+def test_disconnected_layout_does_not_pass():
+    node, crew = "Node (Unity)", "Crew Quarters (COLPA)"
+    layout = {'modules': [{'type': node, 'icon': '', 'x': 400, 'y': 300},
+                          {'type': crew, 'icon': '', 'x': 520, 'y': 300}]}
+    assert engine.layout_passed(100, None, engine.requirements_check(layout))
+    assert not engine.layout_passed(50, None, engine.requirements_check(layout))
+
+    layout['modules'][1]['x'] = 560
+    assert not engine.layout_passed(100, None, engine.requirements_check(layout))
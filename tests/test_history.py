@@ -0,0 +1,122 @@
+import random
+
+from habicon_history import History, LayoutState, apply, clear_command
+
+
+class LoggedState(LayoutState):
+    # Records every editor call, to see what a checkout actually replays
+    def __init__(self, shape=None):
+        super().__init__(shape)
+        self.calls = []
+
+    def add_module(self, key, module):
+        self.calls.append(('add', key))
+        super().add_module(key, module)
+
+    def remove_module(self, key):
+        self.calls.append(('remove', key))
+        super().remove_module(key)
+
+    def move_module(self, key, x, y):
+        self.calls.append(('move', key, x, y))
+        super().move_module(key, x, y)
+
+    def set_shape(self, shape):
+        self.calls.append(('shape', shape))
+        super().set_shape(shape)
+
+
+def module(x, y, module_type="Node (Unity)"):
+    return {'type': module_type, 'icon': '', 'x': x, 'y': y}
+
+
+def edit(history, state, command):
+    # Editors apply a command first, then record it
+    apply(state, command)
+    return history.record(command)
+
+
+def test_editing_after_undo_starts_a_branch():
+    history, state = History("Cylinder"), LayoutState("Cylinder")
+    edit(history, state, ('add', 0, module(400, 300)))
+    first = edit(history, state, ('add', 1, module(520, 300)))
+    history.undo(state)
+    second = edit(history, state, ('add', 2, module(280, 300)))
+
+    assert history.current is second
+    history.undo(state)
+    assert history.branches() == [first, second]
+    # Redo takes the newest branch unless told otherwise
+    assert history.redo(state) is second
+    history.undo(state)
+    assert history.redo(state, branch=0) is first
+    assert set(state.modules) == {0, 1}
+
+
+def test_checkout_of_a_sibling_branch_replays_its_commands():
+    history, state = History("Cylinder"), LoggedState("Cylinder")
+    edit(history, state, ('add', 0, module(400, 300)))
+    edit(history, state, ('move', 0, (400, 300), (400, 240)))
+    left = edit(history, state, ('add', 1, module(280, 240)))
+    history.undo(state)
+    history.undo(state)
+    edit(history, state, ('shape', "Cylinder", "Modular"))
+    right = edit(history, state, ('add', 2, module(520, 300)))
+
+    state.calls.clear()
+    history.checkout(left, state)
+    # Up from the right branch to the first add, then down the left one
+    assert state.calls == [('remove', 2), ('shape', "Cylinder"), ('move', 0, 400, 240), ('add', 1)]
+    assert history.current is left
+    assert state.modules == history.replay(left).modules == {0: module(400, 240), 1: module(280, 240)}
+    assert state.shape == "Cylinder"
+
+    state.calls.clear()
+    history.checkout(right, state)
+    assert state.calls == [('remove', 1), ('move', 0, 400, 300), ('shape', "Modular"), ('add', 2)]
+    assert state.modules == history.replay(right).modules
+    assert state.shape == history.replay(right).shape == "Modular"
+
+
+def test_checkout_matches_replay_anywhere_in_the_tree():
+    rng = random.Random(5)
+    history, state = History("Cylinder"), LayoutState("Cylinder")
+    nodes = [history.root]
+    for step in range(300):
+        roll = rng.random()
+        if roll < 0.2:
+            history.checkout(rng.choice(nodes), state)
+        elif roll < 0.3:
+            history.undo(state)
+        elif state.modules and roll < 0.5:
+            key = rng.choice(list(state.modules))
+            m = state.modules[key]
+            nodes.append(edit(history, state, ('move', key, (m['x'], m['y']), (rng.randrange(800), m['y']))))
+        elif state.modules and roll < 0.6:
+            key = rng.choice(list(state.modules))
+            nodes.append(edit(history, state, ('remove', key, state.modules[key])))
+        elif roll < 0.65:
+            nodes.append(edit(history, state, ('shape', state.shape, rng.choice(("Cylinder", "Torus", "Dome")))))
+        else:
+            nodes.append(edit(history, state, ('add', step, module(rng.randrange(800), rng.randrange(600)))))
+        fresh = history.replay()
+        assert state.modules == fresh.modules and state.shape == fresh.shape
+
+
+def test_reset_history_undoes_only_the_loaded_layout():
+    # What the designer does on loading another mission's layout: the old
+    # design is dropped outside the history, which starts afresh
+    history, state = History("Cylinder"), LayoutState("Cylinder")
+    edit(history, state, ('add', 0, module(400, 300)))
+    state.modules.clear()
+    history.reset(state.shape)
+
+    loaded = {5: module(400, 240), 6: module(520, 240)}
+    edit(history, state, ('batch', (clear_command(state.modules), ('shape', "Cylinder", "Modular")) +
+                          tuple(('add', key, m) for key, m in loaded.items())))
+    history.undo(state)
+    assert not state.modules and state.shape == "Cylinder"
+    assert not history.can_undo()
+    assert history.undo(state) is None
+    history.redo(state)
+    assert state.modules == loaded and state.shape == "Modular"
@@ -0,0 +1,72 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import habicon_network as network
+from habicon_requirements import CABIN_TEMP
+
+
+def laplacian_system(rng, n, density=0.1):
+    # Random connected conductance network with some nodes grounded
+    rows, cols, conductance = [], [], []
+    edges = {(i, i + 1) for i in range(n - 1)}
+    edges |= {tuple(sorted(pair)) for pair in rng.integers(0, n, size=(int(density * n * n), 2)) if pair[0] != pair[1]}
+    for a, b in sorted(edges):
+        g = rng.uniform(0.1, 10.0)
+        rows += [a, b]
+        cols += [b, a]
+        conductance += [g, g]
+    rows, cols = np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+    conductance = np.array(conductance, dtype=float)
+    ground = np.where(rng.random(n) < 0.2, rng.uniform(0.5, 20.0, n), 0.0)
+    ground[0] += 1.0
+    diag = ground + np.bincount(rows, weights=conductance, minlength=n)
+    dense = np.diag(diag)
+    dense[rows, cols] -= conductance
+    return diag, rows, cols, conductance, dense
+
+
+@pytest.mark.parametrize('n', [1, 2, 10, 80])
+def test_conjugate_gradient_matches_dense_solve(n):
+    rng = np.random.default_rng(n)
+    diag, rows, cols, conductance, dense = laplacian_system(rng, n)
+    b = rng.uniform(-50.0, 50.0, n)
+    expected = np.linalg.solve(dense, b)
+
+    x, iterations = network.conjugate_gradient(diag, rows, cols, conductance, b, np.zeros(n), tol=1e-12)
+    assert np.allclose(x, expected, rtol=1e-8, atol=1e-8)
+    assert iterations <= 2 * n + 10
+
+    # A warm start at the answer has nothing left to do
+    _, again = network.conjugate_gradient(diag, rows, cols, conductance, b, expected.copy(), tol=1e-8)
+    assert again == 0
+
+
+def row(types, y=300):
+    return {'modules': [{'type': t, 'icon': '', 'x': 280 + 120 * i, 'y': y} for i, t in enumerate(types)]}
+
+
+def test_unpowered_modules_add_no_heat():
+    grid = network.network_for(row(["Galley (Food System)", "Node (Unity)", "Exercise (COLPA)"]))
+    report = grid.report()
+    assert report['unpowered'] == 3
+    assert report['max_temp'] == pytest.approx(network.SINK_TEMP)
+
+    powered = network.network_for(row(["Galley (Food System)", "Node (Unity)", "Power & Thermal (ECLSS)"]))
+    assert powered.report()['unpowered'] == 0
+    assert powered.report()['max_temp'] > network.SINK_TEMP
+
+
+def test_move_within_the_same_docking_keeps_the_solution():
+    layout = row(["Power & Thermal (ECLSS)", "Node (Unity)", "Crew Quarters (COLPA)"])
+    grid = network.network_for(layout)
+    grid.solve()
+    grid.graph.move_module(2, "Crew Quarters (COLPA)", 525, 300)
+    grid.move_module(2, "Crew Quarters (COLPA)")
+    assert not grid.dirty
+
+    grid.graph.move_module(2, "Crew Quarters (COLPA)", 900, 300)
+    grid.move_module(2, "Crew Quarters (COLPA)")
+    assert grid.dirty
+    assert grid.voltage_drop(2) is None
+    assert grid.temperature[2] < CABIN_TEMP
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import habicon_catalog as catalog
+import habicon_engine as engine
+import habicon_geometry as geometry
+import habicon_optimizer as optimizer
+from habicon_connectivity import graph_for
+from habicon_spatial import SpatialGrid
+
+
+def run(shape, mission_id, **kwargs):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        return optimizer.optimize(shape, catalog.mission_by_id(mission_id), chains=2, iterations=2000,
+                                  executor=executor, **kwargs)
+
+
+def test_same_seed_same_candidates():
+    first = run("Cylinder", 3, seed=11)
+    assert first == run("Cylinder", 3, seed=11)
+    assert first != run("Cylinder", 3, seed=12)
+    assert [c['fitness'] for c in first] == sorted((c['fitness'] for c in first), reverse=True)
+
+
+@pytest.mark.parametrize('shape,mission_id,mass_limit', [
+    ("Cylinder", 2, engine.MASS_LIMIT),
+    ("Modular", 4, engine.MASS_LIMIT),
+    ("Dome", 1, 25000),
+])
+def test_candidates_are_placeable_connected_and_light(shape, mission_id, mass_limit):
+    candidates = run(shape, mission_id, seed=3, mass_limit=mass_limit)
+    assert candidates
+    hull = geometry.hull(shape)
+    for found in candidates:
+        layout = found['layout']
+        assert found['mass'] == engine.compliance_status(layout)['mass'] <= mass_limit
+
+        grid = SpatialGrid()
+        for key, m in enumerate(layout['modules']):
+            grid.insert(key, m['x'], m['y'])
+        assert not geometry.invalid_modules(hull, grid)
+        assert graph_for(layout).is_connected()
+
+
+def test_candidates_pass_mission():
+    # Mission 2's best picks used to be valid but undocked
+    mission = catalog.mission_by_id(2)
+    for found in run("Cylinder", 2, seed=0):
+        layout = found['layout']
+        assert engine.layout_passed(found['validity'], mission, engine.requirements_check(layout))
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from habicon_progress import ProgressStore
+
+SCORES = {'overall': 80, 'lifesupport': 70, 'power': 90, 'comfort': 60, 'safety': 75}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProgressStore(str(tmp_path / 'progress.db'))
+    yield store
+    store.close()
+
+
+def fail(db):
+    raise RuntimeError("boom")
+
+
+def bad_sql(db):
+    db.execute("INSERT INTO no_such_table VALUES (1)")
+
+
+def test_failed_write_does_not_discard_its_batch(store):
+    store.touch_user("ada")
+    store._queue(fail)
+    store.record_result("ada", 1, SCORES, 90, True)
+    store._queue(bad_sql)
+    store.save_layout("ada", "base", {'modules': [{'type': "Node (Unity)", 'icon': '', 'x': 400, 'y': 300}]})
+    store.flush()
+
+    assert store.failed == 2
+    assert store.user("ada")['missions_completed'] == 1
+    assert store.best_scores("ada") == {1: 80}
+    [(layout_id, name, _)] = store.saved_layouts("ada")
+    assert name == "base"
+    assert store.load_layout(layout_id)['modules'][0]['x'] == 400
+
+
+def test_failed_write_rolls_back_its_own_changes(store):
+    store.touch_user("ada")
+
+    def half_done(db):
+        db.execute("UPDATE users SET level = 99 WHERE username = 'ada'")
+        raise RuntimeError("boom")
+    store._queue(half_done)
+    store.flush()
+    assert store.user("ada")['level'] == 1
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_flush_returns_when_writer_has_died(store):
+    def fatal(db):
+        raise SystemExit
+    store._queue(fatal)
+    store.writer.join(5)
+    assert not store.writer.is_alive()
+
+    store.touch_user("ada")
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+    flusher.join(5)
+    assert not flusher.is_alive()
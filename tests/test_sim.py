@@ -0,0 +1,80 @@
+import pytest
+
+import habicon_catalog as catalog
+import habicon_engine as engine
+import habicon_geometry as geometry
+import habicon_sim as sim
+from habicon_connectivity import graph_for
+
+NODE = "Node (Unity)"
+CREW = "Crew Quarters (COLPA)"
+GALLEY = "Galley (Food System)"
+HYGIENE = "Waste & Hygiene (WHC)"
+MEDICAL = "Medical (Health Care)"
+MAINTENANCE = "Maintenance (IVA Tools)"
+EXERCISE = "Exercise (COLPA)"
+PLANTS = "Plant Production (VEG)"
+LOGISTICS = "Logistics (Cargo)"
+POWER = "Power & Thermal (ECLSS)"
+ECLSS = "Life Support (ECLSS)"
+AIRLOCK = "Airlock (Quest/EVA)"
+DOCKING = "Docking Port (PMA)"
+
+# Four rows on the standard Cylinder canvas, each a module docked either side
+# of a Node; the Nodes dock to each other through their side ports
+ROWS = (210, 270, 330, 390)
+
+KNOWN_GOOD = {
+    1: [(HYGIENE, MAINTENANCE), (EXERCISE, CREW), (POWER, GALLEY), (AIRLOCK, MEDICAL)],
+    2: [(LOGISTICS, POWER), (EXERCISE, CREW), (MEDICAL, HYGIENE), (DOCKING, AIRLOCK)],
+    3: [(CREW, HYGIENE), (MEDICAL, EXERCISE), (PLANTS, POWER), (ECLSS, AIRLOCK)],
+    4: [(CREW, HYGIENE), (MEDICAL, MAINTENANCE), (PLANTS, POWER), (ECLSS, AIRLOCK)],
+    5: [(CREW, HYGIENE), (MEDICAL, MAINTENANCE), (PLANTS, PLANTS), (POWER, ECLSS)],
+    6: [(CREW, HYGIENE), (MEDICAL, MAINTENANCE), (PLANTS, PLANTS), (POWER, ECLSS)],
+}
+
+
+def station(rows, mission):
+    modules = []
+    for (left, right), y in zip(rows, ROWS):
+        for module_type, x in ((left, 280), (NODE, 400), (right, 520)):
+            modules.append({'type': module_type, 'icon': '', 'x': x, 'y': y})
+    return {'modules': modules, 'shape': "Cylinder", 'mission': mission}
+
+
+@pytest.mark.parametrize('mission_id', sorted(KNOWN_GOOD))
+def test_known_good_layout_passes_mission(mission_id):
+    mission = catalog.mission_by_id(mission_id)
+    layout = station(KNOWN_GOOD[mission_id], mission)
+
+    hull = geometry.hull(layout['shape'])
+    assert all(geometry.contains_module(hull, m['x'], m['y']) for m in layout['modules'])
+    assert graph_for(layout).is_connected()
+    assert engine.compliance_status(layout)['mass_ok']
+    assert engine.validity_score(layout) >= engine.min_validity_score(mission)
+
+    # The crews come home, and the score clears the flat pass mark
+    result = sim.simulate(layout)
+    assert result['success_rate'] >= 0.9
+    assert result['survival'] >= sim.MIN_SURVIVAL
+    assert result['scores']['overall'] >= sim.pass_score(mission) == sim.DEFAULT_PASS_SCORE
+    assert sim.mission_passed(result, mission)
+
+
+def test_crew_that_runs_out_does_not_pass():
+    # Mission 6's station without its greenhouse starves long before the end
+    mission = catalog.mission_by_id(6)
+    rows = [(CREW, HYGIENE), (MEDICAL, MAINTENANCE), (EXERCISE, AIRLOCK), (POWER, ECLSS)]
+    result = sim.simulate(station(rows, mission), trials=40)
+    assert result['success_rate'] == 0
+    assert not sim.mission_passed(result, mission)
+    assert not sim.mission_passed(dict(result, scores=dict(result['scores'], overall=100)), mission)
+
+
+def test_every_mission_has_a_known_good_layout():
+    assert sorted(KNOWN_GOOD) == [mission['id'] for mission in catalog.NASA_MISSIONS]
+
+
+def test_simulation_is_reproducible():
+    layout = station(KNOWN_GOOD[2], catalog.mission_by_id(2))
+    assert sim.simulate(layout, trials=40) == sim.simulate(layout, trials=40)
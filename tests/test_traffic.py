@@ -0,0 +1,103 @@
+import heapq
+import random
+
+import pytest
+
+import habicon_catalog as catalog
+from habicon_connectivity import ConnectivityGraph
+from habicon_traffic import INF, TrafficAnalysis, analyze
+
+TYPES = ["Node (Unity)", "Crew Quarters (COLPA)", "Galley (Food System)", "Waste & Hygiene (WHC)",
+         "Exercise (COLPA)", "Airlock (Quest/EVA)", "Logistics (Cargo)"]
+
+
+def dijkstra(links, sources):
+    dist = {key: 0.0 for key in sources}
+    heap = [(0.0, key) for key in sources]
+    while heap:
+        d, key = heapq.heappop(heap)
+        if d > dist[key]:
+            continue
+        for other, w in links[key].items():
+            if d + w < dist.get(other, INF):
+                dist[other] = d + w
+                heapq.heappush(heap, (d + w, other))
+    return dist
+
+
+def assert_forests_fresh(traffic):
+    for cap, forest in traffic.forests.items():
+        sources = [key for key, t in traffic.types.items() if traffic.caps(t) & cap]
+        expected = dijkstra(traffic.links, sources)
+        assert forest.dist.keys() == expected.keys()
+        for key, d in expected.items():
+            assert forest.dist[key] == pytest.approx(d)
+            # The tree agrees with the distances it stores
+            parent = forest.parent.get(key)
+            if parent is None:
+                assert key in forest.sources
+            else:
+                assert forest.dist[key] == pytest.approx(forest.dist[parent] + traffic.links[key][parent])
+                assert key in forest.children[parent]
+
+
+def random_module(rng):
+    return rng.choice(TYPES), 60 * rng.randrange(8), 30 * rng.randrange(10)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_repaired_forests_match_fresh_dijkstra(seed):
+    rng = random.Random(seed)
+    graph = ConnectivityGraph()
+    traffic = TrafficAnalysis(graph)
+    modules = {}
+    for step in range(150):
+        roll = rng.random()
+        if modules and roll < 0.3:
+            key = rng.choice(list(modules))
+            graph.remove_module(key)
+            traffic.remove_module(key)
+            del modules[key]
+        elif modules and roll < 0.5:
+            key = rng.choice(list(modules))
+            module_type = modules[key][0]
+            modules[key] = (module_type,) + random_module(rng)[1:]
+            graph.move_module(key, module_type, *modules[key][1:])
+            traffic.move_module(key, module_type)
+        else:
+            modules[step] = random_module(rng)
+            graph.add_module(step, *modules[step])
+            traffic.add_module(step, modules[step][0])
+        assert_forests_fresh(traffic)
+
+        # The cached report follows every edit
+        layout = {'modules': [{'type': t, 'x': x, 'y': y} for t, x, y in modules.values()]}
+        report, fresh = traffic.report(4), analyze(layout, 4)
+        for name in ('trips', 'trips_unreachable', 'egress_unreachable'):
+            assert report[name] == fresh[name]
+        for name in ('commute', 'egress'):
+            assert (report[name] is None) == (fresh[name] is None)
+            if fresh[name] is not None:
+                assert report[name] == pytest.approx(fresh[name])
+
+
+def test_report_is_cached_until_the_layout_changes():
+    graph = ConnectivityGraph()
+    traffic = TrafficAnalysis(graph)
+    for key, (module_type, x) in enumerate([(TYPES[1], 280), (TYPES[0], 400), (TYPES[5], 520)]):
+        graph.add_module(key, module_type, x, 300)
+        traffic.add_module(key, module_type)
+    report = traffic.report(4)
+    assert traffic.report(4) is report
+
+    # Nudged within the same docking: same routes, same report
+    graph.move_module(2, TYPES[5], 525, 300)
+    traffic.move_module(2, TYPES[5])
+    assert traffic.report(4) is report
+
+    # Pulled away: the airlock is cut off
+    graph.move_module(2, TYPES[5], 800, 300)
+    traffic.move_module(2, TYPES[5])
+    assert traffic.report(4) is not report
+    assert traffic.report(4)['egress_unreachable'] == 2
+    assert catalog.module_spec(TYPES[5])['caps'] & catalog.CAP_AIRLOCK